@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks, Query, Path
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Query, Path, Response
 from typing import Dict, Any, List, Optional, Union
 import datetime
 import time
@@ -14,58 +14,23 @@ from app.core.evaluation import run_multiple_evaluations
 from app.utils.logging import log_evaluation_results
 from app.utils.litellm_helper import get_provider_options
 from app.metrics import METRIC_REGISTRY
+from app.api.endpoints.metrics import get_metrics_list_json
 from app.utils.job_manager import get_job_manager
 
 router = APIRouter(prefix="/evaluations", tags=["evaluations"])
 
 
 @router.get("/metrics", response_model=MetricsListResponse)
-async def get_available_metrics() -> MetricsListResponse:
+async def get_available_metrics():
     """
     利用可能な評価指標一覧を返す
 
     Returns:
         MetricsListResponse: 評価指標名、説明、パラメータ定義のリスト
     """
-    metrics_list: List[MetricInfo] = []
-    
-    # METRIC_REGISTRYから登録されている評価指標を取得
-    for name, metric_cls in METRIC_REGISTRY.items():
-        # インスタンスを作成して情報を取得
-        metric_instance = metric_cls()
-        
-        # docstringから説明を取得（可能であれば）
-        description = None
-        if metric_cls.__doc__:
-            description = metric_cls.__doc__.strip()
-        
-        # パラメータ定義を取得
-        param_defs = metric_cls.get_parameter_definitions()
-        parameters = {}
-        
-        # パラメータ定義をAPIモデルに変換
-        for param_name, param_def in param_defs.items():
-            parameters[param_name] = MetricParameterInfo(
-                type=param_def.get("type", "string"),
-                description=param_def.get("description"),
-                default=param_def.get("default"),
-                required=param_def.get("required", False),
-                enum=param_def.get("enum")
-            )
-        
-        metrics_list.append(
-            MetricInfo(
-                name=name,
-                description=description,
-                parameters=parameters if parameters else None,
-                is_higher_better=getattr(metric_instance, "is_higher_better", True)
-            )
-        )
-    
-    # 名前でソート
-    metrics_list.sort(key=lambda x: x.name)
-    
-    return MetricsListResponse(metrics=metrics_list)
+    # /metrics/available と同じキャッシュ済みの一覧を返す
+    available_json, _ = get_metrics_list_json()
+    return Response(content=available_json, media_type="application/json")
 
 
 @router.post("/run", response_model=Union[EvaluationResponse, AsyncEvaluationResponse])
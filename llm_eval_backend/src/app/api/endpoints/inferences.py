@@ -3,12 +3,18 @@
 
 推論のCRUD操作と実行を提供するエンドポイントを実装します。
 """
+import asyncio
 import json
 import logging
+import os
+import time
+import traceback
 import uuid
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Optional, Tuple, Union
 from datetime import datetime
 from fastapi import APIRouter, HTTPException, status, Depends, BackgroundTasks, Query, Path
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
 
 from app.api.models import (
     Inference, 
@@ -26,11 +32,86 @@ from app.utils.db.providers import get_provider_repository
 from app.utils.db.inferences import get_inference_repository
 from app.core.evaluation import run_multiple_evaluations
 from app.utils.litellm_helper import get_provider_options
+from app.utils.logging import log_evaluation_results
+from app.utils.dataset.operations import get_dataset_by_name
 
 # ロガーの設定
 logger = logging.getLogger("llmeval")
 
-router = APIRouter(prefix="/inferences", tags=["inferences"])
+router = APIRouter(prefix="/inferences", tags=["inferences"], default_response_class=ORJSONResponse)
+
+# 更新ペイロードのシリアライザ（リクエストごとの構築を避けるためモジュールレベルで保持）
+_INFERENCE_UPDATE_ADAPTER = TypeAdapter(InferenceUpdate)
+
+# 同時に実行する評価バックグラウンドタスクの上限（超過分は空きが出るまで待機）
+_EVAL_SEM = asyncio.Semaphore(int(os.environ.get("INFERENCE_MAX_CONCURRENCY", "4")))
+
+# 応答モデル（Inference / InferenceResult）は自前のDBから取得した信頼済みデータのみで構築するため、
+# model_construct でバリデーションを省略する。外部入力（InferenceCreate / InferenceUpdate）は通常どおり検証する。
+# 行ごとに呼ばれるため、コンストラクタは属性参照を省いたエイリアスで保持する。
+_new_result = InferenceResult.model_construct
+_new_inference = Inference.model_construct
+
+# フラットなメトリクスから除外する詳細データのサフィックス
+_SKIP_SUFFIXES = ("_details", "_error_rate")
+
+# データセット名から取り除くn_shotサフィックス
+_SHOT_SUFFIXES = ("_0shot", "_1shot", "_2shot", "_3shot", "_4shot", "_5shot")
+
+# ステータス文字列からEnumへの変換表（str継承のEnumのためメンバー自身でも引ける）
+_STATUS_MAP = InferenceStatus._value2member_map_
+
+
+# 以下の変換関数では、日時カラムはリポジトリ層（_parse_datetime_fields）でdatetimeに変換済みのものをそのまま渡す
+def _result_from_db(res: Dict[str, Any]) -> InferenceResult:
+    """
+    DBの推論結果行をAPI応答モデルに変換します。
+
+    Args:
+        res: リポジトリから取得した推論結果
+
+    Returns:
+        InferenceResult: 推論結果モデル
+    """
+    return _new_result(
+        id=res["id"],
+        inference_id=res["inference_id"],
+        input=res["input"],
+        expected_output=res.get("expected_output"),
+        actual_output=res["actual_output"],
+        metrics=res.get("metrics"),
+        latency=res.get("latency"),
+        token_count=res.get("token_count"),
+        created_at=res["created_at"]
+    )
+
+
+def _inference_from_db(inf: Dict[str, Any]) -> Inference:
+    """
+    DBの推論行（結果を含む）をAPI応答モデルに変換します。
+
+    Args:
+        inf: リポジトリから取得した推論
+
+    Returns:
+        Inference: 推論モデル
+    """
+    return _new_inference(
+        id=inf["id"],
+        name=inf["name"],
+        description=inf.get("description"),
+        dataset_id=inf["dataset_id"],
+        provider_id=inf["provider_id"],
+        model_id=inf["model_id"],
+        status=_STATUS_MAP[inf["status"]],
+        progress=inf["progress"],
+        metrics=inf.get("metrics"),
+        results=[_result_from_db(res) for res in inf.get("results") or ()],
+        created_at=inf["created_at"],
+        updated_at=inf["updated_at"],
+        completed_at=inf.get("completed_at"),
+        error=inf.get("error")
+    )
 
 
 @router.get("", response_model=List[Inference])
@@ -38,7 +119,9 @@ async def list_inferences(
     dataset_id: Optional[str] = None,
     provider_id: Optional[str] = None,
     model_id: Optional[str] = None,
-    status: Optional[str] = None
+    status: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, description="取得する最大件数（未指定の場合はすべて）"),
+    offset: int = Query(0, ge=0, description="取得開始位置")
 ):
     """
     推論一覧を取得します。
@@ -48,73 +131,35 @@ async def list_inferences(
         provider_id: プロバイダIDによるフィルタ
         model_id: モデルIDによるフィルタ
         status: ステータスによるフィルタ
+        limit: 取得する最大件数
+        offset: 取得開始位置
         
     Returns:
         List[Inference]: 推論一覧
     """
     try:
-        # フィルター条件を作成
-        filters = {}
-        if dataset_id:
-            filters["dataset_id"] = dataset_id
-        if provider_id:
-            filters["provider_id"] = provider_id
-        if model_id:
-            filters["model_id"] = model_id
-        if status:
-            filters["status"] = status
+        # フィルター条件を作成（指定されたものだけ）
+        filters = {
+            key: value
+            for key, value in (
+                ("dataset_id", dataset_id),
+                ("provider_id", provider_id),
+                ("model_id", model_id),
+                ("status", status),
+            )
+            if value
+        }
         
         # リポジトリから推論一覧を取得
         inference_repo = get_inference_repository()
-        inferences = inference_repo.get_all_inferences(filters)
+        inferences = await asyncio.to_thread(
+            inference_repo.get_all_inferences, filters, limit=limit, offset=offset
+        )
         
         # API応答モデルにマッピング
-        result = []
-        for inf in inferences:
-            # 結果を変換
-            results = []
-            for res in inf.get("results", []):
-                results.append(InferenceResult(
-                    id=res["id"],
-                    inference_id=res["inference_id"],
-                    input=res["input"],
-                    expected_output=res.get("expected_output"),
-                    actual_output=res["actual_output"],
-                    metrics=res.get("metrics"),
-                    latency=res.get("latency"),
-                    token_count=res.get("token_count"),
-                    created_at=datetime.fromisoformat(res["created_at"]) if isinstance(res["created_at"], str) else res["created_at"]
-                ))
-            
-            # 日付文字列をdatetimeに変換
-            created_at = datetime.fromisoformat(inf["created_at"]) if isinstance(inf["created_at"], str) else inf["created_at"]
-            updated_at = datetime.fromisoformat(inf["updated_at"]) if isinstance(inf["updated_at"], str) else inf["updated_at"]
-            completed_at = None
-            if inf.get("completed_at"):
-                completed_at = datetime.fromisoformat(inf["completed_at"]) if isinstance(inf["completed_at"], str) else inf["completed_at"]
-            
-            # 推論オブジェクトを作成
-            inference = Inference(
-                id=inf["id"],
-                name=inf["name"],
-                description=inf.get("description"),
-                dataset_id=inf["dataset_id"],
-                provider_id=inf["provider_id"],
-                model_id=inf["model_id"],
-                status=InferenceStatus(inf["status"]),
-                progress=inf["progress"],
-                metrics=inf.get("metrics"),
-                results=results,
-                created_at=created_at,
-                updated_at=updated_at,
-                completed_at=completed_at,
-                error=inf.get("error")
-            )
-            result.append(inference)
-        
-        return result
+        return [_inference_from_db(inf) for inf in inferences]
     except Exception as e:
-        logger.error(f"推論一覧取得エラー: {str(e)}", exc_info=True)
+        logger.error("推論一覧取得エラー: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"推論一覧取得エラー: {str(e)}"
@@ -165,17 +210,15 @@ async def create_inference(
         logger.info(f"推論作成: dataset_name={dataset_name}, dataset_type={dataset_type}")
         
         # プロバイダとモデル情報の取得
-        provider_repo = get_provider_repository()
-        model_repo = get_model_repository()
-        
-        provider = provider_repo.get_provider_by_id(inference_data.provider_id)
+        provider, model = await asyncio.to_thread(
+            _get_provider_and_model, inference_data.provider_id, inference_data.model_id
+        )
         if not provider:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"プロバイダID '{inference_data.provider_id}' が見つかりません"
             )
         
-        model = model_repo.get_model_by_id(inference_data.model_id)
         if not model:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -195,7 +238,6 @@ async def create_inference(
         )
         
         # データセットを取得
-        from app.utils.dataset.operations import get_dataset_by_name
         dataset_info = None
         
         # データセットタイプが指定されている場合は取得を試みる
@@ -231,7 +273,7 @@ async def create_inference(
         
         # それでも取得できない場合はエラー
         if not dataset_info:
-            logger.error(f"データセットが見つかりません: {dataset_name}")
+            logger.warning("データセットが見つかりません: %s", dataset_name)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"データセット '{dataset_name}' が見つかりません"
@@ -261,7 +303,7 @@ async def create_inference(
         }
         
         # 推論を作成（初期状態はPENDING）
-        inference_db = inference_repo.create_inference({
+        inference_db = await asyncio.to_thread(inference_repo.create_inference, {
             "name": inference_data.name,
             "description": inference_data.description,
             "dataset_id": inference_data.dataset_id,
@@ -281,56 +323,81 @@ async def create_inference(
             model_name=model_name
         )
         
-        # 結果を変換
-        results = []
-        for res in inference_db.get("results", []):
-            results.append(InferenceResult(
-                id=res["id"],
-                inference_id=res["inference_id"],
-                input=res["input"],
-                expected_output=res.get("expected_output"),
-                actual_output=res["actual_output"],
-                metrics=res.get("metrics"),
-                latency=res.get("latency"),
-                token_count=res.get("token_count"),
-                created_at=datetime.fromisoformat(res["created_at"]) if isinstance(res["created_at"], str) else res["created_at"]
-            ))
-        
-        # 日付文字列をdatetimeに変換
-        created_at = datetime.fromisoformat(inference_db["created_at"]) if isinstance(inference_db["created_at"], str) else inference_db["created_at"]
-        updated_at = datetime.fromisoformat(inference_db["updated_at"]) if isinstance(inference_db["updated_at"], str) else inference_db["updated_at"]
-        completed_at = None
-        if inference_db.get("completed_at"):
-            completed_at = datetime.fromisoformat(inference_db["completed_at"]) if isinstance(inference_db["completed_at"], str) else inference_db["completed_at"]
-        
-        # 推論オブジェクトを構築
-        inference = Inference(
-            id=inference_db["id"],
-            name=inference_db["name"],
-            description=inference_db.get("description"),
-            dataset_id=inference_db["dataset_id"],
-            provider_id=inference_db["provider_id"],
-            model_id=inference_db["model_id"],
-            status=InferenceStatus(inference_db["status"]),
-            progress=inference_db["progress"],
-            metrics=inference_db.get("metrics"),
-            results=results,
-            created_at=created_at,
-            updated_at=updated_at,
-            completed_at=completed_at,
-            error=inference_db.get("error")
-        )
-        
-        return inference
+        return _inference_from_db(inference_db)
         
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"推論作成エラー: {str(e)}", exc_info=True)
+        logger.error("推論作成エラー: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"推論作成エラー: {str(e)}"
         )
 
 
+def _to_float(value: Any) -> Optional[Union[int, float]]:
+    """
+    メトリクス値を数値型に変換します。
+
+    Args:
+        value: メトリクス値
+
+    Returns:
+        Optional[Union[int, float]]: 数値（変換できない場合はNone）
+    """
+    if value.__class__ is float or value.__class__ is int:
+        return value
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def _base_dataset_name(ds: str) -> str:
+    """
+    評価結果のデータセットキーからパス・拡張子・n_shotサフィックスを除いた名前を返します。
+
+    Args:
+        ds: データセットキー（例: "test/example_2shot.json"）
+
+    Returns:
+        str: データセット名（例: "example"）
+    """
+    ds_name = ds.split('/')[-1].replace('.json', '')
+    for shot_suffix in _SHOT_SUFFIXES:
+        if shot_suffix in ds_name:
+            return ds_name.replace(shot_suffix, "")
+    return ds_name
+
+
+def _get_provider_and_model(provider_id: str, model_id: str) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """
+    プロバイダとモデルの情報を続けて取得します（asyncio.to_thread から呼び出す想定）。
+
+    2つの参照は同じデータベースへの問い合わせのため、並行させずに1つのスレッドで順に行います。
+
+    Args:
+        provider_id: プロバイダID
+        model_id: モデルID
+
+    Returns:
+        Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]: (プロバイダ情報, モデル情報)（存在しない方はNone）
+    """
+    return get_provider_repository().get_provider_by_id(provider_id), get_model_repository().get_model_by_id(model_id)
+
+
+def _dump_json(path: str, payload: Dict[str, Any]) -> None:
+    """
+    デバッグ用のJSONファイルを書き出します（asyncio.to_thread から呼び出す想定）。
+
+    Args:
+        path: 出力先ファイルパス
+        payload: 書き出すデータ
+    """
+    with open(path, "w") as f:
+        json.dump(payload, f)
+
+
 # 背景タスクとして実行する評価関数
 async def execute_inference_evaluation(
     inference_id: str,
@@ -341,6 +408,27 @@ async def execute_inference_evaluation(
     """
     推論評価を実行するバックグラウンドタスク
     
+    同時実行数は INFERENCE_MAX_CONCURRENCY（デフォルト4）で制限されます。
+    
+    Args:
+        inference_id: 推論ID
+        evaluation_request: 評価リクエスト
+        provider_name: プロバイダー名
+        model_name: モデル名
+    """
+    async with _EVAL_SEM:
+        await _run_inference_evaluation(inference_id, evaluation_request, provider_name, model_name)
+
+
+async def _run_inference_evaluation(
+    inference_id: str,
+    evaluation_request: EvaluationRequest,
+    provider_name: str,
+    model_name: str
+):
+    """
+    推論評価の本体
+    
     Args:
         inference_id: 推論ID
         evaluation_request: 評価リクエスト
@@ -352,7 +440,7 @@ async def execute_inference_evaluation(
     
     try:
         # 推論のステータスを更新（進捗は表示しない）
-        inference_repo.update_inference(inference_id, {"status": InferenceStatus.RUNNING, "progress": -1})
+        await asyncio.to_thread(inference_repo.update_inference, inference_id, {"status": InferenceStatus.RUNNING, "progress": -1})
         
         # 追加パラメータを準備（プロバイダごとのデフォルト設定を適用）
         additional_params = get_provider_options(provider_name)
@@ -368,8 +456,6 @@ async def execute_inference_evaluation(
         )
         
         # 結果をJSONファイルに保存
-        import os
-        import time
         results_dir = "/app/results"
         if not os.path.exists(results_dir):
             os.makedirs(results_dir)
@@ -393,7 +479,7 @@ async def execute_inference_evaluation(
                 "provider": provider_name,
                 "model": model_name,
                 "timestamp": datetime.now().isoformat(),
-                "evaluation_request": evaluation_request.dict(),
+                "evaluation_request": evaluation_request.model_dump(),
                 "results_file": results_filename
             }
             json.dump(inference_info, f, ensure_ascii=False, indent=2)
@@ -403,52 +489,31 @@ async def execute_inference_evaluation(
         
         # デバッグ用：推論結果ファイルへのアクセスパスを記録
         n_shots_value = evaluation_request.n_shots[0] if evaluation_request.n_shots and len(evaluation_request.n_shots) > 0 else 0
-        inference_repo.update_inference(inference_id, {
+        await asyncio.to_thread(inference_repo.update_inference, inference_id, {
             "description": f"最新の推論結果ファイル: {results_filename}\nモデル: {provider_name}/{model_name}, n_shots: {n_shots_value}"
         })
         
         # フラットなメトリクス辞書を作成（n_shots情報を含める）
-        flat_metrics: Dict[str, Any] = {}
         n_shots_value = evaluation_request.n_shots[0] if evaluation_request.n_shots and len(evaluation_request.n_shots) > 0 else 0
         n_shots_suffix = f"_{n_shots_value}shot"
         
         # 新しいベストプラクティス: n_shots_value をメトリクス辞書に追加して、MLflowの子ラン作成に使用
-        flat_metrics["n_shots_value"] = n_shots_value
+        flat_metrics: Dict[str, Any] = {"n_shots_value": n_shots_value}
         
         for ds, ds_res in results_full.get("results", {}).items():
-            details = ds_res.get("details", {})
-            for key, value in details.items():
-                if key.endswith("_details") or key.endswith("_error_rate"):
-                    continue
-                
-                # データセット名から余分な情報を除去
-                original_ds_name = ds.split('/')[-1].replace('.json', '')
-                
-                # n_shotサフィックスがあれば取り除く（すでに含まれている場合）
-                ds_name = original_ds_name
-                for shot_suffix in ["_0shot", "_1shot", "_2shot", "_3shot", "_4shot", "_5shot"]:
-                    if shot_suffix in ds_name:
-                        ds_name = ds_name.replace(shot_suffix, "")
-                        break
-                
-                # シンプルな解決 - 既に正規化されているメトリクスを使用
-                # キーにショット情報が含まれているかチェック
-                if any('shot' in part for part in key.split('_')):
-                    # 既にショット情報が含まれている場合はそのまま使用
-                    flat_metrics[key] = value
-                else:
-                    # ショット情報がない場合は追加
-                    normalized_key = f"{ds_name}_{n_shots_value}shot_{key}"
-                    flat_metrics[normalized_key] = value
-                
-                # n_shots_value をメトリクス辞書に保存（MLflowログ用）
-                flat_metrics["n_shots_value"] = n_shots_value
+            ds_name = _base_dataset_name(ds)
+            # キーに既にショット情報が含まれている場合はそのまま、無い場合は「データセット名_Nshot_」を付与
+            flat_metrics.update({
+                key if "shot" in key else f"{ds_name}_{n_shots_value}shot_{key}": value
+                for key, value in ds_res.get("details", {}).items()
+                if not key.endswith(_SKIP_SUFFIXES)
+            })
         
         # メトリクスが空の場合は警告
         if not flat_metrics:
             logger.warning(f"推論 {inference_id} のメトリクスが空です。評価が正しく行われなかった可能性があります。")
             # メトリクスが空でも完了とするが、エラーメッセージを設定
-            inference_repo.update_inference(inference_id, {
+            await asyncio.to_thread(inference_repo.update_inference, inference_id, {
                 "status": InferenceStatus.COMPLETED,
                 "progress": 100,
                 "metrics": {},
@@ -467,11 +532,10 @@ async def execute_inference_evaluation(
                 logger.info(f"📊 メトリクスの例 (5件): {metrics_sample}")
                 
                 # メトリクスデータのログファイルを作成（トラブルシューティング用）
-                from app.utils.logging import log_evaluation_results
-                import time
-                metrics_log_file = f"/app/inference_metrics_{provider_name}_{model_name}{n_shots_suffix}_{int(time.time())}.json"
-                with open(metrics_log_file, "w") as f:
-                    json.dump({
+                # デバッグ時のみ、イベントループを塞がないようスレッドで書き出す
+                if logger.isEnabledFor(logging.DEBUG):
+                    metrics_log_file = f"/app/inference_metrics_{provider_name}_{model_name}{n_shots_suffix}_{int(time.time())}.json"
+                    await asyncio.to_thread(_dump_json, metrics_log_file, {
                         "inference_id": inference_id,
                         "provider": provider_name,
                         "model": model_name,
@@ -479,23 +543,16 @@ async def execute_inference_evaluation(
                         "n_shots_suffix": n_shots_suffix,
                         "timestamp": datetime.now().isoformat(),
                         "metrics": flat_metrics
-                    }, f, indent=2)
-                logger.info(f"📊 推論メトリクスデータをログファイルに保存しました: {metrics_log_file}")
-                
-                # MLflowへのロギング実行（デバッグ詳細付き）
-                from app.utils.logging import log_evaluation_results
+                    })
+                    logger.debug(f"📊 推論メトリクスデータをログファイルに保存しました: {metrics_log_file}")
                 
-                # メトリクスのタイプを確認（デバッグ用）
-                for key, value in flat_metrics.items():
-                    logger.info(f"📊 メトリクスの型確認: {key}={value} (type: {type(value).__name__})")
-                    
-                    # 値が数値でない場合は補正
-                    if not isinstance(value, (int, float)):
-                        try:
-                            flat_metrics[key] = float(value)
-                            logger.info(f"🔄 メトリクスを数値型に変換: {key}={flat_metrics[key]}")
-                        except (ValueError, TypeError):
-                            logger.warning(f"⚠️ メトリクス {key} を数値に変換できません: {value}")
+                # 値を数値型に揃え、変換できないメトリクスは除外（1パス）
+                coerced = {key: _to_float(value) for key, value in flat_metrics.items()}
+                dropped = [key for key, value in coerced.items() if value is None]
+                if dropped:
+                    logger.warning(f"⚠️ 数値に変換できないメトリクスを除外しました: {dropped}")
+                flat_metrics = {key: value for key, value in coerced.items() if value is not None}
+                logger.debug(f"📊 メトリクス {len(flat_metrics)} 件の型を確認しました")
                 
                 # n_shotsの情報をログ
                 logger.info(f"📊 メトリクス名に追加されたn_shots情報: {n_shots_suffix}")
@@ -513,7 +570,6 @@ async def execute_inference_evaluation(
                 logger.error(f"❌ MLflowへのログ記録中にエラーが発生: {error_message}", exc_info=True)
                 
                 # エラーをファイルに記録
-                import traceback
                 error_log_file = f"/app/inference_mlflow_error_{provider_name}_{model_name}_{int(time.time())}.txt"
                 with open(error_log_file, "w") as f:
                     f.write(f"Error logging metrics for inference {inference_id} ({provider_name}/{model_name}): {error_message}\n\n")
@@ -521,7 +577,7 @@ async def execute_inference_evaluation(
                 logger.error(f"❌ MLflowエラーログをファイルに保存しました: {error_log_file}")
             
             # 推論のステータスを完了に更新（メトリクスあり）
-            inference_repo.update_inference(inference_id, {
+            await asyncio.to_thread(inference_repo.update_inference, inference_id, {
                 "status": InferenceStatus.COMPLETED,
                 "progress": 100,
                 "metrics": flat_metrics,
@@ -531,30 +587,28 @@ async def execute_inference_evaluation(
         logger.info(f"推論 {inference_id} の評価が完了しました")
         
     except Exception as e:
-        import traceback
-        error_detail = traceback.format_exc()
-        logger.error(f"推論 {inference_id} の評価中にエラーが発生しました: {str(e)}", exc_info=True)
+        # スタックトレースは exc_info=True でログに出力される
+        logger.error("推論 %s の評価中にエラーが発生しました: %s", inference_id, e, exc_info=True)
         
         # エラーの詳細情報を取得
         error_message = str(e)
         error_type = e.__class__.__name__
         
-        # エラー発生場所の特定を試みる
+        # エラー発生場所の特定（スタック全体は展開せず、最後のフレームだけを辿る）
         error_context = ""
-        try:
-            tb = traceback.extract_tb(e.__traceback__)
-            if tb:
-                last_frame = tb[-1]
-                error_context = f"{last_frame.filename}の{last_frame.name}関数({last_frame.lineno}行目)"
-        except:
-            pass
+        tb = e.__traceback__
+        if tb is not None:
+            while tb.tb_next is not None:
+                tb = tb.tb_next
+            code = tb.tb_frame.f_code
+            error_context = f"{code.co_filename}の{code.co_name}関数({tb.tb_lineno}行目)"
         
         # エラー時は推論のステータスを失敗に更新（詳細なエラー情報付き）
         detailed_error = f"エラー: {error_type} - {error_message}"
         if error_context:
             detailed_error += f"\n場所: {error_context}"
         
-        inference_repo.update_inference(inference_id, {
+        await asyncio.to_thread(inference_repo.update_inference, inference_id, {
             "status": InferenceStatus.FAILED,
             "error": detailed_error
         })
@@ -576,7 +630,7 @@ async def get_inference(
     try:
         # リポジトリから推論を取得
         inference_repo = get_inference_repository()
-        inference_db = inference_repo.get_inference_by_id(inference_id)
+        inference_db = await asyncio.to_thread(inference_repo.get_inference_by_id, inference_id)
         
         if not inference_db:
             raise HTTPException(
@@ -584,52 +638,12 @@ async def get_inference(
                 detail=f"推論ID '{inference_id}' が見つかりません"
             )
         
-        # 結果を変換
-        results = []
-        for res in inference_db.get("results", []):
-            results.append(InferenceResult(
-                id=res["id"],
-                inference_id=res["inference_id"],
-                input=res["input"],
-                expected_output=res.get("expected_output"),
-                actual_output=res["actual_output"],
-                metrics=res.get("metrics"),
-                latency=res.get("latency"),
-                token_count=res.get("token_count"),
-                created_at=datetime.fromisoformat(res["created_at"]) if isinstance(res["created_at"], str) else res["created_at"]
-            ))
-        
-        # 日付文字列をdatetimeに変換
-        created_at = datetime.fromisoformat(inference_db["created_at"]) if isinstance(inference_db["created_at"], str) else inference_db["created_at"]
-        updated_at = datetime.fromisoformat(inference_db["updated_at"]) if isinstance(inference_db["updated_at"], str) else inference_db["updated_at"]
-        completed_at = None
-        if inference_db.get("completed_at"):
-            completed_at = datetime.fromisoformat(inference_db["completed_at"]) if isinstance(inference_db["completed_at"], str) else inference_db["completed_at"]
-        
-        # 推論オブジェクトを構築
-        inference = Inference(
-            id=inference_db["id"],
-            name=inference_db["name"],
-            description=inference_db.get("description"),
-            dataset_id=inference_db["dataset_id"],
-            provider_id=inference_db["provider_id"],
-            model_id=inference_db["model_id"],
-            status=InferenceStatus(inference_db["status"]),
-            progress=inference_db["progress"],
-            metrics=inference_db.get("metrics"),
-            results=results,
-            created_at=created_at,
-            updated_at=updated_at,
-            completed_at=completed_at,
-            error=inference_db.get("error")
-        )
-        
-        return inference
+        return _inference_from_db(inference_db)
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"推論取得エラー: {str(e)}", exc_info=True)
+        logger.error("推論取得エラー: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"推論取得エラー: {str(e)}"
@@ -654,7 +668,7 @@ async def update_inference(
     try:
         # リポジトリから推論を取得
         inference_repo = get_inference_repository()
-        inference_db = inference_repo.get_inference_by_id(inference_id)
+        inference_db = await asyncio.to_thread(inference_repo.get_inference_by_id, inference_id)
         
         if not inference_db:
             raise HTTPException(
@@ -663,10 +677,10 @@ async def update_inference(
             )
         
         # 更新データを準備
-        update_data = inference_data.dict(exclude_unset=True)
+        update_data = _INFERENCE_UPDATE_ADAPTER.dump_python(inference_data, exclude_unset=True)
         
         # 更新を実行
-        updated_inference = inference_repo.update_inference(inference_id, update_data)
+        updated_inference = await asyncio.to_thread(inference_repo.update_inference, inference_id, update_data)
         
         if not updated_inference:
             raise HTTPException(
@@ -674,52 +688,12 @@ async def update_inference(
                 detail="推論の更新に失敗しました"
             )
         
-        # 結果を変換
-        results = []
-        for res in updated_inference.get("results", []):
-            results.append(InferenceResult(
-                id=res["id"],
-                inference_id=res["inference_id"],
-                input=res["input"],
-                expected_output=res.get("expected_output"),
-                actual_output=res["actual_output"],
-                metrics=res.get("metrics"),
-                latency=res.get("latency"),
-                token_count=res.get("token_count"),
-                created_at=datetime.fromisoformat(res["created_at"]) if isinstance(res["created_at"], str) else res["created_at"]
-            ))
-        
-        # 日付文字列をdatetimeに変換
-        created_at = datetime.fromisoformat(updated_inference["created_at"]) if isinstance(updated_inference["created_at"], str) else updated_inference["created_at"]
-        updated_at = datetime.fromisoformat(updated_inference["updated_at"]) if isinstance(updated_inference["updated_at"], str) else updated_inference["updated_at"]
-        completed_at = None
-        if updated_inference.get("completed_at"):
-            completed_at = datetime.fromisoformat(updated_inference["completed_at"]) if isinstance(updated_inference["completed_at"], str) else updated_inference["completed_at"]
-        
-        # 推論オブジェクトを構築
-        inference = Inference(
-            id=updated_inference["id"],
-            name=updated_inference["name"],
-            description=updated_inference.get("description"),
-            dataset_id=updated_inference["dataset_id"],
-            provider_id=updated_inference["provider_id"],
-            model_id=updated_inference["model_id"],
-            status=InferenceStatus(updated_inference["status"]),
-            progress=updated_inference["progress"],
-            metrics=updated_inference.get("metrics"),
-            results=results,
-            created_at=created_at,
-            updated_at=updated_at,
-            completed_at=completed_at,
-            error=updated_inference.get("error")
-        )
-        
-        return inference
+        return _inference_from_db(updated_inference)
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"推論更新エラー: {str(e)}", exc_info=True)
+        logger.error("推論更新エラー: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"推論更新エラー: {str(e)}"
@@ -739,7 +713,7 @@ async def delete_inference(
     try:
         # リポジトリから推論を取得
         inference_repo = get_inference_repository()
-        inference_db = inference_repo.get_inference_by_id(inference_id)
+        inference_db = await asyncio.to_thread(inference_repo.get_inference_by_id, inference_id)
         
         if not inference_db:
             raise HTTPException(
@@ -748,7 +722,7 @@ async def delete_inference(
             )
         
         # 削除を実行
-        success = inference_repo.delete_inference(inference_id)
+        success = await asyncio.to_thread(inference_repo.delete_inference, inference_id)
         
         if not success:
             raise HTTPException(
@@ -759,7 +733,7 @@ async def delete_inference(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"推論削除エラー: {str(e)}", exc_info=True)
+        logger.error("推論削除エラー: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"推論削除エラー: {str(e)}"
@@ -784,7 +758,7 @@ async def run_inference(
     try:
         # リポジトリから推論を取得
         inference_repo = get_inference_repository()
-        inference_db = inference_repo.get_inference_by_id(inference_id)
+        inference_db = await asyncio.to_thread(inference_repo.get_inference_by_id, inference_id)
         
         if not inference_db:
             raise HTTPException(
@@ -800,17 +774,15 @@ async def run_inference(
             )
         
         # プロバイダとモデル情報の取得
-        provider_repo = get_provider_repository()
-        model_repo = get_model_repository()
-        
-        provider = provider_repo.get_provider_by_id(inference_db["provider_id"])
+        provider, model = await asyncio.to_thread(
+            _get_provider_and_model, inference_db["provider_id"], inference_db["model_id"]
+        )
         if not provider:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"プロバイダID '{inference_db['provider_id']}' が見つかりません"
             )
         
-        model = model_repo.get_model_by_id(inference_db["model_id"])
         if not model:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -818,19 +790,16 @@ async def run_inference(
             )
         
         # パラメータを取得
-        parameters = inference_db.get("parameters", {})
-        
+        parameters = inference_db.get("parameters") or {}
+
         # データセット名を抽出
         dataset_name = inference_db["dataset_id"].split('/')[-1].replace('.json', '')
-        
+
         # データセットタイプを取得（パラメータに保存されていれば使用）
-        dataset_type = None
-        if inference_db.get("parameters") and "dataset_type" in inference_db["parameters"]:
-            dataset_type = inference_db["parameters"]["dataset_type"]
+        if dataset_type := parameters.get("dataset_type"):
             logger.info(f"パラメータからデータセットタイプを取得: {dataset_type}")
         
         # データセットを取得
-        from app.utils.dataset.operations import get_dataset_by_name
         dataset_info = None
         
         # データセットタイプが指定されている場合は取得を試みる
@@ -866,7 +835,7 @@ async def run_inference(
         
         # それでも取得できない場合はエラー
         if not dataset_info:
-            logger.error(f"データセットが見つかりません: {dataset_name}")
+            logger.warning("データセットが見つかりません: %s", dataset_name)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"データセット '{dataset_name}' が見つかりません"
@@ -889,8 +858,8 @@ async def run_inference(
             model=model_config
         )
         
-        # 推論のステータスを更新
-        inference_repo.update_inference(inference_id, {
+        # 推論のステータスを更新（リポジトリは更新後の行を返すため再取得は不要）
+        updated_inference = await asyncio.to_thread(inference_repo.update_inference, inference_id, {
             "status": InferenceStatus.PENDING,
             "progress": 0,
             "error": None
@@ -905,112 +874,58 @@ async def run_inference(
             model_name=model["name"]
         )
         
-        # 更新された推論を取得
-        updated_inference = inference_repo.get_inference_by_id(inference_id)
-        
-        # 結果を変換
-        results = []
-        for res in updated_inference.get("results", []):
-            results.append(InferenceResult(
-                id=res["id"],
-                inference_id=res["inference_id"],
-                input=res["input"],
-                expected_output=res.get("expected_output"),
-                actual_output=res["actual_output"],
-                metrics=res.get("metrics"),
-                latency=res.get("latency"),
-                token_count=res.get("token_count"),
-                created_at=datetime.fromisoformat(res["created_at"]) if isinstance(res["created_at"], str) else res["created_at"]
-            ))
-        
-        # 日付文字列をdatetimeに変換
-        created_at = datetime.fromisoformat(updated_inference["created_at"]) if isinstance(updated_inference["created_at"], str) else updated_inference["created_at"]
-        updated_at = datetime.fromisoformat(updated_inference["updated_at"]) if isinstance(updated_inference["updated_at"], str) else updated_inference["updated_at"]
-        completed_at = None
-        if updated_inference.get("completed_at"):
-            completed_at = datetime.fromisoformat(updated_inference["completed_at"]) if isinstance(updated_inference["completed_at"], str) else updated_inference["completed_at"]
-        
-        # 推論オブジェクトを構築
-        inference = Inference(
-            id=updated_inference["id"],
-            name=updated_inference["name"],
-            description=updated_inference.get("description"),
-            dataset_id=updated_inference["dataset_id"],
-            provider_id=updated_inference["provider_id"],
-            model_id=updated_inference["model_id"],
-            status=InferenceStatus(updated_inference["status"]),
-            progress=updated_inference["progress"],
-            metrics=updated_inference.get("metrics"),
-            results=results,
-            created_at=created_at,
-            updated_at=updated_at,
-            completed_at=completed_at,
-            error=updated_inference.get("error")
-        )
-        
-        return inference
+        return _inference_from_db(updated_inference)
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"推論実行エラー: {str(e)}", exc_info=True)
+        logger.error("推論実行エラー: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"推論実行エラー: {str(e)}"
         )
 
 
+# 詳細情報の結果サンプルに含める項目
+_SAMPLE_RESULT_FIELDS = ("id", "input", "expected_output", "actual_output", "metrics", "latency", "token_count")
+
+
 @router.get("/{inference_id}/results", response_model=List[InferenceResult])
 async def get_inference_results(
-    inference_id: str = Path(..., description="推論ID")
+    inference_id: str = Path(..., description="推論ID"),
+    limit: Optional[int] = Query(None, ge=1, description="取得する最大件数（未指定の場合はすべて）"),
+    offset: int = Query(0, ge=0, description="取得開始位置")
 ):
     """
     特定の推論の結果一覧を取得します。
     
+    行の形式は InferenceResult と同一のため、Pydanticモデルは構築せずにそのままJSONにエンコードします。
+    
     Args:
         inference_id: 推論ID
+        limit: 取得する最大件数
+        offset: 取得開始位置
         
     Returns:
-        List[InferenceResult]: 推論結果一覧
+        ORJSONResponse: 推論結果一覧（List[InferenceResult]形式のJSON）
     """
     try:
-        # リポジトリから推論を取得（存在チェック）
+        # 推論の存在チェック（結果は読み込まない）
         inference_repo = get_inference_repository()
-        inference_db = inference_repo.get_inference_by_id(inference_id)
-        
-        if not inference_db:
+        if not await asyncio.to_thread(inference_repo.inference_exists, inference_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"推論ID '{inference_id}' が見つかりません"
             )
         
-        # 推論結果を取得
-        results_db = inference_repo.get_inference_results(inference_id)
-        
-        # API応答モデルにマッピング
-        results = []
-        for res in results_db:
-            # 日付文字列をdatetimeに変換
-            created_at = datetime.fromisoformat(res["created_at"]) if isinstance(res["created_at"], str) else res["created_at"]
-            
-            results.append(InferenceResult(
-                id=res["id"],
-                inference_id=res["inference_id"],
-                input=res["input"],
-                expected_output=res.get("expected_output"),
-                actual_output=res["actual_output"],
-                metrics=res.get("metrics"),
-                latency=res.get("latency"),
-                token_count=res.get("token_count"),
-                created_at=created_at
-            ))
-        
-        return results
+        # 推論結果はlimit/offsetの範囲をまとめて取得する（読み込み中のカーソルを他のスレッドと共有しない）
+        results = await asyncio.to_thread(inference_repo.get_inference_results, inference_id, limit=limit, offset=offset)
+        return ORJSONResponse(content=results)
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"推論結果取得エラー: {str(e)}", exc_info=True)
+        logger.error("推論結果取得エラー: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"推論結果取得エラー: {str(e)}"
@@ -1033,7 +948,7 @@ async def get_inference_detail(
     try:
         # リポジトリから推論を取得
         inference_repo = get_inference_repository()
-        inference_db = inference_repo.get_inference_by_id(inference_id)
+        inference_db = await asyncio.to_thread(inference_repo.get_inference_by_id, inference_id)
         
         if not inference_db:
             raise HTTPException(
@@ -1042,30 +957,20 @@ async def get_inference_detail(
             )
         
         # プロバイダとモデル情報の取得
-        provider_repo = get_provider_repository()
-        model_repo = get_model_repository()
-        
-        provider = provider_repo.get_provider_by_id(inference_db["provider_id"])
-        model = model_repo.get_model_by_id(inference_db["model_id"])
+        provider, model = await asyncio.to_thread(
+            _get_provider_and_model, inference_db["provider_id"], inference_db["model_id"]
+        )
         
         # 結果のサンプルを取得（最大10件）
-        results_db = inference_repo.get_inference_results(inference_id, limit=10)
-        
-        # 結果をAPI応答形式に変換
-        results = []
-        for res in results_db:
-            results.append({
-                "id": res["id"],
-                "input": res["input"],
-                "expected_output": res.get("expected_output"),
-                "actual_output": res["actual_output"],
-                "metrics": res.get("metrics"),
-                "latency": res.get("latency"),
-                "token_count": res.get("token_count")
-            })
+        results_db = await asyncio.to_thread(inference_repo.get_inference_results, inference_id, limit=10)
+        
+        # 結果をAPI応答形式に変換（サンプルに含める項目だけを取り出す）
+        results = [
+            {field: res.get(field) for field in _SAMPLE_RESULT_FIELDS}
+            for res in results_db
+        ]
             
         # 保存されたJSONファイルの取得を試みる
-        import os
         inference_json_path = f"/app/results/{inference_id}/inference.json"
         results_json_data = None
         saved_results_path = None
@@ -1081,7 +986,7 @@ async def get_inference_detail(
                         results_json_data = json.load(f)
                         logger.info(f"保存されたJSON結果ファイルを読み込みました: {saved_results_path}")
             except Exception as e:
-                logger.error(f"JSON結果ファイルの読み込みエラー: {str(e)}", exc_info=True)
+                logger.error("JSON結果ファイルの読み込みエラー: %s", e, exc_info=True)
         
         # パラメータ情報
         parameters = inference_db.get("parameters", {})
@@ -1210,7 +1115,7 @@ async def get_inference_detail(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"推論詳細取得エラー: {str(e)}", exc_info=True)
+        logger.error("推論詳細取得エラー: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"推論詳細取得エラー: {str(e)}"
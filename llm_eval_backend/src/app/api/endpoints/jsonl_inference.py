@@ -6,21 +6,23 @@ JSONLフォーマットのマルチターン会話データセット（MT-Bench
 """
 import asyncio
 import logging
+import time
 import uuid
 import os
-import json
-from typing import Dict, Any, List, Optional
-from fastapi import APIRouter, HTTPException, BackgroundTasks, status
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Any, Coroutine, Iterable, List, Optional, Set, Tuple
+import orjson
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import ValidationError
 
 from app.api.models import JsonlInferenceRequest, JsonlInferenceResponse
 from app.utils.jsonl_inference import run_inference_on_jsonl, save_jsonl_inference_results
 from app.utils.db.models import get_model_repository
-from app.utils.db.providers import get_provider_repository
 from app.config.config import get_settings
 
 # ルーター設定
-router = APIRouter(prefix="/jsonl-inference", tags=["jsonl-inference"])
+router = APIRouter(prefix="/jsonl-inference", tags=["jsonl-inference"], default_response_class=ORJSONResponse)
 
 # ロガー設定
 logger = logging.getLogger(__name__)
@@ -28,76 +30,404 @@ logger = logging.getLogger(__name__)
 # 設定取得
 settings = get_settings()
 
-# 実行中のジョブを追跡する辞書（実際の実装では永続化ストレージを使用するべき）
-running_jobs: Dict[str, Dict[str, Any]] = {}
+
+# 終了したジョブの保持期間（秒）と保持するジョブ数の上限
+_FINISHED_JOB_TTL_SECONDS = 3600
+_MAX_JOBS = 10_000
+
+# 終了状態のステータス
+_FINISHED_STATUSES = ("completed", "failed")
+
+# 結果プレビューに含める質問数
+_PREVIEW_QUESTIONS = 5
+
+
+@dataclass(slots=True)
+class JobInfo:
+    """JSONL推論ジョブの状態"""
+    job_id: str
+    status: str
+    dataset_path: str
+    model_label: str
+    dataset_name: str
+    result_file: Optional[str] = None
+    summary: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+
+def _status_event(job_info: JobInfo) -> Dict[str, Any]:
+    """ジョブ情報から配信用の状態イベントを作成する
+
+    Args:
+        job_info: ジョブ情報
+
+    Returns:
+        Dict[str, Any]: 状態イベント
+    """
+    return {
+        "job_id": job_info.job_id,
+        "status": job_info.status,
+        "result_file": job_info.result_file,
+        "error": job_info.error
+    }
+
+
+class JobStore:
+    """JSONL推論ジョブの状態を保持するストア
+
+    HTTPハンドラとバックグラウンドタスクの双方から更新されるため、
+    変更操作は asyncio.Lock で直列化する（実際の実装では永続化ストレージを使用するべき）。
+    終了したジョブは ttl 秒経過後、またはジョブ数が maxsize を超えた場合に古い順に破棄する。
+    ステータスが変わるたびに、購読中のキューへ状態イベントを配信する。
+    """
+
+    def __init__(self, ttl: float = _FINISHED_JOB_TTL_SECONDS, maxsize: int = _MAX_JOBS):
+        self._jobs: Dict[str, JobInfo] = {}
+        # 終了したジョブIDと終了時刻（終了順に並ぶ）
+        self._finished_at: Dict[str, float] = {}
+        self._ttl = ttl
+        self._maxsize = maxsize
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._lock = asyncio.Lock()
+
+    def _evict(self) -> None:
+        """期限切れ・上限超過の終了済みジョブを古い順に破棄する"""
+        deadline = time.monotonic() - self._ttl
+        while self._finished_at:
+            job_id, finished_at = next(iter(self._finished_at.items()))
+            if finished_at > deadline and len(self._jobs) <= self._maxsize:
+                break
+            del self._finished_at[job_id]
+            self._jobs.pop(job_id, None)
+
+    def _publish(self, job_id: str, event: Optional[Dict[str, Any]]) -> None:
+        """ジョブの購読者にイベントを配信する（Noneは配信終了を表す）"""
+        for queue in self._subscribers.get(job_id, ()):
+            queue.put_nowait(event)
+
+    def subscribe(self, job_id: str) -> asyncio.Queue:
+        """ジョブの状態イベントを購読する
+
+        Args:
+            job_id: ジョブID
+
+        Returns:
+            asyncio.Queue: 状態イベントが届くキュー
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.setdefault(job_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, job_id: str, queue: asyncio.Queue) -> None:
+        """ジョブの状態イベントの購読を解除する
+
+        Args:
+            job_id: ジョブID
+            queue: subscribe で取得したキュー
+        """
+        queues = self._subscribers.get(job_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[job_id]
+
+    def get(self, job_id: str) -> Optional[JobInfo]:
+        """ジョブ情報を取得する
+
+        Args:
+            job_id: ジョブID
+
+        Returns:
+            Optional[JobInfo]: ジョブ情報（存在しない場合はNone）
+        """
+        self._evict()
+        return self._jobs.get(job_id)
+
+    async def add(self, job_info: JobInfo) -> None:
+        """ジョブを登録する
+
+        Args:
+            job_info: ジョブ情報
+        """
+        async with self._lock:
+            self._jobs[job_info.job_id] = job_info
+            self._evict()
+
+    async def update(self, job_id: str, **fields: Any) -> bool:
+        """ジョブ情報の項目を更新する
+
+        Args:
+            job_id: ジョブID
+            **fields: 更新する項目
+
+        Returns:
+            bool: 更新できた場合はTrue（ジョブが存在しない場合はFalse）
+        """
+        async with self._lock:
+            job_info = self._jobs.get(job_id)
+            if job_info is None:
+                return False
+            for name, value in fields.items():
+                setattr(job_info, name, value)
+            if "status" in fields:
+                if fields["status"] in _FINISHED_STATUSES:
+                    self._finished_at.pop(job_id, None)
+                    self._finished_at[job_id] = time.monotonic()
+                self._publish(job_id, _status_event(job_info))
+            return True
+
+    async def set_status(self, job_id: str, status: str, **fields: Any) -> bool:
+        """ジョブのステータスと付随する項目を更新する
+
+        Args:
+            job_id: ジョブID
+            status: 新しいステータス
+            **fields: 併せて更新する項目
+
+        Returns:
+            bool: 更新できた場合はTrue（ジョブが存在しない場合はFalse）
+        """
+        return await self.update(job_id, status=status, **fields)
+
+    async def delete(self, job_id: str) -> Optional[JobInfo]:
+        """実行中でないジョブを削除する
+
+        ステータスの確認と削除を同じロック内で行うため、実行開始と競合しても
+        実行中のジョブが削除されることはない。
+
+        Args:
+            job_id: ジョブID
+
+        Returns:
+            Optional[JobInfo]: 対象のジョブ情報（存在しない場合はNone、実行中の場合は削除せずに返す）
+        """
+        async with self._lock:
+            job_info = self._jobs.get(job_id)
+            if job_info is not None and job_info.status != "running":
+                del self._jobs[job_id]
+                self._finished_at.pop(job_id, None)
+                self._publish(job_id, None)
+            return job_info
+
+
+# 実行中のジョブを追跡するストア
+job_store = JobStore()
+
+# 実行中の推論タスク（完了前にGCで破棄されないよう参照を保持する）
+_job_tasks: Set[asyncio.Task] = set()
+
+
+def _submit_job(coro: Coroutine[Any, Any, None]) -> asyncio.Task:
+    """推論ジョブをリクエストのライフサイクルから切り離して実行する
+
+    Args:
+        coro: 実行するコルーチン
+
+    Returns:
+        asyncio.Task: 作成されたタスク
+    """
+    task = asyncio.create_task(coro)
+    _job_tasks.add(task)
+    task.add_done_callback(_job_tasks.discard)
+    return task
+
+
+# プロバイダタイプ・モデル名の参照キャッシュ（レコードの変更を反映するため短い期間のみ保持する）
+_LOOKUP_CACHE_TTL_SECONDS = 60
+_LOOKUP_CACHE_MAXSIZE = 1024
+_lookup_cache: Dict[Tuple[str, str], Tuple[float, str, str]] = {}
+
+
+async def _lookup_provider_and_model(provider_id: str, model_id: str) -> Tuple[Optional[str], Optional[str]]:
+    """プロバイダタイプとモデル名を取得する（キャッシュ優先、DBへは1回のクエリで問い合わせる）
+
+    Args:
+        provider_id: プロバイダID
+        model_id: モデルID
+
+    Returns:
+        Tuple[Optional[str], Optional[str]]: (プロバイダタイプ, モデル名)（存在しない方はNone）
+    """
+    key = (provider_id, model_id)
+    now = time.monotonic()
+    cached = _lookup_cache.get(key)
+    if cached is not None and cached[0] > now:
+        return cached[1], cached[2]
+
+    provider_type, model_name = await asyncio.to_thread(
+        get_model_repository().get_provider_type_and_model_name, provider_id, model_id
+    )
+    if provider_type is not None and model_name is not None:
+        if len(_lookup_cache) >= _LOOKUP_CACHE_MAXSIZE:
+            _lookup_cache.clear()
+        _lookup_cache[key] = (now + _LOOKUP_CACHE_TTL_SECONDS, provider_type, model_name)
+    return provider_type, model_name
+
+
+def _summarize_questions(questions: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """推論結果の質問リストを1パスで集計する
+
+    Args:
+        questions: 推論結果の質問リスト
+
+    Returns:
+        Dict[str, Any]: 質問数、完了数、最初の質問のプレビュー
+    """
+    total_questions = 0
+    total_completed = 0
+    first_question = None
+    for question in questions:
+        if first_question is None:
+            first_question = question
+        total_questions += 1
+        if any(not t.get("error") for t in question.get("turns", [])):
+            total_completed += 1
+
+    # 最初の質問はプレビューに必要な項目だけを保持する
+    first_question_preview = None
+    if first_question is not None:
+        first_question_preview = {
+            "question_id": first_question.get("question_id"),
+            "category": first_question.get("category", "なし"),
+            "turns": [
+                {
+                    "user_input": turn.get("user_input", "なし"),
+                    "model_output": turn.get("model_output", "エラー")
+                }
+                for turn in first_question.get("turns", [])
+            ]
+        }
+
+    return {
+        "total_questions": total_questions,
+        "total_completed": total_completed,
+        "first_question_preview": first_question_preview
+    }
+
+
+def _load_preview(result_file: str) -> Dict[str, Any]:
+    """結果ファイルを読み込み、UI表示用のプレビューを作成する
+
+    Args:
+        result_file: 結果ファイルのパス
+
+    Returns:
+        Dict[str, Any]: 質問数、完了数、先頭 _PREVIEW_QUESTIONS 件の質問と省略した質問数
+    """
+    with open(result_file, "rb") as f:
+        result_data = orjson.loads(f.read())
+
+    questions = result_data.get("questions", [])
+    return {
+        "total_questions": result_data.get("total_questions", 0),
+        "completed_questions": result_data.get("completed_questions", 0),
+        "questions": [
+            {
+                "question_id": question.get("question_id"),
+                "category": question.get("category"),
+                "turns": [
+                    {
+                        "user_input": turn.get("user_input"),
+                        "model_output": turn.get("model_output"),
+                        "latency": turn.get("latency")
+                    }
+                    for turn in question.get("turns", [])
+                ]
+            }
+            for question in questions[:_PREVIEW_QUESTIONS]
+        ],
+        "omitted_questions": max(len(questions) - _PREVIEW_QUESTIONS, 0)
+    }
+
+
+def _log_summary(job_id: str, dataset_name: str, full_model_name: str, summary: Dict[str, Any]) -> None:
+    """完了したジョブの結果要約をログに出力する
+
+    Args:
+        job_id: ジョブID
+        dataset_name: データセットのファイル名
+        full_model_name: モデル名（provider/model）
+        summary: _summarize_questions の集計結果
+    """
+    # INFOが無効な場合はメッセージの組み立て自体を省く
+    if not logger.isEnabledFor(logging.INFO):
+        return
+
+    logger.info(f"完了したJSONL推論ジョブの詳細 - ジョブID: {job_id}")
+    logger.info(f"データセット: {dataset_name}")
+    logger.info(f"モデル: {full_model_name}")
+    logger.info(f"質問数: {summary['total_questions']}件, 完了: {summary['total_completed']}件")
+
+    # 最初の質問と回答の例を表示（デバッグ用）
+    first_question = summary["first_question_preview"]
+    if first_question is not None:
+        logger.info(f"最初の質問の例 (ID: {first_question['question_id']}, カテゴリ: {first_question['category']})")
+
+        for i, turn in enumerate(first_question["turns"]):
+            logger.info(f"  ターン {i+1}:")
+            logger.info(f"    質問: {turn['user_input']}")
+            logger.info(f"    回答: {turn['model_output']}")
 
 
 @router.post("", response_model=JsonlInferenceResponse, status_code=status.HTTP_202_ACCEPTED)
 async def create_jsonl_inference(
-    request: JsonlInferenceRequest,
-    background_tasks: BackgroundTasks
+    request: JsonlInferenceRequest
 ):
     """JSONLデータセットに対する推論ジョブを作成し、バックグラウンドで実行する
 
     Args:
         request: 推論リクエスト
-        background_tasks: バックグラウンドタスク
 
     Returns:
         JsonlInferenceResponse: 推論ジョブ情報
     """
     try:
         # プロバイダとモデルの存在確認
-        provider_repo = get_provider_repository()
-        model_repo = get_model_repository()
-
-        provider = provider_repo.get_provider_by_id(request.provider_id)
-        if not provider:
+        provider_type, model_name = await _lookup_provider_and_model(request.provider_id, request.model_id)
+        if not provider_type:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"プロバイダID '{request.provider_id}' が見つかりません"
             )
 
-        model = model_repo.get_model_by_id(request.model_id)
-        if not model:
+        if not model_name:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"モデルID '{request.model_id}' が見つかりません"
             )
 
         # ジョブIDを生成
-        job_id = str(uuid.uuid4())
-
-        # ジョブ情報を初期化
-        job_info = {
-            "job_id": job_id,
-            "status": "pending",
-            "request": request.dict(),
-            "provider": provider,
-            "model": model,
-            "result_file": None
-        }
-        running_jobs[job_id] = job_info
+        job_id = uuid.uuid4().hex
+        full_model_name = f"{provider_type}/{model_name}"
+        # データセットのファイル名（パスから抽出）
+        dataset_name = os.path.basename(request.dataset_path)
+
+        # ジョブ情報を初期化（プロバイダ・モデルのレコード全体は保持せず、表示名のみ保持する）
+        job_info = JobInfo(
+            job_id=job_id,
+            status="pending",
+            dataset_path=request.dataset_path,
+            model_label=full_model_name,
+            dataset_name=dataset_name
+        )
+        await job_store.add(job_info)
 
-        # バックグラウンドタスクとして推論を実行
-        background_tasks.add_task(
-            execute_jsonl_inference,
+        # 推論はリクエストから独立したタスクとして実行（レスポンス処理の完了を待たせない）
+        _submit_job(execute_jsonl_inference(
             job_id=job_id,
             dataset_path=request.dataset_path,
-            provider_name=provider["type"],
-            model_name=model["name"],
+            dataset_name=dataset_name,
+            provider_name=provider_type,
+            model_name=model_name,
             max_tokens=request.max_tokens,
             temperature=request.temperature,
             num_samples=request.num_samples,
             system_message=request.system_message
-        )
+        ))
 
         # レスポンスを返す
-        full_model_name = f"{provider['type']}/{model['name']}"
-
-        # データセットのファイル名（パスから抽出）
-        dataset_name = os.path.basename(request.dataset_path)
-        logger.info(f"JSONLデータセット推論ジョブを作成しました: {dataset_name}, モデル: {full_model_name}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"JSONLデータセット推論ジョブを作成しました: {dataset_name}, モデル: {full_model_name}")
 
         return JsonlInferenceResponse(
             job_id=job_id,
@@ -107,14 +437,16 @@ async def create_jsonl_inference(
             model=full_model_name
         )
 
+    except HTTPException:
+        raise
     except ValidationError as e:
-        logger.error(f"入力検証エラー: {e}")
+        logger.warning("入力検証エラー: %s", e)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"入力検証エラー: {str(e)}"
         )
     except Exception as e:
-        logger.error(f"JSONLデータセット推論リクエスト処理エラー: {e}", exc_info=True)
+        logger.error("JSONLデータセット推論リクエスト処理エラー: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"JSONLデータセット推論リクエスト処理エラー: {str(e)}"
@@ -133,75 +465,126 @@ async def get_jsonl_inference_status(job_id: str):
     """
     try:
         # ジョブ情報を取得
-        job_info = running_jobs.get(job_id)
+        job_info = job_store.get(job_id)
         if not job_info:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"ジョブID '{job_id}' が見つかりません"
             )
 
-        # モデルとプロバイダー情報を取得
-        provider = job_info["provider"]
-        model = job_info["model"]
-        full_model_name = f"{provider['type']}/{model['name']}"
+        # モデル名（provider/model）を取得
+        full_model_name = job_info.model_label
 
         # ステータスに応じたメッセージを設定
         message = "推論ジョブが実行中です"
-        if job_info["status"] == "completed":
+        if job_info.status == "completed":
             message = "推論ジョブが完了しました"
-        elif job_info["status"] == "failed":
-            message = f"推論ジョブが失敗しました: {job_info.get('error', 'unknown error')}"
-
-        # 結果ファイルが存在する場合、その内容を取得してログに出力
-        result_file = job_info.get("result_file")
-        if result_file and job_info["status"] == "completed" and os.path.exists(result_file):
-            try:
-                # 結果ファイルの内容をログに出力
-                with open(result_file, "r", encoding="utf-8") as f:
-                    result_data = json.load(f)
-
-                # 結果の要約をログに出力
-                total_questions = len(result_data.get("questions", []))
-                total_completed = sum(1 for q in result_data.get("questions", [])
-                                     if any(not t.get("error") for t in q.get("turns", [])))
-
-                logger.info(f"完了したJSONL推論ジョブの詳細 - ジョブID: {job_id}")
-                logger.info(f"データセット: {os.path.basename(job_info['request']['dataset_path'])}")
-                logger.info(f"モデル: {full_model_name}")
-                logger.info(f"質問数: {total_questions}件, 完了: {total_completed}件")
-
-                # 最初の質問と回答の例を表示（デバッグ用）
-                if total_questions > 0 and "questions" in result_data and len(result_data["questions"]) > 0:
-                    first_question = result_data["questions"][0]
-                    logger.info(f"最初の質問の例 (ID: {first_question.get('question_id')}, カテゴリ: {first_question.get('category', 'なし')})")
-
-                    for i, turn in enumerate(first_question.get("turns", [])):
-                        logger.info(f"  ターン {i+1}:")
-                        logger.info(f"    質問: {turn.get('user_input', 'なし')}")
-                        logger.info(f"    回答: {turn.get('model_output', 'エラー')}")
-            except Exception as e:
-                logger.error(f"結果ファイルの読み込みに失敗しました: {e}")
+        elif job_info.status == "failed":
+            message = f"推論ジョブが失敗しました: {job_info.error or 'unknown error'}"
 
         # レスポンスを返す
         return JsonlInferenceResponse(
             job_id=job_id,
-            status=job_info["status"],
+            status=job_info.status,
             message=message,
-            dataset_path=job_info["request"]["dataset_path"],
+            dataset_path=job_info.dataset_path,
             model=full_model_name,
-            result_file=result_file
+            result_file=job_info.result_file
         )
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"JSONLデータセット推論ステータス取得エラー: {e}", exc_info=True)
+        logger.error("JSONLデータセット推論ステータス取得エラー: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"JSONLデータセット推論ステータス取得エラー: {str(e)}"
         )
 
 
+@router.get("/{job_id}/events")
+async def stream_jsonl_inference_events(job_id: str):
+    """JSONLデータセット推論ジョブの状態変化をServer-Sent Eventsで配信する
+
+    接続時に現在の状態を送信し、以降はステータスが変わるたびに送信する。
+    ジョブが完了・失敗した時点（または削除された時点）でストリームを終了するため、
+    クライアントはステータス取得APIをポーリングする必要がない。
+
+    Args:
+        job_id: ジョブID
+
+    Returns:
+        StreamingResponse: text/event-stream 形式の状態イベント
+    """
+    # 接続前の遷移を取りこぼさないよう、現在の状態を読む前に購読を開始する
+    queue = job_store.subscribe(job_id)
+    job_info = job_store.get(job_id)
+    if not job_info:
+        job_store.unsubscribe(job_id, queue)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"ジョブID '{job_id}' が見つかりません"
+        )
+
+    async def event_stream(event: Optional[Dict[str, Any]]) -> AsyncIterator[bytes]:
+        try:
+            while event is not None:
+                yield b"event: status\ndata: " + orjson.dumps(event) + b"\n\n"
+                if event["status"] in _FINISHED_STATUSES:
+                    break
+                event = await queue.get()
+        finally:
+            job_store.unsubscribe(job_id, queue)
+
+    return StreamingResponse(
+        event_stream(_status_event(job_info)),
+        media_type="text/event-stream",
+        # リバースプロキシ（nginx）でバッファリングされると遷移がすぐに届かないため無効化する
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/{job_id}/preview")
+async def get_jsonl_inference_preview(job_id: str):
+    """完了したJSONLデータセット推論ジョブの結果プレビューを取得する
+
+    UIの結果確認では先頭の数件しか表示しないため、結果ファイル全体ではなく
+    表示に必要な項目だけを返す。
+
+    Args:
+        job_id: ジョブID
+
+    Returns:
+        Dict[str, Any]: _load_preview の結果
+    """
+    job_info = job_store.get(job_id)
+    if not job_info:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"ジョブID '{job_id}' が見つかりません"
+        )
+    if job_info.status != "completed" or not job_info.result_file:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"ジョブID '{job_id}' の結果はまだありません"
+        )
+
+    try:
+        # 大きな結果ファイルの読み込み・解析でイベントループを塞がないようスレッドで実行する
+        return await asyncio.to_thread(_load_preview, job_info.result_file)
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"結果ファイル '{job_info.result_file}' が見つかりません"
+        )
+    except Exception as e:
+        logger.error("JSONLデータセット推論プレビュー取得エラー: %s", e, exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"JSONLデータセット推論プレビュー取得エラー: {str(e)}"
+        )
+
+
 @router.delete("/{job_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_jsonl_inference_job(job_id: str):
     """JSONLデータセット推論ジョブを削除する
@@ -210,27 +593,25 @@ async def delete_jsonl_inference_job(job_id: str):
         job_id: ジョブID
     """
     try:
-        # ジョブ情報を確認
-        if job_id not in running_jobs:
+        # ジョブ情報を削除（実行中のジョブは削除されない）
+        job_info = await job_store.delete(job_id)
+        if job_info is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"ジョブID '{job_id}' が見つかりません"
             )
 
         # 実行中のジョブは削除できない
-        if running_jobs[job_id]["status"] == "running":
+        if job_info.status == "running":
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="実行中のジョブは削除できません"
             )
 
-        # ジョブ情報を削除
-        del running_jobs[job_id]
-
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"JSONLデータセット推論ジョブ削除エラー: {e}", exc_info=True)
+        logger.error("JSONLデータセット推論ジョブ削除エラー: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"JSONLデータセット推論ジョブ削除エラー: {str(e)}"
@@ -240,6 +621,7 @@ async def delete_jsonl_inference_job(job_id: str):
 async def execute_jsonl_inference(
     job_id: str,
     dataset_path: str,
+    dataset_name: str,
     provider_name: str,
     model_name: str,
     max_tokens: int,
@@ -252,6 +634,7 @@ async def execute_jsonl_inference(
     Args:
         job_id: ジョブID
         dataset_path: データセットパス
+        dataset_name: データセットのファイル名
         provider_name: プロバイダ名
         model_name: モデル名
         max_tokens: 最大トークン数
@@ -260,13 +643,9 @@ async def execute_jsonl_inference(
         system_message: システムメッセージ
     """
     # ジョブ情報を更新
-    job_info = running_jobs.get(job_id)
-    if not job_info:
-        logger.error(f"ジョブID '{job_id}' の情報が見つかりません")
+    if not await job_store.set_status(job_id, "running"):
+        logger.warning("ジョブID '%s' の情報が見つかりません", job_id)
         return
-
-    job_info["status"] = "running"
-    running_jobs[job_id] = job_info
     
     try:
         # 推論を実行
@@ -285,16 +664,16 @@ async def execute_jsonl_inference(
         # 結果をファイルに保存
         result_file = await save_jsonl_inference_results(results)
         
+        # 結果の要約は完了時に一度だけ計算し、ステータス取得時に再利用する
+        summary = _summarize_questions(results.get("questions", []))
+        
         # ジョブ情報を更新
-        job_info["status"] = "completed"
-        job_info["result_file"] = result_file
-        running_jobs[job_id] = job_info
+        await job_store.set_status(job_id, "completed", result_file=result_file, summary=summary)
         
         logger.info(f"JSONLデータセット推論が完了しました: ジョブID {job_id}, 結果ファイル: {result_file}")
+        _log_summary(job_id, dataset_name, f"{provider_name}/{model_name}", summary)
     
     except Exception as e:
         # エラー発生時はジョブ情報を更新
-        logger.error(f"JSONLデータセット推論実行エラー: {e}", exc_info=True)
-        job_info["status"] = "failed"
-        job_info["error"] = str(e)
-        running_jobs[job_id] = job_info
\ No newline at end of file
+        logger.error("JSONLデータセット推論実行エラー: %s", e, exc_info=True)
+        await job_store.set_status(job_id, "failed", error=str(e))
\ No newline at end of file
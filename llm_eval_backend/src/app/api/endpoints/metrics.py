@@ -1,82 +1,150 @@
-from fastapi import APIRouter, HTTPException, Depends, Path, Query, File, UploadFile
-from typing import List, Dict, Any, Optional
+from fastapi import APIRouter, HTTPException, Depends, Path, Query, File, UploadFile, Response
+from fastapi.responses import ORJSONResponse
+from typing import List, Dict, Any, Optional, Tuple, Type
+import asyncio
 import logging
 import os
 import inspect
+import ast
 import importlib.util
 import sys
 from pathlib import Path as FilePath
+import orjson
 
 from app.api.models import (
     MetricInfo, MetricParameterInfo, MetricsListResponse, 
     MetricResponse
 )
-from app.metrics import METRIC_REGISTRY, get_metrics_functions, BaseMetric, CUSTOM_METRICS_DIR
+from app.metrics import (
+    METRIC_REGISTRY, METRICS_BY_MODULE, CUSTOM_METRIC_NAMES, get_metrics_functions, unregister_metric, BaseMetric, CUSTOM_METRICS_DIR
+)
 
 # ロガーの設定
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/metrics", tags=["metrics"])
+router = APIRouter(prefix="/metrics", tags=["metrics"], default_response_class=ORJSONResponse)
 
 
-@router.get("/available", response_model=MetricsListResponse)
-async def get_available_metrics():
+# METRIC_REGISTRY はアップロード・削除のときだけ変わるため、一覧はレジストリのバージョンごとに一度だけ作成する
+_registry_version = 0
+# (バージョン, 全評価指標一覧のJSON, カスタム評価指標一覧のJSON)
+_metrics_cache: Optional[Tuple[int, bytes, bytes]] = None
+
+
+def _bump_registry_version() -> None:
+    """METRIC_REGISTRY の変更を記録し、評価指標一覧のキャッシュを無効にする"""
+    global _registry_version
+    _registry_version += 1
+
+
+def _source_file_of(metric_cls: Type[BaseMetric]) -> str:
+    """評価指標クラスのソースファイルのパスを取得する（結果はクラスに保持し、ファイルシステムの確認は一度だけ行う）
+
+    Args:
+        metric_cls: 評価指標クラス
+
+    Returns:
+        str: ソースファイルのパス（取得できない場合は空文字列）
     """
-    利用可能な評価指標一覧を返す（組み込みと外部の両方）
-    
+    source_file = metric_cls.__dict__.get("__source_file__")
+    if source_file is None:
+        try:
+            source_file = inspect.getsourcefile(metric_cls) or ""
+        except TypeError:
+            source_file = ""
+        metric_cls.__source_file__ = source_file
+    return source_file
+
+
+def _parameters_info_of(metric_cls: Type[BaseMetric]) -> Dict[str, MetricParameterInfo]:
+    """評価指標クラスのパラメータ定義をAPIモデルに変換して取得する（変換結果はクラスに保持する）
+
+    Args:
+        metric_cls: 評価指標クラス
+
     Returns:
-        MetricsListResponse: 評価指標情報のリスト
+        Dict[str, MetricParameterInfo]: パラメータ名とパラメータ情報の辞書
     """
-    metrics_list: List[MetricInfo] = []
-    
-    # METRIC_REGISTRYから登録されている評価指標を取得
-    for name, metric_cls in METRIC_REGISTRY.items():
-        # インスタンスを作成して情報を取得
-        metric_instance = metric_cls()
-        
-        # docstringから説明を取得（可能であれば）
-        description = None
-        if metric_cls.__doc__:
-            description = metric_cls.__doc__.strip()
-        
-        # パラメータ定義を取得
-        param_defs = metric_cls.get_parameter_definitions()
-        parameters = {}
-        
-        # パラメータ定義をAPIモデルに変換
-        for param_name, param_def in param_defs.items():
-            parameters[param_name] = MetricParameterInfo(
+    parameters = metric_cls.__dict__.get("__parameters_info__")
+    if parameters is None:
+        parameters = {
+            param_name: MetricParameterInfo(
                 type=param_def.get("type", "string"),
                 description=param_def.get("description"),
                 default=param_def.get("default"),
                 required=param_def.get("required", False),
                 enum=param_def.get("enum")
             )
-        
-        # メトリクスソースファイルのパス - カスタムディレクトリにあるかどうかを確認
-        source_file = inspect.getsourcefile(metric_cls)
-        is_custom = False
-        if source_file:
-            try:
-                # カスタムディレクトリのメトリクスかどうかをチェック
-                is_custom = str(CUSTOM_METRICS_DIR) in source_file
-            except:
-                is_custom = False
-        
-        metrics_list.append(
-            MetricInfo(
-                name=name,
-                description=description,
-                parameters=parameters if parameters else None,
-                is_higher_better=getattr(metric_instance, "is_higher_better", True),
-                is_custom=is_custom
-            )
-        )
+            for param_name, param_def in metric_cls.get_parameter_definitions().items()
+        }
+        metric_cls.__parameters_info__ = parameters
+    return parameters
+
+
+def _build_metric_info(name: str, metric_cls: Type[BaseMetric]) -> MetricInfo:
+    """評価指標クラスから評価指標情報を作成する
+
+    Args:
+        name: 評価指標名
+        metric_cls: 評価指標クラス
+
+    Returns:
+        MetricInfo: 評価指標情報
+    """
+    # docstringから説明を取得（可能であれば）
+    description = None
+    if metric_cls.__doc__:
+        description = metric_cls.__doc__.strip()
+    
+    # パラメータ定義（APIモデルに変換済み）を取得
+    parameters = _parameters_info_of(metric_cls)
     
-    # 名前でソート
-    metrics_list.sort(key=lambda x: x.name)
+    # 値が高いほど良いかはクラス属性から取得する（モデルの読み込みなど重い初期化を避けるため）
+    # クラス属性がない評価指標（__init__ でのみ設定するカスタム評価指標など）に限りインスタンスを作成する
+    is_higher_better = getattr(metric_cls, "is_higher_better", None)
+    if is_higher_better is None:
+        is_higher_better = getattr(metric_cls(), "is_higher_better", True)
     
-    return MetricsListResponse(metrics=metrics_list)
+    return MetricInfo(
+        name=name,
+        description=description,
+        parameters=parameters if parameters else None,
+        is_higher_better=is_higher_better,
+        # カスタム評価指標かどうかは読み込み時に記録した名前で判定する
+        is_custom=name in CUSTOM_METRIC_NAMES
+    )
+
+
+def get_metrics_list_json() -> Tuple[bytes, bytes]:
+    """評価指標一覧をJSONで取得する（レジストリが変わっていなければキャッシュを返す）
+
+    Returns:
+        Tuple[bytes, bytes]: 全評価指標一覧とカスタム評価指標一覧（MetricsListResponse のJSON）
+    """
+    global _metrics_cache
+    if _metrics_cache is not None and _metrics_cache[0] == _registry_version:
+        return _metrics_cache[1], _metrics_cache[2]
+
+    # 名前順に作成する
+    metrics_list = [_build_metric_info(name, METRIC_REGISTRY[name]) for name in sorted(METRIC_REGISTRY)]
+    custom_list = [info for info in metrics_list if info.is_custom]
+
+    available_json = orjson.dumps(MetricsListResponse(metrics=metrics_list).model_dump())
+    custom_json = orjson.dumps(MetricsListResponse(metrics=custom_list).model_dump())
+    _metrics_cache = (_registry_version, available_json, custom_json)
+    return available_json, custom_json
+
+
+@router.get("/available", response_model=MetricsListResponse)
+async def get_available_metrics():
+    """
+    利用可能な評価指標一覧を返す（組み込みと外部の両方）
+    
+    Returns:
+        MetricsListResponse: 評価指標情報のリスト
+    """
+    available_json, _ = get_metrics_list_json()
+    return Response(content=available_json, media_type="application/json")
 
 @router.get("/available/{metric_name}/code", response_model=Dict[str, str])
 async def get_metric_code(metric_name: str = Path(..., description="評価指標名")):
@@ -97,13 +165,12 @@ async def get_metric_code(metric_name: str = Path(..., description="評価指標
     
     try:
         # クラスのソースファイルを取得
-        source_file = inspect.getsourcefile(metric_cls)
+        source_file = _source_file_of(metric_cls)
         if not source_file:
             raise HTTPException(status_code=404, detail="ソースファイルが見つかりません")
         
         # ソースコードを取得
-        with open(source_file, "r", encoding="utf-8") as f:
-            source_code = f.read()
+        source_code = await asyncio.to_thread(FilePath(source_file).read_text, encoding="utf-8")
         
         return {
             "filename": os.path.basename(source_file),
@@ -115,6 +182,103 @@ async def get_metric_code(metric_name: str = Path(..., description="評価指標
         logger.error(f"ソースコード取得エラー: {str(e)}")
         raise HTTPException(status_code=500, detail=f"ソースコードの取得に失敗しました: {str(e)}")
 
+# アップロードできる評価指標ファイルの最大サイズ（バイト）
+_MAX_METRIC_FILE_SIZE = 256 * 1024
+
+# アップロードされた評価指標で禁止する呼び出し（モジュール名, 関数名）
+_FORBIDDEN_CALLS = frozenset({
+    ("os", "system"),
+    ("os", "popen"),
+    ("subprocess", "Popen"),
+    ("subprocess", "run"),
+    ("subprocess", "call"),
+    ("subprocess", "check_call"),
+    ("subprocess", "check_output"),
+})
+
+
+class _ForbiddenCallFinder(ast.NodeVisitor):
+    """禁止された呼び出し（os.system など）やそのインポートを構文木から探す"""
+
+    class _Found(Exception):
+        pass
+
+    def __init__(self) -> None:
+        # インポートで束縛された名前 → モジュール名（import os as o なら "o" → "os"）
+        self._module_aliases: Dict[str, str] = {}
+
+    def contains_forbidden_call(self, tree: ast.AST) -> bool:
+        """構文木に禁止された呼び出しが含まれるかを判定する（最初に見つかった時点で探索を打ち切る）
+
+        Args:
+            tree: 解析済みの構文木
+
+        Returns:
+            bool: 含まれる場合はTrue
+        """
+        # 関数内などで使用箇所より後にインポートされることもあるため、先にすべての別名を記録する
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                self.visit_Import(node)
+        try:
+            self.visit(tree)
+        except self._Found:
+            return True
+        return False
+
+    def _resolve_module(self, node: ast.AST) -> Optional[str]:
+        """モジュールを表す式からモジュール名を求める（求められない場合はNone）"""
+        if isinstance(node, ast.Name):
+            return self._module_aliases.get(node.id, node.id)
+        # __import__("os") や importlib.import_module("os") の戻り値
+        if (
+            isinstance(node, ast.Call)
+            and node.args
+            and isinstance(node.args[0], ast.Constant)
+            and isinstance(node.args[0].value, str)
+            and (
+                (isinstance(node.func, ast.Name) and node.func.id == "__import__")
+                or (isinstance(node.func, ast.Attribute) and node.func.attr == "import_module")
+            )
+        ):
+            return node.args[0].value
+        return None
+
+    def visit_Call(self, node: ast.Call) -> None:
+        func = node.func
+        if isinstance(func, ast.Attribute):
+            if (self._resolve_module(func.value), func.attr) in _FORBIDDEN_CALLS:
+                raise self._Found()
+        # getattr(os, "system") のように属性名を文字列で指定する場合
+        elif (
+            isinstance(func, ast.Name)
+            and func.id == "getattr"
+            and len(node.args) >= 2
+            and isinstance(node.args[1], ast.Constant)
+            and (self._resolve_module(node.args[0]), node.args[1].value) in _FORBIDDEN_CALLS
+        ):
+            raise self._Found()
+        self.generic_visit(node)
+
+    def visit_Import(self, node: ast.Import) -> None:
+        for alias in node.names:
+            if alias.asname:
+                self._module_aliases[alias.asname] = alias.name
+            else:
+                # import os.path は "os" を束縛する
+                top_level = alias.name.split(".", 1)[0]
+                self._module_aliases[top_level] = top_level
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        # from os import system のように関数を直接インポートする場合（import * も含む）
+        if any(
+            (node.module, alias.name) in _FORBIDDEN_CALLS
+            or (alias.name == "*" and any(node.module == module for module, _ in _FORBIDDEN_CALLS))
+            for alias in node.names
+        ):
+            raise self._Found()
+
+
 @router.post("/upload", response_model=Dict[str, str])
 async def upload_metric_file(file: UploadFile = File(...)):
     """
@@ -130,13 +294,21 @@ async def upload_metric_file(file: UploadFile = File(...)):
     if not file.filename.endswith('.py'):
         raise HTTPException(status_code=400, detail="Pythonファイル(.py)のみアップロード可能です")
     
+    # 読み込み・解析のコストを抑えるため、大きすぎるファイルは読み込む前に拒否する
+    if file.size is not None and file.size > _MAX_METRIC_FILE_SIZE:
+        raise HTTPException(status_code=413, detail="ファイルサイズが大きすぎます")
+    
     try:
         # ファイル内容を読み取り
         content = await file.read()
         file_content = content.decode('utf-8')
         
         # 安全性チェック（基本的なチェックのみ）
-        if "import os" in file_content and ("system(" in file_content or "popen(" in file_content):
+        try:
+            tree = ast.parse(file_content, filename=file.filename)
+        except SyntaxError as syntax_error:
+            raise HTTPException(status_code=400, detail=f"Pythonコードの構文エラー: {syntax_error}")
+        if _ForbiddenCallFinder().contains_forbidden_call(tree):
             raise HTTPException(status_code=400, detail="セキュリティ上の問題があるコードが含まれています")
         
         # BaseMetricの継承チェック
@@ -147,12 +319,8 @@ async def upload_metric_file(file: UploadFile = File(...)):
         safe_filename = os.path.basename(file.filename)
         file_path = CUSTOM_METRICS_DIR / safe_filename
         
-        # ファイルを保存
-        with open(file_path, "wb") as f:
-            # ファイルポインタを先頭に戻す
-            await file.seek(0)
-            # 内容を書き込み
-            f.write(await file.read())
+        # ファイルを保存（検証時に読み込んだ内容をそのまま書き込む）
+        await asyncio.to_thread(file_path.write_bytes, content)
         
         # モジュールのインポートを試行
         try:
@@ -166,13 +334,15 @@ async def upload_metric_file(file: UploadFile = File(...)):
                 
             module = importlib.util.module_from_spec(spec)
             sys.modules[module_name] = module
-            spec.loader.exec_module(module)
+            try:
+                spec.loader.exec_module(module)
+            finally:
+                # 途中で例外が発生しても、それまでに登録された評価指標がある場合に備えて一覧のキャッシュを無効にする
+                _bump_registry_version()
             
             # 登録された評価指標を確認
-            new_metrics = []
-            for name, cls in METRIC_REGISTRY.items():
-                if inspect.getmodule(cls) == module:
-                    new_metrics.append(name)
+            new_metrics = METRICS_BY_MODULE.get(module_name, [])
+            CUSTOM_METRIC_NAMES.update(new_metrics)
             
             if not new_metrics:
                 raise HTTPException(status_code=400, detail="有効な評価指標が見つかりませんでした")
@@ -192,6 +362,8 @@ async def upload_metric_file(file: UploadFile = File(...)):
             logger.error(f"モジュールのインポートエラー: {str(import_error)}")
             raise HTTPException(status_code=400, detail=f"評価指標モジュールが正しくインポートできません: {str(import_error)}")
             
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"評価指標アップロードエラー: {str(e)}")
         raise HTTPException(status_code=500, detail=f"評価指標のアップロードに失敗しました: {str(e)}")
@@ -216,12 +388,12 @@ async def delete_metric(metric_name: str = Path(..., description="削除する
     
     try:
         # ソースファイルのパスを取得
-        source_file = inspect.getsourcefile(metric_cls)
+        source_file = _source_file_of(metric_cls)
         if not source_file:
             raise HTTPException(status_code=404, detail="ソースファイルが見つかりません")
         
         # カスタム評価指標かどうかを確認
-        if str(CUSTOM_METRICS_DIR) not in source_file:
+        if metric_name not in CUSTOM_METRIC_NAMES:
             raise HTTPException(status_code=403, detail="組み込み評価指標は削除できません")
         
         # Pythonファイルを削除
@@ -247,7 +419,8 @@ async def delete_metric(metric_name: str = Path(..., description="削除する
             
             # レジストリから削除
             if metric_name in METRIC_REGISTRY:
-                del METRIC_REGISTRY[metric_name]
+                unregister_metric(metric_name)
+                _bump_registry_version()
                 logger.info(f"評価指標 {metric_name} をレジストリから削除しました")
             
             return {
@@ -258,7 +431,8 @@ async def delete_metric(metric_name: str = Path(..., description="削除する
         else:
             # ファイルが存在しない場合はレジストリからのみ削除
             if metric_name in METRIC_REGISTRY:
-                del METRIC_REGISTRY[metric_name]
+                unregister_metric(metric_name)
+                _bump_registry_version()
                 logger.info(f"評価指標 {metric_name} をレジストリから削除しました（ファイルは見つかりませんでした）")
             
             return {
@@ -266,6 +440,8 @@ async def delete_metric(metric_name: str = Path(..., description="削除する
                 "name": metric_name
             }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"評価指標削除エラー: {str(e)}")
         raise HTTPException(status_code=500, detail=f"評価指標の削除に失敗しました: {str(e)}")
@@ -279,49 +455,5 @@ async def get_all_metrics():
     Returns:
         MetricsListResponse: カスタムメトリクス一覧
     """
-    metrics_list = []
-    
-    for name, metric_cls in METRIC_REGISTRY.items():
-        # メトリクスソースファイルのパス
-        source_file = inspect.getsourcefile(metric_cls)
-        
-        # カスタムメトリクスのみをフィルタリング
-        if not source_file or str(CUSTOM_METRICS_DIR) not in source_file:
-            continue
-            
-        # インスタンスを作成
-        metric_instance = metric_cls()
-        
-        # docstringから説明を取得（可能であれば）
-        description = None
-        if metric_cls.__doc__:
-            description = metric_cls.__doc__.strip()
-        
-        # パラメータ定義を取得
-        param_defs = metric_cls.get_parameter_definitions()
-        parameters = {}
-        
-        # パラメータ定義をAPIモデルに変換
-        for param_name, param_def in param_defs.items():
-            parameters[param_name] = MetricParameterInfo(
-                type=param_def.get("type", "string"),
-                description=param_def.get("description"),
-                default=param_def.get("default"),
-                required=param_def.get("required", False),
-                enum=param_def.get("enum")
-            )
-            
-        metrics_list.append(
-            MetricInfo(
-                name=name,
-                description=description,
-                parameters=parameters if parameters else None,
-                is_higher_better=getattr(metric_instance, "is_higher_better", True),
-                is_custom=True  # カスタムディレクトリから読み込んだものなので常にTrue
-            )
-        )
-    
-    # 名前でソート
-    metrics_list.sort(key=lambda x: x.name)
-    
-    return MetricsListResponse(metrics=metrics_list)
\ No newline at end of file
+    _, custom_json = get_metrics_list_json()
+    return Response(content=custom_json, media_type="application/json")
@@ -3,23 +3,123 @@ Ollama管理APIエンドポイント
 
 Ollamaモデルのダウンロードを管理するエンドポイントを実装します。
 """
+import asyncio
 import logging
+import time
+import httpx
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 from fastapi import APIRouter, HTTPException, Depends, status, Request
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 
-from app.utils.ollama_manager import get_ollama_manager, DownloadStatus
-from app.utils.db.models import get_model_repository
-from app.utils.db.providers import get_provider_repository
+from app.api.endpoints.proxy import httpx_client
+from app.utils.ollama_manager import get_ollama_manager, OllamaManager, DownloadStatus, TAGS_CACHE
+from app.utils.db.models import get_model_repository, ModelRepository
+from app.utils.db.providers import get_provider_repository, ProviderRepository
 
 # ロガーの設定
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/ollama", tags=["ollama"])
 
+# エンドポイント未指定時のOllamaサーバー
+_DEFAULT_OLLAMA_ENDPOINT = "http://localhost:11434"
+
+
+@lru_cache(maxsize=128)
+def _normalize_ollama_endpoint(endpoint: Optional[str]) -> str:
+    """
+    OllamaエンドポイントをベースURL（末尾のスラッシュなし）に正規化します。
+    エンドポイントの種類は少ないため、結果をキャッシュして同じ文字列処理を繰り返さない。
+    
+    Args:
+        endpoint: Ollamaエンドポイント（未指定または "ollama" の場合はデフォルトを使用）
+        
+    Returns:
+        ベースURL
+    """
+    if not endpoint or endpoint == "ollama":
+        return _DEFAULT_OLLAMA_ENDPOINT
+    
+    # エンドポイントがURLパスを含む場合は削除（ベースURLのみ使用）
+    if '/api/' in endpoint:
+        endpoint = endpoint.split('/api/')[0]
+    
+    # プロトコルが含まれていなければ追加
+    if not endpoint.startswith(('http://', 'https://')):
+        endpoint = f"http://{endpoint}"
+    
+    return endpoint.rstrip('/')
+
+
+# /api/tags のキャッシュ有効期間（秒）とエンドポイントごとの取得ロック
+_TAGS_TTL = 5.0
+_tags_locks: Dict[str, asyncio.Lock] = {}
+# キャッシュとロックを保持するエンドポイント数の上限（endpoint はクエリで任意に指定できるため）
+_TAGS_MAX_ENDPOINTS = 128
+
+
+def _evict_tags() -> None:
+    """
+    期限切れの /api/tags キャッシュと使われていない取得ロックを破棄し、上限を超えた場合は古い順に破棄します。
+    """
+    now = time.monotonic()
+    for endpoint in [e for e, (fetched_at, _) in TAGS_CACHE.items() if now - fetched_at >= _TAGS_TTL]:
+        del TAGS_CACHE[endpoint]
+    # キャッシュは取得した順に並んでいるため、先頭から破棄する
+    while len(TAGS_CACHE) > _TAGS_MAX_ENDPOINTS:
+        del TAGS_CACHE[next(iter(TAGS_CACHE))]
+    for endpoint in [e for e, lock in _tags_locks.items() if not lock.locked() and e not in TAGS_CACHE]:
+        del _tags_locks[endpoint]
+
+
+async def _get_tags(client: httpx.AsyncClient, endpoint: str) -> Dict[str, Any]:
+    """
+    Ollamaのモデル一覧（/api/tags）を取得します。有効期間内はキャッシュを返します。
+    
+    Args:
+        client: 共有HTTPクライアント
+        endpoint: 正規化済みのOllamaエンドポイント
+        
+    Returns:
+        /api/tags のレスポンス
+    """
+    cached = TAGS_CACHE.get(endpoint)
+    if cached is not None and time.monotonic() - cached[0] < _TAGS_TTL:
+        return cached[1]
+    
+    # 同じエンドポイントへの同時リクエストでは一度だけ取得する
+    lock = _tags_locks.setdefault(endpoint, asyncio.Lock())
+    try:
+        async with lock:
+            cached = TAGS_CACHE.get(endpoint)
+            if cached is not None and time.monotonic() - cached[0] < _TAGS_TTL:
+                return cached[1]
+        
+            response = await client.get(f"{endpoint}/api/tags", timeout=10.0)
+            if response.status_code != 200:
+                error_text = response.text
+                logger.error("Ollamaモデル情報取得エラー: %s", error_text)
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=f"Ollamaモデル情報取得エラー: HTTP {response.status_code} - {error_text}"
+                )
+        
+            data = response.json()
+            # 取得した順に並べるため、既存のエントリは削除してから追加する
+            TAGS_CACHE.pop(endpoint, None)
+            TAGS_CACHE[endpoint] = (time.monotonic(), data)
+        return data
+    finally:
+        # 取得に失敗したエンドポイントのロックも残さない
+        _evict_tags()
+
 
 class OllamaModelDownloadRequest(BaseModel):
     """Ollamaモデルダウンロードリクエスト"""
+    model_config = ConfigDict(protected_namespaces=())
+
     model_id: str
     model_name: str
     endpoint: Optional[str] = None
@@ -27,6 +127,8 @@ class OllamaModelDownloadRequest(BaseModel):
 
 class OllamaModelDownloadResponse(BaseModel):
     """Ollamaモデルダウンロードレスポンス"""
+    model_config = ConfigDict(protected_namespaces=())
+
     download_id: str
     model_id: str
     model_name: str
@@ -37,6 +139,8 @@ class OllamaModelDownloadResponse(BaseModel):
 
 class OllamaModelDownloadDetailResponse(BaseModel):
     """Ollamaモデルダウンロード詳細レスポンス"""
+    model_config = ConfigDict(protected_namespaces=())
+
     id: str
     model_id: str
     model_name: str
@@ -55,8 +159,34 @@ class OllamaModelDownloadDetailResponse(BaseModel):
     model_info: Optional[dict] = None  # モデルの詳細情報
 
 
+# ダウンロード履歴リストの検証・シリアライズ用アダプター（インポート時に一度だけ構築）
+_DOWNLOAD_LIST = TypeAdapter(List[OllamaModelDownloadDetailResponse])
+
+
+
+# エンドポイントに注入する依存関係（同期関数はスレッドプールで実行されるため、async defで定義する）
+async def _ollama_manager_dependency() -> OllamaManager:
+    """Ollamaマネージャを取得する"""
+    return get_ollama_manager()
+
+
+async def _model_repository_dependency() -> ModelRepository:
+    """モデルリポジトリを取得する"""
+    return get_model_repository()
+
+
+async def _provider_repository_dependency() -> ProviderRepository:
+    """プロバイダーリポジトリを取得する"""
+    return get_provider_repository()
+
+
 @router.post("/download", response_model=OllamaModelDownloadResponse)
-async def download_ollama_model(request: OllamaModelDownloadRequest):
+async def download_ollama_model(
+    request: OllamaModelDownloadRequest,
+    model_repo: ModelRepository = Depends(_model_repository_dependency),
+    provider_repo: ProviderRepository = Depends(_provider_repository_dependency),
+    ollama_manager: OllamaManager = Depends(_ollama_manager_dependency)
+):
     """
     Ollamaモデルのダウンロードを開始します。
     
@@ -66,12 +196,9 @@ async def download_ollama_model(request: OllamaModelDownloadRequest):
     Returns:
         ダウンロード情報
     """
-    model_repo = get_model_repository()
-    provider_repo = get_provider_repository()
-    
     try:
         # モデルが存在するか確認
-        model = model_repo.get_model_by_id(request.model_id)
+        model = await asyncio.to_thread(model_repo.get_model_by_id, request.model_id)
         if not model:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -79,7 +206,7 @@ async def download_ollama_model(request: OllamaModelDownloadRequest):
             )
         
         # プロバイダーがollamaかどうか確認
-        provider = provider_repo.get_provider_by_id(model["provider_id"])
+        provider = await asyncio.to_thread(provider_repo.get_provider_by_id, model["provider_id"])
         if not provider or provider["type"].lower() != "ollama":
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -99,21 +226,10 @@ async def download_ollama_model(request: OllamaModelDownloadRequest):
                 detail=f"Ollamaエンドポイントが指定されていません"
             )
         
-        # デフォルトのOllamaエンドポイント
-        if endpoint == "ollama":
-            endpoint = "http://localhost:11434"
-            
-        # エンドポイントがURLパスを含む場合は削除（ベースURLのみ使用）
-        if '/api/' in endpoint:
-            # /api/ より前の部分だけを取得
-            endpoint = endpoint.split('/api/')[0]
+        # ベースURLに正規化（"ollama" の場合はデフォルトのエンドポイント）
+        endpoint = _normalize_ollama_endpoint(endpoint)
         
-        # プロトコルが含まれていることを確認
-        if not endpoint.startswith(('http://', 'https://')):
-            endpoint = f"http://{endpoint}"
-        
-        # Ollamaマネージャの取得とダウンロード開始
-        ollama_manager = get_ollama_manager()
+        # ダウンロード開始
         download_info = await ollama_manager.download_model(
             model_name=request.model_name, 
             model_id=request.model_id,
@@ -133,7 +249,7 @@ async def download_ollama_model(request: OllamaModelDownloadRequest):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Ollamaモデルダウンロード開始エラー: {str(e)}", exc_info=True)
+        logger.error("Ollamaモデルダウンロード開始エラー: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Ollamaモデルダウンロード開始エラー: {str(e)}"
@@ -141,7 +257,10 @@ async def download_ollama_model(request: OllamaModelDownloadRequest):
 
 
 @router.get("/download/{download_id}", response_model=OllamaModelDownloadDetailResponse)
-async def get_download_status(download_id: str):
+async def get_download_status(
+    download_id: str,
+    ollama_manager: OllamaManager = Depends(_ollama_manager_dependency)
+):
     """
     ダウンロードステータスを取得します。
     
@@ -151,33 +270,34 @@ async def get_download_status(download_id: str):
     Returns:
         ダウンロード詳細情報
     """
-    ollama_manager = get_ollama_manager()
-    
     try:
-        logger.info(f"[OLLAMA_API] ダウンロードステータス取得リクエスト: ID={download_id}")
-        download_info = ollama_manager.get_download(download_id)
+        logger.debug("[OLLAMA_API] ダウンロードステータス取得リクエスト: ID=%s", download_id)
+        download_info = await asyncio.to_thread(ollama_manager.get_download, download_id)
         
         if not download_info:
-            logger.warning(f"[OLLAMA_API] ダウンロードIDが見つかりません: {download_id}")
+            logger.warning("[OLLAMA_API] ダウンロードIDが見つかりません: %s", download_id)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"ダウンロードID '{download_id}' が見つかりません"
             )
         
-        # 返却前にステータス情報をログ出力
-        status_value = download_info.get("status", "unknown")
-        error_value = download_info.get("error")
-        progress_value = download_info.get("progress", 0)
-        model_name = download_info.get("model_name", "unknown")
-        
-        logger.info(f"[OLLAMA_API] ダウンロードステータス応答: ID={download_id}, モデル={model_name}, ステータス={status_value}, 進捗={progress_value}%, エラー={error_value}")
+        # 返却前にステータス情報をログ出力（ポーリングされるため、INFOが無効なら値の取り出しも省く）
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "[OLLAMA_API] ダウンロードステータス応答: ID=%s, モデル=%s, ステータス=%s, 進捗=%s%%, エラー=%s",
+                download_id,
+                download_info.get("model_name", "unknown"),
+                download_info.get("status", "unknown"),
+                download_info.get("progress", 0),
+                download_info.get("error")
+            )
         
         return download_info
     
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"ダウンロードステータス取得エラー: {str(e)}", exc_info=True)
+        logger.error("ダウンロードステータス取得エラー: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"ダウンロードステータス取得エラー: {str(e)}"
@@ -185,7 +305,11 @@ async def get_download_status(download_id: str):
 
 
 @router.get("/downloads/model/{model_id}", response_model=List[OllamaModelDownloadDetailResponse])
-async def get_downloads_by_model(model_id: str):
+async def get_downloads_by_model(
+    model_id: str,
+    model_repo: ModelRepository = Depends(_model_repository_dependency),
+    ollama_manager: OllamaManager = Depends(_ollama_manager_dependency)
+):
     """
     特定のモデルのダウンロード履歴を取得します。
     
@@ -195,12 +319,9 @@ async def get_downloads_by_model(model_id: str):
     Returns:
         ダウンロード情報のリスト
     """
-    model_repo = get_model_repository()
-    ollama_manager = get_ollama_manager()
-    
     try:
         # モデルが存在するか確認
-        model = model_repo.get_model_by_id(model_id)
+        model = await asyncio.to_thread(model_repo.get_model_by_id, model_id)
         if not model:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -208,13 +329,14 @@ async def get_downloads_by_model(model_id: str):
             )
         
         # ダウンロード履歴を取得
-        downloads = ollama_manager.get_downloads_by_model_id(model_id)
-        return downloads
+        downloads = await asyncio.to_thread(ollama_manager.get_downloads_by_model_id, model_id)
+        # リスト全体を一度の検証・シリアライズで処理する
+        return ORJSONResponse(_DOWNLOAD_LIST.dump_python(_DOWNLOAD_LIST.validate_python(downloads), mode="json"))
     
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"モデルダウンロード履歴取得エラー: {str(e)}", exc_info=True)
+        logger.error("モデルダウンロード履歴取得エラー: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"モデルダウンロード履歴取得エラー: {str(e)}"
@@ -222,21 +344,20 @@ async def get_downloads_by_model(model_id: str):
 
 
 @router.get("/downloads", response_model=List[OllamaModelDownloadDetailResponse])
-async def get_all_downloads():
+async def get_all_downloads(ollama_manager: OllamaManager = Depends(_ollama_manager_dependency)):
     """
     すべてのダウンロード履歴を取得します。
     
     Returns:
         ダウンロード情報のリスト
     """
-    ollama_manager = get_ollama_manager()
-    
     try:
-        downloads = ollama_manager.get_all_downloads()
-        return downloads
+        downloads = await asyncio.to_thread(ollama_manager.get_all_downloads)
+        # リスト全体を一度の検証・シリアライズで処理する
+        return ORJSONResponse(_DOWNLOAD_LIST.dump_python(_DOWNLOAD_LIST.validate_python(downloads), mode="json"))
     
     except Exception as e:
-        logger.error(f"ダウンロード履歴取得エラー: {str(e)}", exc_info=True)
+        logger.error("ダウンロード履歴取得エラー: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"ダウンロード履歴取得エラー: {str(e)}"
@@ -244,7 +365,11 @@ async def get_all_downloads():
 
 
 @router.get("/check_model", response_model=Dict[str, Any])
-async def check_ollama_model(model_name: str, endpoint: Optional[str] = None):
+async def check_ollama_model(
+    model_name: str,
+    endpoint: Optional[str] = None,
+    client: httpx.AsyncClient = Depends(httpx_client)
+):
     """
     Ollamaモデルの存在チェックを行います。
     
@@ -255,59 +380,40 @@ async def check_ollama_model(model_name: str, endpoint: Optional[str] = None):
     Returns:
         モデル情報
     """
-    import aiohttp
-    import json
-    
-    # エンドポイントのデフォルト値
-    if not endpoint:
-        endpoint = "http://localhost:11434"
-    
-    # エンドポイントにプロトコルが含まれていなければ追加
-    if not endpoint.startswith(('http://', 'https://')):
-        endpoint = f"http://{endpoint}"
-    
-    # エンドポイントが正しい形式かチェック
-    if not endpoint.endswith('/'):
-        endpoint = f"{endpoint}/"
-    
-    api_url = f"{endpoint}api/tags"
-    
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(api_url) as response:
-                if response.status != 200:
-                    error_text = await response.text()
-                    logger.error(f"Ollamaモデル情報取得エラー: {error_text}")
-                    raise HTTPException(
-                        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                        detail=f"Ollamaモデル情報取得エラー: HTTP {response.status} - {error_text}"
-                    )
-                
-                data = await response.json()
-                
-                # モデルが存在するか確認
-                for model in data.get("models", []):
-                    model_name_in_list = model.get("name", "")
-                    # 完全一致 または 前方一致（モデル名:タグ）のパターンをチェック
-                    if (model_name_in_list == model_name or
-                        model_name_in_list.startswith(f"{model_name}:") or
-                        model_name.startswith(f"{model_name_in_list}:")):
-                        logger.info(f"モデル一致: 検索={model_name}, 見つかった={model_name_in_list}")
-                        return {
-                            "exists": True,
-                            "model_info": model
-                        }
-                
-                # モデルが見つからない場合
-                return {
-                    "exists": False,
-                    "available_models": [m.get("name") for m in data.get("models", [])]
-                }
+        data = await _get_tags(client, _normalize_ollama_endpoint(endpoint))
+        
+        # モデル名→モデル情報の辞書を一度だけ構築する
+        models_by_name = {m.get("name"): m for m in data.get("models") or []}
+        
+        # 完全一致 → タグなしで検索（モデル名:タグ） → タグ付きで検索（一覧側はタグなし）の順に確認
+        tagged_prefix = f"{model_name}:"
+        model = models_by_name.get(model_name)
+        if model is None:
+            model = next(
+                (m for name, m in models_by_name.items() if name and name.startswith(tagged_prefix)),
+                None
+            )
+        if model is None and ":" in model_name:
+            model = models_by_name.get(model_name.partition(":")[0])
+        
+        if model is not None:
+            logger.info("モデル一致: 検索=%s, 見つかった=%s", model_name, model.get("name", ""))
+            return {
+                "exists": True,
+                "model_info": model
+            }
+        
+        # モデルが見つからない場合
+        return {
+            "exists": False,
+            "available_models": list(models_by_name)
+        }
     
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Ollamaモデルチェックエラー: {str(e)}", exc_info=True)
+        logger.error("Ollamaモデルチェックエラー: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Ollamaモデルチェックエラー: {str(e)}"
@@ -3,18 +3,32 @@
 
 プロバイダーのCRUD操作を提供するエンドポイントを実装します。
 """
+import asyncio
 from typing import List, Dict, Any, Optional
 from fastapi import APIRouter, HTTPException, Depends, status
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, TypeAdapter
 
 from app.api.api_schemas import Provider, ProviderCreate, ProviderUpdate
-from app.utils.db.providers import get_provider_repository
+from app.utils.db.providers import get_provider_repository, ProviderRepository
 
 router = APIRouter(prefix="/providers", tags=["providers"])
 
+# プロバイダーリストの検証・シリアライズ用アダプター（インポート時に一度だけ構築）
+_PROVIDER_LIST = TypeAdapter(List[Provider])
+
+
+# エンドポイントに注入する依存関係（同期関数はスレッドプールで実行されるため、async defで定義する）
+async def _provider_repository_dependency() -> ProviderRepository:
+    """プロバイダーリポジトリを取得する"""
+    return get_provider_repository()
+
 
 @router.post("", response_model=Provider, status_code=status.HTTP_201_CREATED)
-async def create_provider(provider_data: ProviderCreate):
+async def create_provider(
+    provider_data: ProviderCreate,
+    provider_repo: ProviderRepository = Depends(_provider_repository_dependency)
+):
     """
     新しいプロバイダーを作成します。
     
@@ -24,10 +38,8 @@ async def create_provider(provider_data: ProviderCreate):
     Returns:
         作成されたプロバイダー情報
     """
-    provider_repo = get_provider_repository()
-    
     try:
-        provider = provider_repo.create_provider(provider_data.model_dump())
+        provider = await asyncio.to_thread(provider_repo.create_provider, provider_data.model_dump())
         return provider
     except Exception as e:
         raise HTTPException(
@@ -37,18 +49,21 @@ async def create_provider(provider_data: ProviderCreate):
 
 
 @router.get("", response_model=List[Provider])
-async def get_all_providers():
+async def get_all_providers(
+    provider_repo: ProviderRepository = Depends(_provider_repository_dependency)
+):
     """
     すべてのプロバイダーを取得します。
     
     Returns:
         プロバイダーのリスト
     """
-    provider_repo = get_provider_repository()
-    
     try:
-        providers = provider_repo.get_all_providers()
-        return providers
+        providers = await asyncio.to_thread(provider_repo.get_all_providers)
+        # リスト全体を一度の検証・シリアライズで処理する（response_modelと同じくキャメルケースで出力）
+        return ORJSONResponse(
+            _PROVIDER_LIST.dump_python(_PROVIDER_LIST.validate_python(providers), mode="json", by_alias=True)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -57,7 +72,10 @@ async def get_all_providers():
 
 
 @router.get("/{provider_id}", response_model=Provider)
-async def get_provider(provider_id: str):
+async def get_provider(
+    provider_id: str,
+    provider_repo: ProviderRepository = Depends(_provider_repository_dependency)
+):
     """
     特定のプロバイダーを取得します。
     
@@ -67,10 +85,8 @@ async def get_provider(provider_id: str):
     Returns:
         プロバイダー情報
     """
-    provider_repo = get_provider_repository()
-    
     try:
-        provider = provider_repo.get_provider_by_id(provider_id)
+        provider = await asyncio.to_thread(provider_repo.get_provider_by_id, provider_id)
         if not provider:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -87,7 +103,11 @@ async def get_provider(provider_id: str):
 
 
 @router.put("/{provider_id}", response_model=Provider)
-async def update_provider(provider_id: str, provider_data: ProviderUpdate):
+async def update_provider(
+    provider_id: str,
+    provider_data: ProviderUpdate,
+    provider_repo: ProviderRepository = Depends(_provider_repository_dependency)
+):
     """
     特定のプロバイダーを更新します。
     
@@ -98,13 +118,11 @@ async def update_provider(provider_id: str, provider_data: ProviderUpdate):
     Returns:
         更新されたプロバイダー情報
     """
-    provider_repo = get_provider_repository()
-    
     try:
         # 更新データから None 以外のフィールドのみを抽出
         update_data = {k: v for k, v in provider_data.model_dump().items() if v is not None}
         
-        provider = provider_repo.update_provider(provider_id, update_data)
+        provider = await asyncio.to_thread(provider_repo.update_provider, provider_id, update_data)
         if not provider:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -121,17 +139,18 @@ async def update_provider(provider_id: str, provider_data: ProviderUpdate):
 
 
 @router.delete("/{provider_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_provider(provider_id: str):
+async def delete_provider(
+    provider_id: str,
+    provider_repo: ProviderRepository = Depends(_provider_repository_dependency)
+):
     """
     特定のプロバイダーを削除します。
     
     Args:
         provider_id: 削除するプロバイダーのID
     """
-    provider_repo = get_provider_repository()
-    
     try:
-        success = provider_repo.delete_provider(provider_id)
+        success = await asyncio.to_thread(provider_repo.delete_provider, provider_id)
         if not success:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -2,135 +2,539 @@
 プロキシエンドポイント
 内部サービス（MLflow）へのアクセスをAPIを経由して行うためのエンドポイント
 """
-from fastapi import APIRouter, Request, Response, HTTPException
+from fastapi import APIRouter, Depends, Request, Response, HTTPException
 import httpx
+from starlette.background import BackgroundTask
 from starlette.responses import StreamingResponse
+import asyncio
+import bisect
+import importlib.util
 import os
-from typing import Optional, List, Dict, Any
+import time
+from functools import partial
+from typing import Optional, List, Dict, Any, AsyncIterable, Sequence, Set, Tuple, Callable, Awaitable, Union
 import logging
 
 router = APIRouter()
 logger = logging.getLogger("llmeval")
 
+# MLflowのホスト名とポート（デフォルトはmlflow:5000）。MLflowが返すURLをプロキシのURLに書き換える際にも使う
+MLFLOW_HOST = os.environ.get("MLFLOW_HOST", "mlflow")
+MLFLOW_PORT = os.environ.get("MLFLOW_PORT", "5000")
+
 # MLflow接続URLの設定（複数の候補から有効なものを選択）
 MLFLOW_BASE_URLS = [
     os.environ.get("MLFLOW_HOST_URI"),                # 内部接続用URI（バックエンドからMLflowコンテナへ）
+    f"http://{MLFLOW_HOST}:{MLFLOW_PORT}",            # 環境変数で指定されたホスト
     "http://llm-mlflow-tracking:5000",                # Dockerネットワーク内部でのコンテナ名
     os.environ.get("MLFLOW_EXTERNAL_URI"),            # 外部接続用URI (全システム共通の外部URL)
+    f"http://localhost:{MLFLOW_PORT}",                # ローカルホスト（同一コンテナ内からの接続用）
+    f"http://host.docker.internal:{MLFLOW_PORT}",     # Docker内部ネットワークの一般的なアドレス
+    f"http://172.17.0.1:{MLFLOW_PORT}",               # Docker Bridgeネットワークのデフォルトゲートウェイ
     "http://localhost:5001"                           # ローカル開発用のURI（フォールバック）
 ]
 
 # 後方互換性のためのフォールバック処理(必要に応じて削除可)
 if os.environ.get("LLMEVAL_MLFLOW_EXTERNAL_URI") and not os.environ.get("MLFLOW_EXTERNAL_URI"):
     MLFLOW_BASE_URLS.append(os.environ.get("LLMEVAL_MLFLOW_EXTERNAL_URI"))
-    logger.info(f"LLMEVAL_MLFLOW_EXTERNAL_URIが設定されていますが、MLFLOW_EXTERNAL_URIへの移行を推奨します")
+    logger.info("LLMEVAL_MLFLOW_EXTERNAL_URIが設定されていますが、MLFLOW_EXTERNAL_URIへの移行を推奨します")
+
+
+
+def _normalize_base_url(url: str) -> str:
+    """
+    接続先URLをベースURL（プロトコルあり、末尾のスラッシュなし）に正規化する
+
+    Args:
+        url: 接続先URL
+
+    Returns:
+        str: 正規化したベースURL
+    """
+    if '/api/' in url:
+        url = url.split('/api/')[0]
+    if not url.startswith(('http://', 'https://')):
+        url = f"http://{url}"
+    return url.rstrip('/')
+
 
-# 空の値をフィルタリング
-MLFLOW_BASE_URLS = [url for url in MLFLOW_BASE_URLS if url]
+# 空の値を除いて正規化する（リクエストごとに繰り返さないよう、読み込み時に一度だけ行う）
+MLFLOW_BASE_URLS = tuple(dict.fromkeys(_normalize_base_url(url) for url in MLFLOW_BASE_URLS if url))
 
 # ログ出力
-logger.info(f"MLflow接続候補: {MLFLOW_BASE_URLS}")
+logger.info("MLflow接続候補: %s", MLFLOW_BASE_URLS)
 
 # 最初の有効な接続先を使用
 MLFLOW_BASE_URL = MLFLOW_BASE_URLS[0] if MLFLOW_BASE_URLS else "http://llm-mlflow-tracking:5000"
-logger.info(f"選択されたMLflow接続先: {MLFLOW_BASE_URL}")
+logger.info("選択されたMLflow接続先: %s", MLFLOW_BASE_URL)
+
+# 接続先の候補ごとに、直近で応答したMLflow接続先と記録時刻（停止中の候補への接続待ちを毎回繰り返さないよう、先に試す）
+# 候補の組み合わせが異なるプロキシ同士で記録を上書きし合わないよう、候補のタプルをキーにする
+_LAST_GOOD_TTL = 30.0
+_last_good_mlflow: Dict[Tuple[str, ...], Tuple[str, float]] = {}
+
+
+def order_mlflow_urls(urls: Tuple[str, ...]) -> List[str]:
+    """
+    直近で応答した接続先を先頭にしたMLflow接続先の候補を返す
+
+    Args:
+        urls: 優先順位順の接続先候補
+
+    Returns:
+        List[str]: 試行する順に並べた接続先
+    """
+    last_good = _last_good_mlflow.get(urls)
+    if last_good is not None:
+        url, recorded_at = last_good
+        if time.monotonic() - recorded_at < _LAST_GOOD_TTL:
+            return [url] + [u for u in urls if u != url]
+    return list(urls)
+
+
+def remember_mlflow_url(urls: Tuple[str, ...], url: str) -> None:
+    """
+    応答したMLflow接続先を記録する（記録時刻は更新しないため、期限切れ後は優先順位順に再確認される）
+
+    Args:
+        urls: 優先順位順の接続先候補（order_mlflow_urls に渡したもの）
+        url: 応答した接続先
+    """
+    now = time.monotonic()
+    last_good = _last_good_mlflow.get(urls)
+    if last_good is None or last_good[0] != url or now - last_good[1] >= _LAST_GOOD_TTL:
+        _last_good_mlflow[urls] = (url, now)
+
+
+def forget_mlflow_url(urls: Tuple[str, ...], url: str) -> None:
+    """
+    記録済みの接続先への接続に失敗した場合に記録を破棄する
+
+    Args:
+        urls: 優先順位順の接続先候補（order_mlflow_urls に渡したもの）
+        url: 接続に失敗した接続先
+    """
+    last_good = _last_good_mlflow.get(urls)
+    if last_good is not None and last_good[0] == url:
+        del _last_good_mlflow[urls]
+
+
+# 競争させる場合に、先に送った接続先が接続できないまま次の接続先への接続も始めるまでの待ち時間（秒）
+_FALLBACK_STAGGER = 0.25
+
+# 同じリクエストを複数回送っても結果が変わらないメソッド（5xxの場合に次の接続先へ再送してよい）
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+
+# 送信処理の型（trace キーワード引数を受け取り、httpx の trace 拡張として渡す）
+SendAttempt = Callable[..., Awaitable[httpx.Response]]
+
+
+def _close_unused_response(task: asyncio.Task) -> None:
+    """
+    キャンセルが間に合わずに完了した送信のレスポンスを閉じる（接続をプールに返す）
+
+    Args:
+        task: 送信タスク
+    """
+    if not task.cancelled() and task.exception() is None:
+        asyncio.ensure_future(task.result().aclose())
+
+
+async def send_with_fallback(
+    attempts: Sequence[SendAttempt],
+    race: bool = False,
+    idempotent: bool = False,
+    on_error: Optional[Callable[[int, Exception], None]] = None
+) -> Tuple[int, httpx.Response]:
+    """
+    接続先の候補へ順に送信し、最初に返ってきた5xx以外のレスポンスを返す
+
+    次の接続先を試すのは、送信に失敗した場合（接続エラー・接続タイムアウトなど）と、
+    race=True または idempotent=True の場合に5xxが返った場合だけ。
+    冪等でないリクエストは接続先で一部が反映済みのことがあるため、5xxでも再送せずにそのまま返す。
+    race=True の場合は、先の接続先が _FALLBACK_STAGGER 秒以内に接続できなければ次の接続先への接続も始め、
+    最初に接続できた接続先にだけリクエストを送る（接続中だった他の送信は取りやめる）。
+    接続後の応答が遅いだけの場合は、同じリクエストを他の接続先には送らない。
+    再送した場合の5xxのレスポンスは、すべての接続先が失敗または5xxだった場合にだけ返す。
+
+    Args:
+        attempts: 優先順位順の送信処理（trace キーワード引数を付けて呼び出す）
+        race: 接続を競争させるか（冪等なメソッドの場合のみ指定する）
+        idempotent: リクエストが冪等か（5xxの場合に次の接続先へ再送する）
+        on_error: 送信に失敗した接続先のインデックスと例外を受け取るコールバック
+
+    Returns:
+        Tuple[int, httpx.Response]: 使用した接続先のインデックスとレスポンス
+
+    Raises:
+        Exception: すべての接続先への送信に失敗した場合、最後の例外
+    """
+    tasks: Dict[asyncio.Task, int] = {}
+    connected: Set[int] = set()
+    remaining = list(range(len(attempts)))
+    start_next = True
+    retry_server_error = race or idempotent
+    fallback: Optional[Tuple[int, httpx.Response]] = None
+    last_error: Optional[Exception] = None
+
+    def make_trace(index: int) -> Callable[[str, Dict[str, Any]], Awaitable[None]]:
+        async def trace(event_name: str, info: Dict[str, Any]) -> None:
+            # リクエストヘッダーを送り始める時点で接続が確立している（プールの接続を再利用した場合も含む）
+            if index in connected or not event_name.endswith("send_request_headers.started"):
+                return
+            connected.add(index)
+            # 同じリクエストが複数の接続先に届かないよう、まだ接続できていない送信は取りやめる
+            for task, other in tasks.items():
+                if other not in connected:
+                    task.cancel()
+        return trace
+
+    try:
+        while True:
+            if start_next and remaining:
+                index = remaining.pop(0)
+                tasks[asyncio.create_task(attempts[index](trace=make_trace(index)))] = index
+            if not tasks:
+                break
+
+            # 接続できた送信がなければ、一定時間後に次の接続先への接続も始める
+            racing = race and remaining and not connected.intersection(tasks.values())
+            done, _ = await asyncio.wait(
+                tasks, timeout=_FALLBACK_STAGGER if racing else None, return_when=asyncio.FIRST_COMPLETED
+            )
+            start_next = not done and not connected.intersection(tasks.values())
+
+            winner: Optional[Tuple[int, httpx.Response]] = None
+            for task in sorted(done, key=tasks.get):
+                index = tasks.pop(task)
+                if task.cancelled():
+                    # 他の接続先が先に接続できたため取りやめた。その接続先が失敗した場合に備えて候補に戻す
+                    bisect.insort(remaining, index)
+                    continue
+                try:
+                    response = task.result()
+                except Exception as e:
+                    last_error = e
+                    if on_error is not None:
+                        on_error(index, e)
+                    start_next = True
+                    continue
+                if response.status_code >= 500 and retry_server_error:
+                    # 5xxは次の接続先を試し、他の接続先もすべて失敗した場合にだけ返す
+                    if fallback is None:
+                        fallback = (index, response)
+                    else:
+                        await response.aclose()
+                    start_next = True
+                    continue
+                if winner is None:
+                    winner = (index, response)
+                else:
+                    await response.aclose()
+
+            if winner is not None:
+                if fallback is not None:
+                    await fallback[1].aclose()
+                return winner
+    finally:
+        for task in tasks:
+            task.cancel()
+            task.add_done_callback(_close_unused_response)
+
+    if fallback is not None:
+        return fallback
+    raise last_error or RuntimeError("MLflowの接続先がありません")
+
+
+async def send_to_mlflow(
+    client: httpx.AsyncClient,
+    method: str,
+    url: str,
+    headers: Any,
+    body: Union[bytes, AsyncIterable[bytes], None],
+    timeout: float,
+    params: Any = None,
+    trace: Optional[Callable[[str, Dict[str, Any]], Awaitable[None]]] = None,
+    follow_redirects: bool = False
+) -> httpx.Response:
+    """
+    MLflowにリクエストを送信し、本文を読み込む前のレスポンスを返す
+
+    呼び出し側は本文を読み込むか、response.aclose() で接続を解放すること
+
+    Args:
+        client: 共有HTTPクライアント
+        method: HTTPメソッド
+        url: 送信先URL
+        headers: リクエストヘッダー
+        body: リクエストボディ（GET/HEADでは送らない）
+        timeout: タイムアウト（秒）
+        params: クエリパラメータ
+        trace: 接続の確立を send_with_fallback に知らせるためのhttpxのtrace拡張
+        follow_redirects: リダイレクトに従うか
+
+    Returns:
+        httpx.Response: 本文を読み込む前のレスポンス
+    """
+    content = None if method in ("GET", "HEAD") else body
+    extensions = {"trace": trace} if trace is not None else None
+    upstream_request = client.build_request(
+        method, url, headers=headers, content=content, params=params, timeout=timeout, extensions=extensions
+    )
+    return await client.send(upstream_request, stream=True, follow_redirects=follow_redirects)
+
+
+async def forward_to_mlflow(
+    client: httpx.AsyncClient,
+    method: str,
+    path: str,
+    headers: Any,
+    body: Union[bytes, AsyncIterable[bytes], None],
+    timeout: float,
+    params: Any = None,
+    follow_redirects: bool = False,
+    single_url: bool = False
+) -> Tuple[str, httpx.Response]:
+    """
+    MLflowの接続先の候補へリクエストを送信し、使用した接続先と本文を読み込む前のレスポンスを返す
+
+    直近で応答した接続先を先に試し、GET/HEADは接続できない接続先を待たずに次の接続先への接続と競争させる。
+    呼び出し側は本文を読み込むか、response.aclose() で接続を解放すること
+
+    Args:
+        client: 共有HTTPクライアント
+        method: HTTPメソッド
+        path: MLflowのパス（先頭のスラッシュなし）
+        headers: リクエストヘッダー
+        body: リクエストボディ
+        timeout: タイムアウト（秒）
+        params: クエリパラメータ
+        follow_redirects: リダイレクトに従うか
+        single_url: 先頭の接続先だけを試すか（再送できないストリーミングのボディを送る場合）
+
+    Returns:
+        Tuple[str, httpx.Response]: 使用した接続先とレスポンス
+
+    Raises:
+        Exception: すべての接続先への送信に失敗した場合、最後の例外
+    """
+    base_urls = order_mlflow_urls(MLFLOW_BASE_URLS)
+    if single_url:
+        base_urls = base_urls[:1]
+
+    def on_error(index: int, e: Exception) -> None:
+        logger.warning("MLflow接続エラー: %s/%s: %s", base_urls[index], path, e)
+        forget_mlflow_url(MLFLOW_BASE_URLS, base_urls[index])
+
+    index, response = await send_with_fallback(
+        [
+            partial(
+                send_to_mlflow, client, method, f"{base_url}/{path}", headers, body, timeout,
+                params=params, follow_redirects=follow_redirects
+            )
+            for base_url in base_urls
+        ],
+        race=method in ("GET", "HEAD"),
+        idempotent=method in IDEMPOTENT_METHODS,
+        on_error=on_error
+    )
+    if response.status_code < 500:
+        remember_mlflow_url(MLFLOW_BASE_URLS, base_urls[index])
+    if index > 0:
+        logger.info("MLflow接続: フォールバックURL(%s)を使用しました: %s", index, base_urls[index])
+    return base_urls[index], response
+
+
+# これより大きいリクエストボディはメモリに読み込まずに転送し、フォールバック先への再送もしない（バイト）
+_MAX_RETRY_BODY_SIZE = 10 * 1024 * 1024
+
+# アップロードでボディを送るメソッド
+_UPLOAD_METHODS = ("POST", "PUT", "PATCH")
+
+
+def should_stream_request_body(request: Request) -> bool:
+    """
+    リクエストボディをメモリに読み込まずにストリーミングで転送すべきかを返す
+
+    アップロード（POST/PUT/PATCH）のうち、Content-Lengthが _MAX_RETRY_BODY_SIZE を超えるもの、
+    または長さが分からない（chunked）ものが対象。ストリーミングしたボディは再送できない
+
+    Args:
+        request: プロキシするリクエスト
+
+    Returns:
+        bool: ストリーミングで転送する場合はTrue
+    """
+    if request.method not in _UPLOAD_METHODS:
+        return False
+    content_length = request.headers.get("content-length")
+    if content_length is None:
+        return "chunked" in request.headers.get("transfer-encoding", "").lower()
+    try:
+        return int(content_length) > _MAX_RETRY_BODY_SIZE
+    except ValueError:
+        return False
+
+
+# プロキシで共有するHTTPクライアント（接続プールを再利用し、リクエストごとの接続確立を避ける）
+_HTTPX: Optional[httpx.AsyncClient] = None
+
+# MLflowへの接続にHTTP/2を使うか（h2パッケージと、HTTP/2に対応したMLflow側の構成が必要なため既定は無効）
+_HTTP2_ENABLED = os.environ.get("MLFLOW_PROXY_HTTP2", "").lower() in ("1", "true", "yes")
+
+# 転送しないホップバイホップのリクエストヘッダー（接続の維持は共有クライアントの接続プールが管理する）
+_EXCLUDED_REQUEST_HEADERS = (b"host", b"connection", b"keep-alive")
+
+
+def get_httpx() -> httpx.AsyncClient:
+    """
+    プロキシ用の共有HTTPクライアントを取得する（未作成の場合は作成する）
+
+    Returns:
+        httpx.AsyncClient: 共有HTTPクライアント
+    """
+    global _HTTPX
+    if _HTTPX is None or _HTTPX.is_closed:
+        http2 = _HTTP2_ENABLED and importlib.util.find_spec("h2") is not None
+        if _HTTP2_ENABLED and not http2:
+            logger.warning("MLFLOW_PROXY_HTTP2が有効ですが、h2パッケージがないためHTTP/1.1で接続します")
+        _HTTPX = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=200, max_keepalive_connections=100, keepalive_expiry=30.0),
+            timeout=60.0,
+            http2=http2
+        )
+    return _HTTPX
+
+
+async def httpx_client(request: Request) -> httpx.AsyncClient:
+    """
+    エンドポイントに注入する共有HTTPクライアントを取得する
+    （起動時に app.state.httpx へ登録したもの。未登録の場合は get_httpx() のクライアント）
+
+    Args:
+        request: 処理中のリクエスト
+
+    Returns:
+        httpx.AsyncClient: 共有HTTPクライアント
+    """
+    client = getattr(request.app.state, "httpx", None)
+    if client is None or client.is_closed:
+        client = get_httpx()
+    return client
+
+
+async def close_httpx() -> None:
+    """
+    プロキシ用の共有HTTPクライアントを閉じる（アプリ終了時に呼び出す）
+    """
+    global _HTTPX
+    if _HTTPX is not None:
+        await _HTTPX.aclose()
+        _HTTPX = None
 
 
 @router.get("/proxy-mlflow/{path:path}")
 @router.post("/proxy-mlflow/{path:path}")
 @router.put("/proxy-mlflow/{path:path}")
 @router.delete("/proxy-mlflow/{path:path}")
-async def proxy_mlflow(request: Request, path: str):
+async def proxy_mlflow(request: Request, path: str, client: httpx.AsyncClient = Depends(httpx_client)):
     """
     MLflowサーバーへのリクエストをプロキシする
     複数の接続先を試し、最初に成功した接続を使用する
     """
     # リクエストボディと全てのクエリパラメータ・ヘッダーを転送
-    body = await request.body()
-
-    # 設定されているMLflow URLを順番に試す
-    for base_url in [url for url in MLFLOW_BASE_URLS if url]:
-        target_url = f"{base_url}/{path}"
-        logger.info(f"Proxying MLflow request to: {target_url}")
-
-        try:
-            async with httpx.AsyncClient() as client:
-                # リクエストヘッダーをコピーするが、ホストヘッダーは除外
-                headers = dict(request.headers)
-                headers.pop("host", None)
-
-                response = await client.request(
-                    method=request.method,
-                    url=target_url,
-                    content=body,
-                    headers=headers,
-                    params=dict(request.query_params),
-                    timeout=60.0
-                )
-
-                # レスポンスヘッダーをコピー（Content-Lengthなどの特定ヘッダーは除外）
-                resp_headers = dict(response.headers)
-                resp_headers.pop("content-length", None)
-                resp_headers.pop("transfer-encoding", None)
-
-                # 通常のレスポンス
-                return Response(
-                    content=response.content,
-                    status_code=response.status_code,
-                    headers=resp_headers
-                )
-        except Exception as e:
-            logger.error(f"Error proxying to MLflow {target_url}: {e}")
-            continue  # 次のURLを試す
+    # 大きな（または長さ不明の）アップロードは読み込まずにそのまま流し、再送できないため接続先は1つだけ試す
+    stream_body = should_stream_request_body(request)
+    body = request.stream() if stream_body else await request.body()
+    # リクエストヘッダーはホスト・ホップバイホップヘッダーを除いてそのまま渡す（ASGIのヘッダー名は小文字）
+    headers = [(name, value) for name, value in request.headers.raw if name not in _EXCLUDED_REQUEST_HEADERS]
+    # クエリ文字列は再エンコードせずにそのまま渡す（同じキーの繰り返しも保持される）
+    query = request.url.query
 
-    # すべてのURLが失敗した場合
-    logger.error(f"All MLflow proxy attempts failed for path: {path}")
-    raise HTTPException(
-        status_code=503,
-        detail=f"Failed to connect to MLflow server. Please check if the service is running."
-    )
+    # 設定されているMLflow URLを順番に試す（直近で応答した接続先を先に試し、GETは接続できない接続先を待たない）
+    # レスポンス本文はメモリに溜めず、届いた分から転送する
+    try:
+        _, response = await forward_to_mlflow(
+            client, request.method, path, headers, body, 60.0, params=query, single_url=stream_body
+        )
+    except Exception:
+        if stream_body:
+            logger.error("MLflow proxy failed for streamed request body (not retried): %s", path)
+            raise HTTPException(
+                status_code=502,
+                detail="Failed to forward the request to MLflow server."
+            )
+
+        # すべてのURLが失敗した場合
+        logger.error("All MLflow proxy attempts failed for path: %s", path)
+        raise HTTPException(
+            status_code=503,
+            detail=f"Failed to connect to MLflow server. Please check if the service is running."
+        )
+
+    # 以降で例外が発生した場合は、ストリーミングで開いた接続を解放する
+    try:
+        # レスポンスヘッダーをコピー（Content-Lengthなどの特定ヘッダーは除外）
+        resp_headers = dict(response.headers)
+        resp_headers.pop("content-length", None)
+        resp_headers.pop("transfer-encoding", None)
+
+        return StreamingResponse(
+            response.aiter_raw(),
+            status_code=response.status_code,
+            headers=resp_headers,
+            background=BackgroundTask(response.aclose)
+        )
+    except BaseException:
+        await response.aclose()
+        raise
 
 # MLflowルートパスへのプロキシ
 @router.get("/proxy-mlflow/")
 @router.post("/proxy-mlflow/")
 @router.put("/proxy-mlflow/")
 @router.delete("/proxy-mlflow/")
-async def proxy_mlflow_root(request: Request):
+async def proxy_mlflow_root(request: Request, client: httpx.AsyncClient = Depends(httpx_client)):
     """
     MLflowサーバーのルートパスへのリクエストをプロキシする
     """
-    return await proxy_mlflow(request, "")
+    return await proxy_mlflow(request, "", client)
 
 # MLflowの状態確認エンドポイント
 @router.get("/mlflow-status")
-async def mlflow_status():
+async def mlflow_status(client: httpx.AsyncClient = Depends(httpx_client)):
     """
     MLflowサーバーの状態を確認する
     """
     status = {
-        "mlflow_urls": [url for url in MLFLOW_BASE_URLS if url],
+        "mlflow_urls": list(MLFLOW_BASE_URLS),
         "status": "unknown",
         "details": {}
     }
 
-    for i, base_url in enumerate([url for url in MLFLOW_BASE_URLS if url]):
-        try:
-            logger.info(f"Checking MLflow status at: {base_url}")
-            async with httpx.AsyncClient() as client:
-                response = await client.get(base_url, timeout=5.0)
-                status["details"][f"url_{i}"] = {
-                    "url": base_url,
-                    "status_code": response.status_code,
-                    "ok": response.status_code < 400
-                }
-                if response.status_code < 400:
-                    status["status"] = "ok"
-        except Exception as e:
+    # 各接続先の確認は独立しているため並行して行う（所要時間は最も遅い確認で決まる）
+    logger.info("Checking MLflow status at: %s", MLFLOW_BASE_URLS)
+    results = await asyncio.gather(
+        *(client.get(base_url, timeout=5.0) for base_url in MLFLOW_BASE_URLS),
+        return_exceptions=True
+    )
+
+    for i, (base_url, result) in enumerate(zip(MLFLOW_BASE_URLS, results)):
+        if isinstance(result, Exception):
             status["details"][f"url_{i}"] = {
                 "url": base_url,
-                "error": str(e),
+                "error": str(result),
                 "ok": False
             }
+            continue
+
+        status["details"][f"url_{i}"] = {
+            "url": base_url,
+            "status_code": result.status_code,
+            "ok": result.status_code < 400
+        }
+        if result.status_code < 400:
+            status["status"] = "ok"
 
     # すべてのURLが失敗した場合
     if status["status"] == "unknown":
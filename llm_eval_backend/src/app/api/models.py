@@ -1,36 +1,14 @@
-from pydantic import BaseModel, Field
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field, SkipValidation
 from typing import List, Dict, Any, Optional, Literal, Union
 from datetime import datetime
 import os
 from enum import Enum
 
-# Ollamaモデルダウンロード関連モデル
-class OllamaDownloadStatus(str, Enum):
-    """Ollamaモデルダウンロードステータス列挙型"""
-    PENDING = "pending"
-    DOWNLOADING = "downloading"
-    COMPLETED = "completed"
-    FAILED = "failed"
-
-class OllamaModelDownload(BaseModel):
-    """Ollamaモデルダウンロード情報モデル"""
-    id: str
-    model_id: str
-    model_name: str
-    endpoint: str
-    status: OllamaDownloadStatus
-    progress: int = 0
-    total_size: int = 0
-    downloaded_size: int = 0
-    error: Optional[str] = None
-    created_at: datetime
-    updated_at: datetime
-    completed_at: Optional[datetime] = None
-    digest: Optional[str] = None
-
 
 class ModelConfig(BaseModel):
     """モデル設定"""
+    model_config = ConfigDict(protected_namespaces=())
+
     provider: str
     model_name: str
     max_tokens: int
@@ -50,8 +28,10 @@ class EvaluationRequest(BaseModel):
 
 class EvaluationResponse(BaseModel):
     """評価レスポンスモデル"""
+    model_config = ConfigDict(protected_namespaces=())
+
     model_info: ModelConfig       # 使用したモデル情報
-    metrics: Dict[str, Any]       # フラットメトリクス辞書（辞書型の値も許容）
+    metrics: SkipValidation[Dict[str, Any]]  # フラットメトリクス辞書（辞書型の値も許容。サーバー側で作るため検証しない）
 
 
 class JobStatus(str, Enum):
@@ -89,7 +69,7 @@ class JobDetail(BaseModel):
     id: str
     status: JobStatus
     request: EvaluationRequest
-    result: Optional[Dict[str, Any]] = None
+    result: Optional[SkipValidation[Dict[str, Any]]] = None  # 保存済みの評価結果（検証しない）
     error_message: Optional[str] = None
     created_at: datetime
     updated_at: datetime
@@ -98,6 +78,8 @@ class JobDetail(BaseModel):
 
 class JobSummary(BaseModel):
     """ジョブ概要モデル（リスト表示用）"""
+    model_config = ConfigDict(protected_namespaces=())
+
     id: str
     status: JobStatus
     datasets: List[str]
@@ -150,7 +132,10 @@ class MetricBase(BaseModel):
     name: str                      # メトリクス名
     type: str                      # メトリクスタイプ
     description: Optional[str] = None  # 説明（オプション）
-    is_higher_better: bool = True  # 値が高いほど良いか
+    # 値が高いほど良いか（フロントエンドのキャメルケース isHigherBetter も受け付ける）
+    is_higher_better: bool = Field(
+        default=True, validation_alias=AliasChoices("is_higher_better", "isHigherBetter")
+    )
     parameters: Optional[Dict[str, Any]] = None  # パラメータ
 
 
@@ -164,7 +149,9 @@ class MetricUpdate(BaseModel):
     name: Optional[str] = None
     type: Optional[str] = None
     description: Optional[str] = None
-    is_higher_better: Optional[bool] = None
+    is_higher_better: Optional[bool] = Field(
+        default=None, validation_alias=AliasChoices("is_higher_better", "isHigherBetter")
+    )
     parameters: Optional[Dict[str, Any]] = None
 
 
@@ -250,7 +237,7 @@ class InferenceResult(BaseModel):
     input: str
     expected_output: Optional[str] = None
     actual_output: str
-    metrics: Optional[Dict[str, Any]] = None  # Any型に変更して辞書型も許容
+    metrics: Optional[SkipValidation[Dict[str, Any]]] = None  # Any型に変更して辞書型も許容（DBの値なので検証しない）
     latency: Optional[float] = None
     token_count: Optional[int] = None
     created_at: datetime
@@ -258,6 +245,8 @@ class InferenceResult(BaseModel):
 
 class Inference(BaseModel):
     """推論モデル"""
+    model_config = ConfigDict(protected_namespaces=())
+
     id: str
     name: str
     description: Optional[str] = None
@@ -266,7 +255,7 @@ class Inference(BaseModel):
     model_id: str
     status: InferenceStatus
     progress: int = 0
-    metrics: Optional[Dict[str, Any]] = None  # Any型に変更して辞書型も許容
+    metrics: Optional[SkipValidation[Dict[str, Any]]] = None  # Any型に変更して辞書型も許容（DBの値なので検証しない）
     results: List[InferenceResult] = []
     created_at: datetime
     updated_at: datetime
@@ -276,6 +265,8 @@ class Inference(BaseModel):
 
 class InferenceCreate(BaseModel):
     """推論作成リクエストモデル"""
+    model_config = ConfigDict(protected_namespaces=())
+
     name: str
     description: Optional[str] = None
     dataset_id: str
@@ -311,6 +302,8 @@ class InferenceDetailResponse(BaseModel):
 
 class JsonlInferenceRequest(BaseModel):
     """JSONLデータセット推論リクエストモデル"""
+    model_config = ConfigDict(protected_namespaces=())
+
     dataset_path: str
     provider_id: str
     model_id: str
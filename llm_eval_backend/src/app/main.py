@@ -5,12 +5,14 @@ import datetime
 import json
 import re
 from zoneinfo import ZoneInfo
-from fastapi import FastAPI, Request, Response
+from fastapi import Depends, FastAPI, Request, Response
 import httpx
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.openapi.docs import get_swagger_ui_html, get_redoc_html
 from fastapi.openapi.utils import get_openapi
 from fastapi.staticfiles import StaticFiles
+from starlette.background import BackgroundTask
 from fastapi.responses import JSONResponse, HTMLResponse, StreamingResponse, RedirectResponse
 
 from app.api import api_router
@@ -51,11 +53,18 @@ app.add_middleware(
     max_age=86400  # 24時間キャッシュ
 )
 
+# レスポンス圧縮（UIページなど1KB以上のレスポンスをgzip圧縮する。text/event-stream は対象外）
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=6)
+
 # データベース接続の初期化
 db = get_db()
 
 # プロキシルーターを追加
 from app.api.endpoints import proxy
+from app.api.endpoints.proxy import (
+    get_httpx, close_httpx, httpx_client, should_stream_request_body, send_to_mlflow, forward_to_mlflow,
+    MLFLOW_HOST, MLFLOW_PORT, MLFLOW_BASE_URL, MLFLOW_BASE_URLS
+)
 
 # JSONLデータセット推論APIルーターをインポート
 from app.api.endpoints import jsonl_inference
@@ -145,6 +154,9 @@ async def startup_event():
     init_router_from_db()
     logger.info("LiteLLM Router初期化完了")
     
+    # プロキシ用の共有HTTPクライアントを作成し、エンドポイントから参照できるよう登録
+    app.state.httpx = get_httpx()
+    
     logger.info("アプリケーション起動完了")
 
 # アプリ終了イベント    
@@ -153,7 +165,8 @@ async def shutdown_event():
     # アプリケーション終了時に実行する処理
     logger.info("アプリケーション終了中...")
     
-    # データベース接続のクローズなど
+    # プロキシ用HTTPクライアントとデータベース接続のクローズなど
+    await close_httpx()
     db.close()
     
     logger.info("アプリケーション終了完了")
@@ -646,6 +659,12 @@ async def mlflow_ui():
     """
     return html_content
 
+# プロキシでURLの書き換えを行うため、本文を読み込む必要があるコンテンツタイプ
+_MLFLOW_REWRITE_CONTENT_TYPES = (
+    "text/html", "text/css", "application/javascript", "text/javascript", "application/json"
+)
+
+
 # MLflow UIへのプロキシエンドポイント
 @app.get("/proxy-mlflow/{path:path}")
 @app.post("/proxy-mlflow/{path:path}")
@@ -653,48 +672,17 @@ async def mlflow_ui():
 @app.delete("/proxy-mlflow/{path:path}")
 @app.patch("/proxy-mlflow/{path:path}")
 @app.options("/proxy-mlflow/{path:path}")
-async def proxy_mlflow(path: str, request: Request):
-    # MLflowサービスへの内部URL（Docker Composeネットワーク内）
-    # ホスト名を環境変数から取得（デフォルトはmlflow）
-    mlflow_host = os.environ.get("MLFLOW_HOST", "mlflow")
-    mlflow_port = os.environ.get("MLFLOW_PORT", "5000")
-    
-    # 接続試行対象URLリスト - 優先順位順
-    connection_attempts = [
-        # 1. 環境変数で指定されたホスト（デフォルト：mlflow:5000）
-        f"http://{mlflow_host}:{mlflow_port}/{path}",
-        # 2. ローカルホスト（同一コンテナ内からの接続用）
-        f"http://localhost:{mlflow_port}/{path}",
-        # 3. Docker内部ネットワークの一般的なアドレス
-        f"http://host.docker.internal:{mlflow_port}/{path}",
-        # 4. Docker Bridgeネットワークのデフォルトゲートウェイ
-        f"http://172.17.0.1:{mlflow_port}/{path}"
-    ]
-    
-    # 最初の接続試行先URLをログ
-    target_url = connection_attempts[0]
-    logger.debug(f"MLflow primary target URL: {target_url}")
-    
-    # フォールバック情報を記録
-    fallback_urls = connection_attempts[1:]
-    logger.debug(f"MLflow fallback URLs: {fallback_urls}")
+async def proxy_mlflow(path: str, request: Request, client: httpx.AsyncClient = Depends(httpx_client)):
+    mlflow_host = MLFLOW_HOST
+    mlflow_port = MLFLOW_PORT
     
-    # クエリパラメータをURLリストに適用
-    query_string = ""
-    if request.query_params:
-        query_string = "?" + str(request.query_params)
-    
-    # 正規化されたURLリストを作成（クエリパラメータを含む）
-    attempt_urls = [url + query_string for url in connection_attempts]
-    primary_url = attempt_urls[0]
-    
-    logger.debug(f"MLflowへのプロキシリクエスト: {request.method} {primary_url}")
+    logger.debug("MLflowへのプロキシリクエスト: %s /%s", request.method, path)
     
     try:
         # リクエストヘッダーをコピー（一部のヘッダーは除外）
         headers = {}
         for name, value in request.headers.items():
-            if name.lower() not in ("host", "content-length"):
+            if name.lower() not in ("host", "content-length", "connection", "keep-alive"):
                 headers[name] = value
         
         # CORSヘッダーを追加
@@ -711,226 +699,212 @@ async def proxy_mlflow(path: str, request: Request):
             )
         
         # リクエストボディを取得
-        body = await request.body() if request.method != "GET" else None
-        
-        # 接続エラーを蓄積
-        errors = []
-        response = None
-        
-        # 複数URLを試行するフォールバックメカニズム
-        for url_index, current_url in enumerate(attempt_urls):
-            try:
-                # リクエストメソッドに応じたHTTPリクエストを送信
-                async with httpx.AsyncClient(timeout=15.0) as client:  # タイムアウトを適切に設定
-                    if request.method == "GET":
-                        response = await client.get(current_url, headers=headers, follow_redirects=True)
-                    elif request.method == "POST":
-                        response = await client.post(current_url, headers=headers, content=body, follow_redirects=True)
-                    elif request.method == "PUT":
-                        response = await client.put(current_url, headers=headers, content=body, follow_redirects=True)
-                    elif request.method == "DELETE":
-                        response = await client.delete(current_url, headers=headers, follow_redirects=True)
-                    elif request.method == "PATCH":
-                        response = await client.patch(current_url, headers=headers, content=body, follow_redirects=True)
-                    else:
-                        return JSONResponse(
-                            status_code=405,
-                            content={"detail": f"Method {request.method} not allowed"}
-                        )
-                
-                # 成功した場合、使用したURLをログに記録して処理を続行
-                if url_index > 0:
-                    logger.info(f"MLflow接続: フォールバックURL({url_index})を使用しました: {current_url}")
-                
-                # レスポンスヘッダーから不要なものを除外
-                headers_to_forward = dict(response.headers)
-                headers_to_remove = ["content-encoding", "content-length", "transfer-encoding", "connection"]
-                for header in headers_to_remove:
-                    if header in headers_to_forward:
-                        del headers_to_forward[header]
-                
-                # CORSヘッダーを追加
-                headers_to_forward["Access-Control-Allow-Origin"] = "*"
-                headers_to_forward["Access-Control-Allow-Methods"] = "GET, POST, PUT, DELETE, OPTIONS"
-                headers_to_forward["Access-Control-Allow-Headers"] = "Content-Type, Authorization"
-                
-                # 接続が成功したので、レスポンス処理に進む
-                break
-                
-            except Exception as e:
-                # 失敗した場合はエラーを記録して次のURLを試す
-                error_msg = f"URL{url_index} '{current_url}': {str(e)}"
-                errors.append(error_msg)
-                logger.warning(f"MLflow接続エラー: {error_msg}")
-                
-                # 最後のURLまで試したが全て失敗した場合
-                if url_index == len(attempt_urls) - 1:
-                    raise Exception(f"全ての接続先で接続失敗: {', '.join(errors)}")
-                
-                # 次のURLを試す
-                continue
+        # 大きな（または長さ不明の）アップロードは読み込まずにそのまま流し、再送できないため接続先は1つだけ試す
+        stream_body = should_stream_request_body(request)
+        if stream_body:
+            body = request.stream()
+            if "content-length" in request.headers:
+                headers["content-length"] = request.headers["content-length"]
+        else:
+            body = await request.body() if request.method != "GET" else None
         
-        # 全ての接続試行が終了後、レスポンスがない場合はエラーを返す
-        if response is None:
+        if request.method not in ("GET", "POST", "PUT", "DELETE", "PATCH"):
             return JSONResponse(
-                status_code=500,
-                content={"detail": "MLflowサーバーへの接続に失敗しました。レスポンスが取得できませんでした。"}
+                status_code=405,
+                content={"detail": f"Method {request.method} not allowed"}
             )
-            
-        # コンテンツタイプのチェック
-        content_type = response.headers.get("content-type", "")
-        content = response.content
         
-        # HTMLの場合、相対パスを絶対パスに変換する
-        if content_type.startswith("text/html"):
-            content_text = content.decode("utf-8")
-            
-            # 相対パスを '/proxy-mlflow/' で始まる絶対パスに変換
-            content_text = content_text.replace('href="./static-files/', 'href="/proxy-mlflow/static-files/')
-            content_text = content_text.replace('src="static-files/', 'src="/proxy-mlflow/static-files/')
-            content_text = content_text.replace('src="./static-files/', 'src="/proxy-mlflow/static-files/')
-            content_text = content_text.replace('href="static-files/', 'href="/proxy-mlflow/static-files/')
-            content_text = content_text.replace('href="api/', 'href="/proxy-mlflow/api/')
-            content_text = content_text.replace('href="#/', 'href="/proxy-mlflow#/')
-            
-            # 絶対パスのMLflowへの参照をプロキシに変換
-            content_text = content_text.replace('http://localhost:5000', '/proxy-mlflow')
-            content_text = content_text.replace('"http://mlflow:5000', '"/proxy-mlflow')
-            content_text = content_text.replace("'http://mlflow:5000", "'/proxy-mlflow")
-            
-            # 環境変数で設定されたMLflowホスト名も置換
-            mlflow_host = os.environ.get("MLFLOW_HOST", "mlflow")
-            mlflow_port = os.environ.get("MLFLOW_PORT", "5000")
-            if mlflow_host != "mlflow" or mlflow_port != "5000":
-                content_text = content_text.replace(f'http://{mlflow_host}:{mlflow_port}', '/proxy-mlflow')
-                content_text = content_text.replace(f'"http://{mlflow_host}:{mlflow_port}', '"/proxy-mlflow')
-                content_text = content_text.replace(f"'http://{mlflow_host}:{mlflow_port}", "'/proxy-mlflow")
-            
-            # IPアドレスベースのURLも置換
-            content_text = content_text.replace('http://0.0.0.0:5000', '/proxy-mlflow')
-            
-            # 異なるネットワーク間でのアクセス用に、様々なIPアドレスパターンを書き換え
-            import re
-            # 任意のIPアドレスとポート5000のパターンを検出して置換
-            ip_pattern = r'(https?://)((?:\d{1,3}\.){3}\d{1,3}):5000'
-            content_text = re.sub(ip_pattern, r'\1\2:8001/proxy-mlflow', content_text)
-            
-            # artifact_uri内のファイルパス参照を修正（クロスネットワークアクセス時の問題修正）
-            if '"artifact_uri"' in content_text or "'artifact_uri'" in content_text:
-                # JSON内でartifact_uriフィールドのパスを検出して置換
-                artifact_pattern = r'(["\'])artifact_uri[\'"]\s*:\s*["\']file:///mlflow/artifacts/([^"\']*)[\'"]\s*([,}])'
-                content_text = re.sub(artifact_pattern, r'\1artifact_uri\1: \1/proxy-mlflow/get-artifact?path=\2\1\3', content_text)
+        # 複数URLを試行するフォールバックメカニズム（接続先の候補と試行の仕方は proxy モジュールで管理する）
+        try:
+            _, response = await forward_to_mlflow(
+                client, request.method, path, headers, body, 15.0,
+                params=request.url.query or None, follow_redirects=True, single_url=stream_body
+            )
+        except Exception as e:
+            # ボディを送り始めているため、別の接続先には再送していない
+            if stream_body:
+                return JSONResponse(
+                    status_code=502,
+                    content={"detail": "MLflowサーバーへのリクエストの転送に失敗しました。", "error": str(e)},
+                    headers={"Access-Control-Allow-Origin": "*"}
+                )
+            raise Exception(f"全ての接続先で接続失敗: {str(e)}")
+        
+        # 以降で例外が発生した場合は、ストリーミングで開いた接続を解放する
+        try:
+            # レスポンスヘッダーから不要なものを除外
+            headers_to_forward = dict(response.headers)
+            headers_to_remove = ["content-encoding", "content-length", "transfer-encoding", "connection"]
+            for header in headers_to_remove:
+                if header in headers_to_forward:
+                    del headers_to_forward[header]
+        
+            # CORSヘッダーを追加
+            headers_to_forward["Access-Control-Allow-Origin"] = "*"
+            headers_to_forward["Access-Control-Allow-Methods"] = "GET, POST, PUT, DELETE, OPTIONS"
+            headers_to_forward["Access-Control-Allow-Headers"] = "Content-Type, Authorization"
             
-            content = content_text.encode("utf-8")
+            # コンテンツタイプのチェック
+            content_type = response.headers.get("content-type", "")
         
-        # CSSの場合も、相対パスを絶対パスに変換
-        elif content_type.startswith("text/css"):
-            try:
-                content_text = content.decode("utf-8")
-                content_text = content_text.replace('url(../', 'url(/proxy-mlflow/static-files/')
-                content_text = content_text.replace('url("../', 'url("/proxy-mlflow/static-files/')
-                content_text = content_text.replace("url('../", "url('/proxy-mlflow/static-files/")
-                content = content_text.encode("utf-8")
-            except:
-                # デコードに失敗した場合は元のコンテンツを使用
-                pass
+            # URLを書き換えないコンテンツは、メモリに溜めずにそのまま転送する
+            if not content_type.startswith(_MLFLOW_REWRITE_CONTENT_TYPES):
+                return StreamingResponse(
+                    response.aiter_bytes(),
+                    status_code=response.status_code,
+                    headers=headers_to_forward,
+                    media_type=content_type or "text/html",
+                    background=BackgroundTask(response.aclose)
+                )
+            content = await response.aread()
         
-        # JavaScriptの場合も、URLを書き換え
-        elif content_type.startswith("application/javascript") or content_type.startswith("text/javascript"):
-            try:
+            # HTMLの場合、相対パスを絶対パスに変換する
+            if content_type.startswith("text/html"):
                 content_text = content.decode("utf-8")
+            
+                # 相対パスを '/proxy-mlflow/' で始まる絶対パスに変換
+                content_text = content_text.replace('href="./static-files/', 'href="/proxy-mlflow/static-files/')
+                content_text = content_text.replace('src="static-files/', 'src="/proxy-mlflow/static-files/')
+                content_text = content_text.replace('src="./static-files/', 'src="/proxy-mlflow/static-files/')
+                content_text = content_text.replace('href="static-files/', 'href="/proxy-mlflow/static-files/')
+                content_text = content_text.replace('href="api/', 'href="/proxy-mlflow/api/')
+                content_text = content_text.replace('href="#/', 'href="/proxy-mlflow#/')
+            
+                # 絶対パスのMLflowへの参照をプロキシに変換
                 content_text = content_text.replace('http://localhost:5000', '/proxy-mlflow')
                 content_text = content_text.replace('"http://mlflow:5000', '"/proxy-mlflow')
                 content_text = content_text.replace("'http://mlflow:5000", "'/proxy-mlflow")
-                
+            
                 # 環境変数で設定されたMLflowホスト名も置換
-                mlflow_host = os.environ.get("MLFLOW_HOST", "mlflow")
-                mlflow_port = os.environ.get("MLFLOW_PORT", "5000")
                 if mlflow_host != "mlflow" or mlflow_port != "5000":
                     content_text = content_text.replace(f'http://{mlflow_host}:{mlflow_port}', '/proxy-mlflow')
                     content_text = content_text.replace(f'"http://{mlflow_host}:{mlflow_port}', '"/proxy-mlflow')
                     content_text = content_text.replace(f"'http://{mlflow_host}:{mlflow_port}", "'/proxy-mlflow")
-                
+            
                 # IPアドレスベースのURLも置換
                 content_text = content_text.replace('http://0.0.0.0:5000', '/proxy-mlflow')
-                
+            
                 # 異なるネットワーク間でのアクセス用に、様々なIPアドレスパターンを書き換え
                 import re
                 # 任意のIPアドレスとポート5000のパターンを検出して置換
                 ip_pattern = r'(https?://)((?:\d{1,3}\.){3}\d{1,3}):5000'
                 content_text = re.sub(ip_pattern, r'\1\2:8001/proxy-mlflow', content_text)
-                
+            
+                # artifact_uri内のファイルパス参照を修正（クロスネットワークアクセス時の問題修正）
+                if '"artifact_uri"' in content_text or "'artifact_uri'" in content_text:
+                    # JSON内でartifact_uriフィールドのパスを検出して置換
+                    artifact_pattern = r'(["\'])artifact_uri[\'"]\s*:\s*["\']file:///mlflow/artifacts/([^"\']*)[\'"]\s*([,}])'
+                    content_text = re.sub(artifact_pattern, r'\1artifact_uri\1: \1/proxy-mlflow/get-artifact?path=\2\1\3', content_text)
+            
                 content = content_text.encode("utf-8")
-            except:
-                # デコードに失敗した場合は元のコンテンツを使用
-                pass
         
-        # JSONの場合も、URLを書き換え
-        elif content_type.startswith("application/json"):
-            try:
-                content_text = content.decode("utf-8")
+            # CSSの場合も、相対パスを絶対パスに変換
+            elif content_type.startswith("text/css"):
+                try:
+                    content_text = content.decode("utf-8")
+                    content_text = content_text.replace('url(../', 'url(/proxy-mlflow/static-files/')
+                    content_text = content_text.replace('url("../', 'url("/proxy-mlflow/static-files/')
+                    content_text = content_text.replace("url('../", "url('/proxy-mlflow/static-files/")
+                    content = content_text.encode("utf-8")
+                except:
+                    # デコードに失敗した場合は元のコンテンツを使用
+                    pass
+        
+            # JavaScriptの場合も、URLを書き換え
+            elif content_type.startswith("application/javascript") or content_type.startswith("text/javascript"):
+                try:
+                    content_text = content.decode("utf-8")
+                    content_text = content_text.replace('http://localhost:5000', '/proxy-mlflow')
+                    content_text = content_text.replace('"http://mlflow:5000', '"/proxy-mlflow')
+                    content_text = content_text.replace("'http://mlflow:5000", "'/proxy-mlflow")
                 
-                # JSONとして解析して、空の場合やnullの場合は空のJSONオブジェクトを返す
-                if not content_text.strip() or content_text.strip() == "null":
-                    logger.warning("空のJSONレスポンスまたはnullが返されました。空のオブジェクトに置き換えます。")
-                    content_text = "{}"
+                    # 環境変数で設定されたMLflowホスト名も置換
+                    if mlflow_host != "mlflow" or mlflow_port != "5000":
+                        content_text = content_text.replace(f'http://{mlflow_host}:{mlflow_port}', '/proxy-mlflow')
+                        content_text = content_text.replace(f'"http://{mlflow_host}:{mlflow_port}', '"/proxy-mlflow')
+                        content_text = content_text.replace(f"'http://{mlflow_host}:{mlflow_port}", "'/proxy-mlflow")
                 
-                # すべてのMLflow絶対URLをプロキシURLに変換
-                content_text = content_text.replace('http://localhost:5000', '/proxy-mlflow')
-                content_text = content_text.replace('http://mlflow:5000', '/proxy-mlflow')
+                    # IPアドレスベースのURLも置換
+                    content_text = content_text.replace('http://0.0.0.0:5000', '/proxy-mlflow')
                 
-                # 環境変数で設定されたホスト名も置換
-                mlflow_host = os.environ.get("MLFLOW_HOST", "mlflow")
-                mlflow_port = os.environ.get("MLFLOW_PORT", "5000")
-                if mlflow_host != "mlflow" or mlflow_port != "5000":
-                    content_text = content_text.replace(f'http://{mlflow_host}:{mlflow_port}', '/proxy-mlflow')
+                    # 異なるネットワーク間でのアクセス用に、様々なIPアドレスパターンを書き換え
+                    import re
+                    # 任意のIPアドレスとポート5000のパターンを検出して置換
+                    ip_pattern = r'(https?://)((?:\d{1,3}\.){3}\d{1,3}):5000'
+                    content_text = re.sub(ip_pattern, r'\1\2:8001/proxy-mlflow', content_text)
                 
-                # IPアドレスベースのURLも置換
-                content_text = content_text.replace('http://0.0.0.0:5000', '/proxy-mlflow')
+                    content = content_text.encode("utf-8")
+                except:
+                    # デコードに失敗した場合は元のコンテンツを使用
+                    pass
+        
+            # JSONの場合も、URLを書き換え
+            elif content_type.startswith("application/json"):
+                try:
+                    content_text = content.decode("utf-8")
                 
-                # 一般的なIPアドレスパターンも置換（任意のIPアドレスを検出）
-                import re
-                # 単純なIP置換（http://IP:5000 → /proxy-mlflow）
-                ip_pattern = r'http://\d+\.\d+\.\d+\.\d+:5000'
-                content_text = re.sub(ip_pattern, '/proxy-mlflow', content_text)
+                    # JSONとして解析して、空の場合やnullの場合は空のJSONオブジェクトを返す
+                    if not content_text.strip() or content_text.strip() == "null":
+                        logger.warning("空のJSONレスポンスまたはnullが返されました。空のオブジェクトに置き換えます。")
+                        content_text = "{}"
                 
-                # 外部ネットワークから見える形式に書き換え（http://IP:5000 → http://IP:8001/proxy-mlflow）
-                ip_ext_pattern = r'(https?://)((?:\d{1,3}\.){3}\d{1,3}):5000'
-                content_text = re.sub(ip_ext_pattern, r'\1\2:8001/proxy-mlflow', content_text)
+                    # すべてのMLflow絶対URLをプロキシURLに変換
+                    content_text = content_text.replace('http://localhost:5000', '/proxy-mlflow')
+                    content_text = content_text.replace('http://mlflow:5000', '/proxy-mlflow')
                 
-                # artifact_uri内のファイルパス参照を修正（クロスネットワークアクセス時の問題修正）
-                if '"artifact_uri"' in content_text or "'artifact_uri'" in content_text:
-                    # JSON内でartifact_uriフィールドのパスを検出して置換
-                    artifact_pattern = r'(["\'])artifact_uri[\'"]\s*:\s*["\']file:///mlflow/artifacts/([^"\']*)[\'"]\s*([,}])'
-                    content_text = re.sub(artifact_pattern, r'\1artifact_uri\1: \1/proxy-mlflow/get-artifact?path=\2\1\3', content_text)
+                    # 環境変数で設定されたホスト名も置換
+                    if mlflow_host != "mlflow" or mlflow_port != "5000":
+                        content_text = content_text.replace(f'http://{mlflow_host}:{mlflow_port}', '/proxy-mlflow')
                 
-                # JSONとして解析可能か検証
-                try:
-                    json.loads(content_text)
-                except json.JSONDecodeError as e:
-                    logger.error(f"JSONとして解析できないコンテンツ: {e}")
-                    # 解析できない場合は空のJSONオブジェクトを返す
-                    content_text = "{}"
+                    # IPアドレスベースのURLも置換
+                    content_text = content_text.replace('http://0.0.0.0:5000', '/proxy-mlflow')
                 
-                content = content_text.encode("utf-8")
+                    # 一般的なIPアドレスパターンも置換（任意のIPアドレスを検出）
+                    import re
+                    # 単純なIP置換（http://IP:5000 → /proxy-mlflow）
+                    ip_pattern = r'http://\d+\.\d+\.\d+\.\d+:5000'
+                    content_text = re.sub(ip_pattern, '/proxy-mlflow', content_text)
+                
+                    # 外部ネットワークから見える形式に書き換え（http://IP:5000 → http://IP:8001/proxy-mlflow）
+                    ip_ext_pattern = r'(https?://)((?:\d{1,3}\.){3}\d{1,3}):5000'
+                    content_text = re.sub(ip_ext_pattern, r'\1\2:8001/proxy-mlflow', content_text)
                 
-                # ここで明示的にログ出力して確認
-                logger.info(f"処理後のJSONコンテンツ: {content_text[:100]}...")
+                    # artifact_uri内のファイルパス参照を修正（クロスネットワークアクセス時の問題修正）
+                    if '"artifact_uri"' in content_text or "'artifact_uri'" in content_text:
+                        # JSON内でartifact_uriフィールドのパスを検出して置換
+                        artifact_pattern = r'(["\'])artifact_uri[\'"]\s*:\s*["\']file:///mlflow/artifacts/([^"\']*)[\'"]\s*([,}])'
+                        content_text = re.sub(artifact_pattern, r'\1artifact_uri\1: \1/proxy-mlflow/get-artifact?path=\2\1\3', content_text)
                 
-            except Exception as e:
-                logger.warning(f"JSONコンテンツの書き換えに失敗しました: {e}")
-                # エラーが発生した場合は空のJSONオブジェクトを返す
-                content = b"{}"
+                    # JSONとして解析可能か検証
+                    try:
+                        json.loads(content_text)
+                    except json.JSONDecodeError as e:
+                        logger.error("JSONとして解析できないコンテンツ: %s", e)
+                        # 解析できない場合は空のJSONオブジェクトを返す
+                        content_text = "{}"
+                
+                    content = content_text.encode("utf-8")
+                
+                    # ここで明示的にログ出力して確認
+                    logger.debug("処理後のJSONコンテンツ: %s...", content_text[:100])
+                
+                except Exception as e:
+                    logger.warning("JSONコンテンツの書き換えに失敗しました: %s", e)
+                    # エラーが発生した場合は空のJSONオブジェクトを返す
+                    content = b"{}"
         
-        # レスポンスの内容を返す
-        return Response(
-            content=content,
-            status_code=response.status_code,
-            headers=headers_to_forward,
-            media_type=content_type or "text/html"
-        )
+            # レスポンスの内容を返す
+            return Response(
+                content=content,
+                status_code=response.status_code,
+                headers=headers_to_forward,
+                media_type=content_type or "text/html"
+            )
+        except BaseException:
+            await response.aclose()
+            raise
     except httpx.TimeoutException:
-        logger.error(f"MLflowへのリクエストがタイムアウトしました: {target_url}")
+        logger.error("MLflowへのリクエストがタイムアウトしました: /%s", path)
         return JSONResponse(
             status_code=504,
             content={"detail": "MLflowへのリクエストがタイムアウトしました"}
@@ -943,10 +917,10 @@ async def proxy_mlflow(path: str, request: Request):
             pass
         else:
             # 単一のエラーの場合はURLのリストを表示
-            attempted_urls = "\n".join([f"- URL{i}: {url}" for i, url in enumerate(attempt_urls)]) if 'attempt_urls' in locals() else f"- URL: {target_url}"
+            attempted_urls = "\n".join([f"- URL{i}: {url}/{path}" for i, url in enumerate(MLFLOW_BASE_URLS)])
             error_details = f"{error_details}\n試行したURL:\n{attempted_urls}"
         
-        logger.error(f"MLflowへのプロキシ中にエラーが発生しました: {error_details}", exc_info=True)
+        logger.error("MLflowへのプロキシ中にエラーが発生しました: %s", error_details, exc_info=True)
         
         # ユーザーフレンドリーなエラーメッセージを返す
         return JSONResponse(
@@ -973,14 +947,14 @@ async def get_mlflow_artifact(path: str):
     Args:
         path: アーティファクトパス
     """
-    logger.info(f"アーティファクトへのアクセス: {path}")
+    logger.info("アーティファクトへのアクセス: %s", path)
     
     # アーティファクトのパスを構築
     artifact_path = f"/mlflow/artifacts/{path}"
     
     # ファイルが存在するか確認
     if not os.path.exists(artifact_path):
-        logger.error(f"アーティファクトが見つかりません: {artifact_path}")
+        logger.error("アーティファクトが見つかりません: %s", artifact_path)
         return JSONResponse(
             status_code=404,
             content={"detail": f"Artifact not found: {path}"},
@@ -1018,7 +992,7 @@ async def get_mlflow_artifact(path: str):
             }
         )
     except Exception as e:
-        logger.error(f"アーティファクト取得エラー: {str(e)}", exc_info=True)
+        logger.error("アーティファクト取得エラー: %s", e, exc_info=True)
         return JSONResponse(
             status_code=500,
             content={"detail": f"Error accessing artifact: {str(e)}"},
@@ -1032,8 +1006,8 @@ async def get_mlflow_artifact(path: str):
 @app.delete("/proxy-mlflow", response_class=Response)
 @app.patch("/proxy-mlflow", response_class=Response)
 @app.options("/proxy-mlflow", response_class=Response)
-async def proxy_mlflow_root(request: Request):
-    logger.info(f"MLflowルートパスへのアクセス: {request.method}")
+async def proxy_mlflow_root(request: Request, client: httpx.AsyncClient = Depends(httpx_client)):
+    logger.info("MLflowルートパスへのアクセス: %s", request.method)
     # OPTIONSリクエストの場合は明示的に処理
     if request.method == "OPTIONS":
         headers = {
@@ -1049,9 +1023,9 @@ async def proxy_mlflow_root(request: Request):
     
     try:
         # プロキシ呼び出し
-        return await proxy_mlflow("", request)
+        return await proxy_mlflow("", request, client)
     except Exception as e:
-        logger.error(f"MLflowルートパスアクセスエラー: {str(e)}", exc_info=True)
+        logger.error("MLflowルートパスアクセスエラー: %s", e, exc_info=True)
         # フロントエンド向けにわかりやすいエラーを返す
         return JSONResponse(
             status_code=500,
@@ -1066,12 +1040,10 @@ async def proxy_mlflow_root(request: Request):
 # 静的ファイル用のプロキシエンドポイント（CSSやJSなど）
 @app.get("/proxy-mlflow/static-files/{file_path:path}")
 @app.options("/proxy-mlflow/static-files/{file_path:path}")
-async def proxy_mlflow_static(file_path: str, request: Request):
+async def proxy_mlflow_static(file_path: str, request: Request, client: httpx.AsyncClient = Depends(httpx_client)):
     # 静的ファイルへのパスを構築
-    mlflow_host = os.environ.get("MLFLOW_HOST", "mlflow")
-    mlflow_port = os.environ.get("MLFLOW_PORT", "5000")
-    target_url = f"http://{mlflow_host}:{mlflow_port}/static-files/{file_path}"
-    logger.debug(f"MLflow静的ファイルへのプロキシリクエスト: {request.method} {target_url}")
+    target_url = f"{MLFLOW_BASE_URL}/static-files/{file_path}"
+    logger.debug("MLflow静的ファイルへのプロキシリクエスト: %s %s", request.method, target_url)
     
     # OPTIONSリクエストの場合は直接レスポンスを返す
     if request.method == "OPTIONS":
@@ -1088,44 +1060,53 @@ async def proxy_mlflow_static(file_path: str, request: Request):
         )
     
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(target_url, follow_redirects=True)
-            
-            headers_to_forward = dict(response.headers)
-            headers_to_remove = ["content-encoding", "content-length", "transfer-encoding", "connection"]
-            for header in headers_to_remove:
-                if header in headers_to_forward:
-                    del headers_to_forward[header]
-            
-            # キャッシュヘッダーを追加
-            headers_to_forward["Cache-Control"] = "public, max-age=86400"
-            headers_to_forward["Access-Control-Allow-Origin"] = "*"
-            
-            # 静的ファイルの内容を取得
-            content = response.content
-            content_type = response.headers.get("content-type", "application/octet-stream")
-            
-            # JavaScriptや他のテキストベースのファイルでURLの書き換えを行う
-            if content_type.startswith("text/") or content_type.startswith("application/javascript"):
-                try:
-                    content_text = content.decode("utf-8")
-                    # MLflowへの絶対URLをプロキシURLに変換
-                    content_text = content_text.replace('http://localhost:5000', '/proxy-mlflow')
-                    content_text = content_text.replace('"http://mlflow:5000', '"/proxy-mlflow')
-                    content_text = content_text.replace("'http://mlflow:5000", "'/proxy-mlflow")
-                    content = content_text.encode("utf-8")
-                except:
-                    # デコードに失敗した場合は元のコンテンツを使用
-                    pass
-            
-            return Response(
-                content=content,
+        response = await send_to_mlflow(client, "GET", target_url, {}, None, timeout=10.0, follow_redirects=True)
+        
+        headers_to_forward = dict(response.headers)
+        headers_to_remove = ["content-encoding", "content-length", "transfer-encoding", "connection"]
+        for header in headers_to_remove:
+            if header in headers_to_forward:
+                del headers_to_forward[header]
+        
+        # キャッシュヘッダーを追加
+        headers_to_forward["Cache-Control"] = "public, max-age=86400"
+        headers_to_forward["Access-Control-Allow-Origin"] = "*"
+        
+        content_type = response.headers.get("content-type", "application/octet-stream")
+        
+        # 書き換えを行わないファイル（画像やフォントなど）はそのまま転送する
+        if not content_type.startswith(("text/", "application/javascript")):
+            return StreamingResponse(
+                response.aiter_bytes(),
                 status_code=response.status_code,
                 headers=headers_to_forward,
-                media_type=content_type
+                media_type=content_type,
+                background=BackgroundTask(response.aclose)
             )
+        
+        # 静的ファイルの内容を取得
+        content = await response.aread()
+        
+        # JavaScriptや他のテキストベースのファイルでURLの書き換えを行う
+        try:
+            content_text = content.decode("utf-8")
+            # MLflowへの絶対URLをプロキシURLに変換
+            content_text = content_text.replace('http://localhost:5000', '/proxy-mlflow')
+            content_text = content_text.replace('"http://mlflow:5000', '"/proxy-mlflow')
+            content_text = content_text.replace("'http://mlflow:5000", "'/proxy-mlflow")
+            content = content_text.encode("utf-8")
+        except:
+            # デコードに失敗した場合は元のコンテンツを使用
+            pass
+        
+        return Response(
+            content=content,
+            status_code=response.status_code,
+            headers=headers_to_forward,
+            media_type=content_type
+        )
     except Exception as e:
-        logger.error(f"MLflow静的ファイルへのプロキシ中にエラーが発生しました: {str(e)}")
+        logger.error("MLflow静的ファイルへのプロキシ中にエラーが発生しました: %s", e)
         return JSONResponse(
             status_code=500,
             content={"detail": f"MLflow静的ファイルへのアクセスに失敗しました: {str(e)}"}
@@ -1138,18 +1119,16 @@ async def proxy_mlflow_static(file_path: str, request: Request):
 @app.delete("/proxy-mlflow/api/{path:path}")
 @app.patch("/proxy-mlflow/api/{path:path}")
 @app.options("/proxy-mlflow/api/{path:path}")
-async def proxy_mlflow_api(path: str, request: Request):
+async def proxy_mlflow_api(path: str, request: Request, client: httpx.AsyncClient = Depends(httpx_client)):
     # MLflow APIへのパスを構築
-    mlflow_host = os.environ.get("MLFLOW_HOST", "mlflow")
-    mlflow_port = os.environ.get("MLFLOW_PORT", "5000")
-    target_url = f"http://{mlflow_host}:{mlflow_port}/api/{path}"
-    logger.debug(f"MLflow APIへのプロキシリクエスト: {request.method} {target_url}")
+    target_url = f"{MLFLOW_BASE_URL}/api/{path}"
+    logger.debug("MLflow APIへのプロキシリクエスト: %s %s", request.method, target_url)
     
     try:
         # リクエストヘッダーをコピー
         headers = {}
         for name, value in request.headers.items():
-            if name.lower() not in ("host", "content-length"):
+            if name.lower() not in ("host", "content-length", "connection", "keep-alive"):
                 headers[name] = value
         
         # CORSヘッダーを追加
@@ -1165,50 +1144,24 @@ async def proxy_mlflow_api(path: str, request: Request):
                 headers=headers
             )
         
-        # リクエストボディを取得
-        body = await request.body() if request.method != "GET" else None
+        # リクエストボディを取得（接続先は1つなので、アップロードは読み込まずにそのまま流す）
+        if request.method in ("POST", "PUT", "PATCH"):
+            body = request.stream()
+            if "content-length" in request.headers:
+                headers["content-length"] = request.headers["content-length"]
+        else:
+            body = None
         
-        # リクエスト実行
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            if request.method == "GET":
-                response = await client.get(
-                    target_url, 
-                    headers=headers, 
-                    params=dict(request.query_params),
-                    follow_redirects=True
-                )
-            elif request.method == "POST":
-                response = await client.post(
-                    target_url, 
-                    headers=headers, 
-                    content=body,
-                    follow_redirects=True
-                )
-            elif request.method == "PUT":
-                response = await client.put(
-                    target_url, 
-                    headers=headers, 
-                    content=body,
-                    follow_redirects=True
-                )
-            elif request.method == "DELETE":
-                response = await client.delete(
-                    target_url, 
-                    headers=headers,
-                    follow_redirects=True
-                )
-            elif request.method == "PATCH":
-                response = await client.patch(
-                    target_url, 
-                    headers=headers, 
-                    content=body,
-                    follow_redirects=True
-                )
-            else:
-                return JSONResponse(
-                    status_code=405,
-                    content={"detail": f"Method {request.method} not allowed"}
-                )
+        # リクエスト実行（本文はストリーミングで受け取る）
+        if request.method not in ("GET", "POST", "PUT", "DELETE", "PATCH"):
+            return JSONResponse(
+                status_code=405,
+                content={"detail": f"Method {request.method} not allowed"}
+            )
+        response = await send_to_mlflow(
+            client, request.method, target_url, headers, body, timeout=30.0,
+            params=request.url.query if request.method == "GET" else None, follow_redirects=True
+        )
         
         # レスポンスヘッダーから不要なものを除外
         headers_to_forward = dict(response.headers)
@@ -1222,19 +1175,28 @@ async def proxy_mlflow_api(path: str, request: Request):
         headers_to_forward["Access-Control-Allow-Methods"] = "GET, POST, PUT, DELETE, OPTIONS, PATCH"
         headers_to_forward["Access-Control-Allow-Headers"] = "Content-Type, Authorization"
         
-        # JSONレスポンスの場合、内容を確認して必要に応じて変更
-        content = response.content
         content_type = response.headers.get("content-type", "")
         
-        if content_type.startswith("application/json"):
-            try:
-                content_text = content.decode("utf-8")
-                content_text = content_text.replace('http://localhost:5000', '/proxy-mlflow')
-                content_text = content_text.replace('http://mlflow:5000', '/proxy-mlflow')
-                content = content_text.encode("utf-8")
-            except:
-                # パースに失敗した場合は元のコンテンツをそのまま使用
-                pass
+        # JSON以外のレスポンスは書き換えずにそのまま転送する
+        if not content_type.startswith("application/json"):
+            return StreamingResponse(
+                response.aiter_bytes(),
+                status_code=response.status_code,
+                headers=headers_to_forward,
+                media_type=content_type,
+                background=BackgroundTask(response.aclose)
+            )
+        
+        # JSONレスポンスの場合、内容を確認して必要に応じて変更
+        content = await response.aread()
+        try:
+            content_text = content.decode("utf-8")
+            content_text = content_text.replace('http://localhost:5000', '/proxy-mlflow')
+            content_text = content_text.replace('http://mlflow:5000', '/proxy-mlflow')
+            content = content_text.encode("utf-8")
+        except:
+            # パースに失敗した場合は元のコンテンツをそのまま使用
+            pass
         
         return Response(
             content=content,
@@ -1243,7 +1205,7 @@ async def proxy_mlflow_api(path: str, request: Request):
             media_type=content_type
         )
     except Exception as e:
-        logger.error(f"MLflow APIへのプロキシ中にエラーが発生しました: {str(e)}", exc_info=True)
+        logger.error("MLflow APIへのプロキシ中にエラーが発生しました: %s", e, exc_info=True)
         return JSONResponse(
             status_code=500,
             content={"detail": f"MLflow APIへのアクセスに失敗しました: {str(e)}"}
@@ -13,7 +13,7 @@ import logging
 from pathlib import Path
 from typing import Dict, Any, List, Type
 
-from .base import BaseMetric, register_metric, get_metrics_functions, METRIC_REGISTRY
+from .base import BaseMetric, register_metric, unregister_metric, get_metrics_functions, METRIC_REGISTRY, METRICS_BY_MODULE, CUSTOM_METRIC_NAMES
 
 # カスタム評価指標の保存ディレクトリを設定 - プロジェクトのルートディレクトリを基準
 # 現在のファイルからプロジェクトルートへの相対パス（../../.. = src/app/metrics -> app -> src -> root）
@@ -92,10 +92,8 @@ def _load_custom_metrics() -> None:
             spec.loader.exec_module(module)
             
             # 登録された評価指標を確認
-            loaded_metrics = []
-            for name, cls in METRIC_REGISTRY.items():
-                if inspect.getmodule(cls) == module:
-                    loaded_metrics.append(name)
+            loaded_metrics = METRICS_BY_MODULE.get(module_name, [])
+            CUSTOM_METRIC_NAMES.update(loaded_metrics)
             
             if loaded_metrics:
                 logger.info(f"カスタム評価指標 {', '.join(loaded_metrics)} をロードしました")
@@ -113,7 +111,10 @@ _load_custom_metrics()
 __all__ = [
     "BaseMetric",
     "register_metric",
+    "unregister_metric",
     "get_metrics_functions",
     "METRIC_REGISTRY",
+    "METRICS_BY_MODULE",
+    "CUSTOM_METRIC_NAMES",
     "CUSTOM_METRICS_DIR"
 ]
@@ -2,7 +2,7 @@
 評価指標の抽象基底クラスと登録機能を定義するモジュール
 """
 from abc import ABC, abstractmethod
-from typing import Dict, Type, Callable, Any, List, Optional, Union
+from typing import Dict, Type, Callable, Any, List, Optional, Set, Union
 
 
 # パラメータ定義の型
@@ -12,6 +12,12 @@ ParamDef = Dict[str, Dict[str, Any]]
 # メトリクスクラスの登録用ディクショナリ
 METRIC_REGISTRY: Dict[str, Type["BaseMetric"]] = {}
 
+# モジュール名ごとの登録済みメトリクス名（モジュールから登録されたメトリクスをレジストリ全体を走査せずに引くため）
+METRICS_BY_MODULE: Dict[str, List[str]] = {}
+
+# カスタム評価指標ディレクトリから読み込まれた評価指標名（読み込み時に一度だけ記録する）
+CUSTOM_METRIC_NAMES: Set[str] = set()
+
 
 class BaseMetric(ABC):
     """
@@ -77,9 +83,28 @@ def register_metric(cls: Type[BaseMetric]) -> Type[BaseMetric]:
         raise ValueError(f"Metric '{name}' is already registered")
     
     METRIC_REGISTRY[name] = cls
+    METRICS_BY_MODULE.setdefault(cls.__module__, []).append(name)
     return cls
 
 
+def unregister_metric(name: str) -> None:
+    """
+    評価指標の登録を解除する
+
+    Args:
+        name: 登録を解除する評価指標名
+    """
+    cls = METRIC_REGISTRY.pop(name, None)
+    if cls is None:
+        return
+    CUSTOM_METRIC_NAMES.discard(name)
+    names = METRICS_BY_MODULE.get(cls.__module__)
+    if names is not None and name in names:
+        names.remove(name)
+        if not names:
+            del METRICS_BY_MODULE[cls.__module__]
+
+
 def get_metrics_functions(parameters: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Callable[[str, str], float]]:
     """
     すべての登録済みメトリクス計算関数のディクショナリを取得
@@ -16,6 +16,8 @@ class BERTScore(BaseMetric):
     文章間の意味的類似性を測定するメトリクス
     """
 
+    is_higher_better = True  # 値が高いほど良い
+
     def __init__(self, parameters: Optional[Dict[str, Any]] = None):
         """
         初期化メソッド
@@ -24,7 +26,6 @@ class BERTScore(BaseMetric):
             parameters: 評価指標のパラメータ (オプション)
         """
         super().__init__(name="bert_score", parameters=parameters)
-        self.is_higher_better = True
         
         try:
             import bert_score
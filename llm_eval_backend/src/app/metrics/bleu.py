@@ -14,6 +14,8 @@ class BLEUScore(BaseMetric):
     n-gramの一致に基づいて計算される。
     """
 
+    is_higher_better = True  # 値が高いほど良い
+
     def __init__(self, parameters: Optional[Dict[str, Any]] = None):
         """
         初期化メソッド
@@ -22,7 +24,6 @@ class BLEUScore(BaseMetric):
             parameters: 評価指標のパラメータ (オプション)
         """
         super().__init__(name="bleu", parameters=parameters)
-        self.is_higher_better = True
         try:
             from sacrebleu import BLEU
             self.BLEU = BLEU
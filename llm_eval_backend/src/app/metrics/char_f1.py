@@ -15,6 +15,8 @@ class CharF1(BaseMetric):
     Nejumiでは文字列をそのまま比較し、前処理を行わない実装を使用しています。
     """
 
+    is_higher_better = True  # 値が高いほど良い
+
     def __init__(self, parameters: Optional[Dict[str, Any]] = None):
         """
         初期化メソッド
@@ -23,7 +25,6 @@ class CharF1(BaseMetric):
             parameters: 評価指標のパラメータ (オプション)
         """
         super().__init__(name="char_f1", parameters=parameters)
-        self.is_higher_better = True
 
     @classmethod
     def get_parameter_definitions(cls) -> ParamDef:
@@ -16,6 +16,8 @@ class COMETScore(BaseMetric):
     機械翻訳の品質評価に特化したニューラルメトリクス
     """
 
+    is_higher_better = True  # 値が高いほど良い
+
     def __init__(self, parameters: Optional[Dict[str, Any]] = None):
         """
         初期化メソッド
@@ -24,7 +26,6 @@ class COMETScore(BaseMetric):
             parameters: 評価指標のパラメータ (オプション)
         """
         super().__init__(name="comet", parameters=parameters)
-        self.is_higher_better = True
         self.model = None
         self.model_path = None
         
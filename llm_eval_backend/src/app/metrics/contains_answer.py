@@ -13,6 +13,8 @@ class ContainsAnswer(BaseMetric):
     モデルの出力が正解を含んでいるかどうかをチェックします。
     """
 
+    is_higher_better = True  # 値が高いほど良い
+
     def __init__(self, parameters: Optional[Dict[str, Any]] = None):
         """
         初期化メソッド
@@ -21,7 +23,6 @@ class ContainsAnswer(BaseMetric):
             parameters: 評価指標のパラメータ (オプション)
         """
         super().__init__(name="contains_answer", parameters=parameters)
-        self.is_higher_better = True
 
     @classmethod
     def get_parameter_definitions(cls) -> ParamDef:
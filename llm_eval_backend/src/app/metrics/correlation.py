@@ -34,6 +34,8 @@ class PearsonCorrelation(BaseMetric):
     数値データの線形相関を評価するためのメトリクス
     """
 
+    is_higher_better = True  # 値が高いほど良い
+
     def __init__(self, parameters: Optional[Dict[str, Any]] = None):
         """
         初期化メソッド
@@ -42,7 +44,6 @@ class PearsonCorrelation(BaseMetric):
             parameters: 評価指標のパラメータ (オプション)
         """
         super().__init__(name="pearson", parameters=parameters)
-        self.is_higher_better = True
 
     def calculate(self, hypothesis: str, reference: str) -> float:
         """
@@ -81,6 +82,8 @@ class SpearmanCorrelation(BaseMetric):
     数値データの順位相関を評価するためのメトリクス
     """
 
+    is_higher_better = True  # 値が高いほど良い
+
     def __init__(self, parameters: Optional[Dict[str, Any]] = None):
         """
         初期化メソッド
@@ -89,7 +92,6 @@ class SpearmanCorrelation(BaseMetric):
             parameters: 評価指標のパラメータ (オプション)
         """
         super().__init__(name="spearman", parameters=parameters)
-        self.is_higher_better = True
 
     def calculate(self, hypothesis: str, reference: str) -> float:
         """
@@ -14,6 +14,8 @@ class ExactMatch(BaseMetric):
     前処理なしの単純な等値比較を行います。
     """
 
+    is_higher_better = True  # 値が高いほど良い
+
     def __init__(self, parameters: Optional[Dict[str, Any]] = None):
         """
         初期化メソッド
@@ -22,7 +24,6 @@ class ExactMatch(BaseMetric):
             parameters: 評価指標のパラメータ
         """
         super().__init__(name="exact_match", parameters=parameters)
-        self.is_higher_better = True  # 値が高いほど良い
 
     @classmethod
     def get_parameter_definitions(cls) -> ParamDef:
@@ -18,6 +18,8 @@ class ExactMatchFigure(BaseMetric):
     最適化された指標となります。
     """
 
+    is_higher_better = True  # 値が高いほど良い
+
     def __init__(self, parameters: Optional[Dict[str, Any]] = None):
         """
         初期化メソッド
@@ -26,7 +28,6 @@ class ExactMatchFigure(BaseMetric):
             parameters: 評価指標のパラメータ
         """
         super().__init__(name="exact_match_figure", parameters=parameters)
-        self.is_higher_better = True  # 値が高いほど良い
 
     @classmethod
     def get_parameter_definitions(cls) -> ParamDef:
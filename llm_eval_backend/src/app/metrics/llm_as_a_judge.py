@@ -98,6 +98,9 @@ class LlmJudge(BaseMetric):
         ... )
         >>> print(f"正規化スコア: {score:.2f}")
     """
+
+    is_higher_better = True  # 値が高いほど良い
+
     def __init__(self, parameters: Optional[Dict[str, Any]] = None):
         """
         初期化メソッド
@@ -106,7 +109,6 @@ class LlmJudge(BaseMetric):
             parameters (Optional[Dict[str, Any]]): 評価指標のパラメータ
         """
         super().__init__(name="llm_as_a_judge", parameters=parameters)
-        self.is_higher_better = True
         self.parameters = parameters if parameters else {}
 
     @classmethod
@@ -13,6 +13,8 @@ class SetF1(BaseMetric):
     改行で区切られた項目リストをセットとして扱い、F1スコアを計算します。
     """
 
+    is_higher_better = True  # 値が高いほど良い
+
     def __init__(self, parameters: Optional[Dict[str, Any]] = None):
         """
         初期化メソッド
@@ -21,7 +23,6 @@ class SetF1(BaseMetric):
             parameters: 評価指標のパラメータ (オプション)
         """
         super().__init__(name="set_f1", parameters=parameters)
-        self.is_higher_better = True
         
     @classmethod
     def get_parameter_definitions(cls) -> ParamDef:
@@ -6,6 +6,7 @@ SQLiteデータベースへの接続を管理します。
 """
 import os
 import sqlite3
+import threading
 from pathlib import Path
 import logging
 from typing import Optional, Dict, List, Any, Union
@@ -51,8 +52,11 @@ class DatabaseManager:
         
         logger.info(f"データベースパス: {self.db_path}")
         
-        # データベースに接続
-        self.conn = None
+        # 接続はスレッドごとに作成する（リポジトリの呼び出しはスレッドプールでも並行して実行されるため、
+        # 接続を共有すると他のリクエストの書き込みまでコミット・ロールバックしてしまう）
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
         self.connect()
         
         # テーブルの初期化
@@ -60,13 +64,32 @@ class DatabaseManager:
         
         self._initialized = True
     
-    def connect(self):
-        """データベースに接続"""
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """現在のスレッドの接続（未接続の場合は接続する）"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self.connect()
+        return conn
+    
+    def connect(self) -> sqlite3.Connection:
+        """現在のスレッド用にデータベースに接続"""
         try:
-            self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            # close() は別のスレッドから全スレッドの接続を閉じるため、スレッドの確認は無効にする
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
             # 行をディクショナリとして取得できるように設定
-            self.conn.row_factory = sqlite3.Row
+            conn.row_factory = sqlite3.Row
+            # 接続は各スレッドで使い回すため、接続時に一度だけ性能向上のための設定を行う
+            # （WALで読み込みと書き込みを並行させ、コミットごとのfsyncを減らし、ページキャッシュを64MBにする）
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA cache_size=-64000")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
             logger.info("データベースに接続しました")
+            return conn
         except sqlite3.Error as e:
             logger.error(f"データベース接続エラー: {e}")
             raise
@@ -186,6 +209,24 @@ class DatabaseManager:
             )
             ''')
             
+            # 推論一覧のフィルタ（dataset_id, provider_id, model_id, status）用の複合インデックス
+            cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_inferences_filters
+            ON inferences (dataset_id, provider_id, model_id, status)
+            ''')
+            
+            # 推論ごとの結果取得（created_at順）用のインデックス
+            cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_inference_results_inference_id
+            ON inference_results (inference_id, created_at)
+            ''')
+            
+            # メトリクス名の重複確認用のインデックス
+            cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_metrics_name
+            ON metrics (name)
+            ''')
+            
             self.conn.commit()
             logger.info("テーブルを初期化しました")
         except sqlite3.Error as e:
@@ -220,9 +261,13 @@ class DatabaseManager:
         self.conn.rollback()
     
     def close(self):
-        """接続を閉じる"""
-        if self.conn:
-            self.conn.close()
+        """すべてのスレッドの接続を閉じる"""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+            self._local = threading.local()
+        for conn in connections:
+            conn.close()
+        if connections:
             logger.info("データベース接続を閉じました")
     
     def fetch_one(self, query: str, params: tuple = ()) -> Optional[Dict[str, Any]]:
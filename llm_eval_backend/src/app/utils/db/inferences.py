@@ -18,6 +18,29 @@ from app.utils.datetime_helper import get_current_time_str, parse_datetime
 # ロガーの設定
 logger = logging.getLogger(__name__)
 
+# datetimeに変換して返す日時カラム
+_DATETIME_FIELDS = ("created_at", "updated_at", "completed_at")
+
+# 推論一覧でフィルタ可能なカラム（idx_inferences_filters の列順）
+_FILTER_COLUMNS = ("dataset_id", "provider_id", "model_id", "status")
+
+
+def _parse_datetime_fields(row: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    行データの日時カラムをdatetimeに変換する
+
+    Args:
+        row: データベースから取得した行データ
+
+    Returns:
+        日時カラムを変換した行データ
+    """
+    for field in _DATETIME_FIELDS:
+        value = row.get(field)
+        if value.__class__ is str:
+            row[field] = parse_datetime(value)
+    return row
+
 
 class InferenceRepository:
     """
@@ -110,7 +133,12 @@ class InferenceRepository:
             logger.error(f"推論作成エラー: {e}")
             raise
     
-    def get_all_inferences(self, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    def get_all_inferences(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> List[Dict[str, Any]]:
         """
         すべての推論を取得
         
@@ -122,6 +150,8 @@ class InferenceRepository:
                     "model_id": Optional[str],
                     "status": Optional[str]
                 }
+            limit: 取得する推論の最大数（指定がない場合はすべて取得）
+            offset: 取得開始位置
         
         Returns:
             推論のリスト
@@ -138,33 +168,33 @@ class InferenceRepository:
         params = []
         
         if filters:
-            if filters.get("dataset_id"):
-                where_clauses.append("i.dataset_id = ?")
-                params.append(filters["dataset_id"])
-            
-            if filters.get("provider_id"):
-                where_clauses.append("i.provider_id = ?")
-                params.append(filters["provider_id"])
-            
-            if filters.get("model_id"):
-                where_clauses.append("i.model_id = ?")
-                params.append(filters["model_id"])
-            
-            if filters.get("status"):
-                where_clauses.append("i.status = ?")
-                params.append(filters["status"])
+            for column in _FILTER_COLUMNS:
+                if filters.get(column):
+                    where_clauses.append(f"i.{column} = ?")
+                    params.append(filters[column])
         
         if where_clauses:
             query += " WHERE " + " AND ".join(where_clauses)
         
         query += " ORDER BY i.created_at DESC"
         
+        # limit/offsetが指定されている場合はクエリに追加（SQLiteではOFFSETにLIMITが必要）
+        if limit is not None or offset:
+            query += " LIMIT ?"
+            params.append(limit if limit is not None else -1)
+        if offset:
+            query += " OFFSET ?"
+            params.append(offset)
+        
         try:
             inferences = self.db.fetch_all(query, tuple(params))
             
             # 整形処理
             results = []
             for inference in inferences:
+                # 日時カラムをdatetimeに変換
+                _parse_datetime_fields(inference)
+
                 # metricsをJSONから辞書に変換
                 if inference["metrics"]:
                     try:
@@ -211,6 +241,9 @@ class InferenceRepository:
             inference = self.db.fetch_one(query, (inference_id,))
             
             if inference:
+                # 日時カラムをdatetimeに変換
+                _parse_datetime_fields(inference)
+
                 # metricsをJSONから辞書に変換
                 if inference["metrics"]:
                     try:
@@ -394,16 +427,28 @@ class InferenceRepository:
             logger.error(f"推論結果作成エラー: {e}")
             raise
     
-    def get_inference_results(self, inference_id: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    def inference_exists(self, inference_id: str) -> bool:
         """
-        特定の推論に関連する結果一覧を取得
+        推論が存在するかを確認（結果の読み込みは行わない）
         
         Args:
             inference_id: 推論ID
-            limit: 取得する結果の最大数（指定がない場合はすべての結果を取得）
             
         Returns:
-            推論結果のリスト
+            存在する場合はTrue
+        """
+        return self.db.fetch_one("SELECT 1 FROM inferences WHERE id = ?", (inference_id,)) is not None
+    
+    def _build_results_query(self, limit: Optional[int], offset: int) -> str:
+        """
+        推論結果一覧を取得するクエリを構築
+        
+        Args:
+            limit: 取得する結果の最大数（Noneの場合は無制限）
+            offset: 取得開始位置
+            
+        Returns:
+            SQLクエリ
         """
         query = """
         SELECT id, inference_id, input, expected_output, actual_output, metrics, latency, token_count, created_at
@@ -412,15 +457,38 @@ class InferenceRepository:
         ORDER BY created_at ASC
         """
         
-        # limitが指定されている場合はクエリに追加
-        if limit is not None:
-            query += f" LIMIT {int(limit)}"
+        # limit/offsetが指定されている場合はクエリに追加（SQLiteではOFFSETにLIMITが必要）
+        if limit is not None or offset:
+            query += f" LIMIT {int(limit) if limit is not None else -1}"
+        if offset:
+            query += f" OFFSET {int(offset)}"
+        
+        return query
+    
+    def get_inference_results(
+        self, inference_id: str, limit: Optional[int] = None, offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        """
+        特定の推論に関連する結果一覧を取得
+        
+        Args:
+            inference_id: 推論ID
+            limit: 取得する結果の最大数（指定がない場合はすべての結果を取得）
+            offset: 取得開始位置
+            
+        Returns:
+            推論結果のリスト
+        """
+        query = self._build_results_query(limit, offset)
         
         try:
             results = self.db.fetch_all(query, (inference_id,))
             
             # 整形処理
             for result in results:
+                # 日時カラムをdatetimeに変換
+                _parse_datetime_fields(result)
+
                 # metricsをJSONから辞書に変換
                 if result["metrics"]:
                     try:
@@ -453,6 +521,9 @@ class InferenceRepository:
             result = self.db.fetch_one(query, (result_id,))
             
             if result:
+                # 日時カラムをdatetimeに変換
+                _parse_datetime_fields(result)
+
                 # metricsをJSONから辞書に変換
                 if result["metrics"]:
                     try:
@@ -6,6 +6,7 @@
 import uuid
 import json
 import logging
+import orjson
 from datetime import datetime
 from typing import List, Dict, Any, Optional, Tuple
 
@@ -15,6 +16,45 @@ from app.utils.db import get_db
 logger = logging.getLogger(__name__)
 
 
+# メトリクスとして返す列
+_METRIC_COLUMNS = "id, name, type, description, is_higher_better, parameters, created_at, updated_at"
+
+# メトリクス更新用のクエリ（更新するフィールドに関わらず同じSQL文を使い、ステートメントキャッシュを再利用する）
+_UPDATE_METRIC_QUERY = f"""
+UPDATE metrics
+SET name = COALESCE(?, name),
+    type = COALESCE(?, type),
+    description = COALESCE(?, description),
+    is_higher_better = COALESCE(?, is_higher_better),
+    parameters = CASE WHEN ? THEN ? ELSE parameters END,
+    updated_at = ?
+WHERE id = ?
+RETURNING {_METRIC_COLUMNS}
+"""
+
+
+def _format_metric_row(metric: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    DBの行をメトリクス情報に整形する（is_higher_betterをブール値に、parametersを辞書に変換）
+    
+    Args:
+        metric: メトリクスの行
+        
+    Returns:
+        整形したメトリクス情報
+    """
+    metric["is_higher_better"] = bool(metric["is_higher_better"])
+    parameters = metric["parameters"]
+    if parameters:
+        try:
+            metric["parameters"] = orjson.loads(parameters)
+        except orjson.JSONDecodeError:
+            metric["parameters"] = {}
+    else:
+        metric["parameters"] = {}
+    return metric
+
+
 class MetricRepository:
     """
     メトリクス情報のCRUD操作を提供するクラス
@@ -41,6 +81,10 @@ class MetricRepository:
         Returns:
             作成されたメトリクス情報
         """
+        # 同名のメトリクスが存在しないか確認
+        if self.name_exists(metric_data["name"]):
+            raise ValueError(f"メトリクス名 '{metric_data['name']}' は既に存在します")
+        
         metric_id = str(uuid.uuid4())
         now = datetime.now().isoformat()
         
@@ -52,10 +96,11 @@ class MetricRepository:
         if metric_data.get("parameters"):
             parameters = json.dumps(metric_data["parameters"])
         
-        query = """
+        query = f"""
         INSERT INTO metrics 
         (id, name, type, description, is_higher_better, parameters, created_at, updated_at)
         VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        RETURNING {_METRIC_COLUMNS}
         """
         
         params = (
@@ -70,11 +115,10 @@ class MetricRepository:
         )
         
         try:
-            self.db.execute(query, params)
+            # 作成したメトリクスは RETURNING で受け取る（改めて取得しない）
+            rows = self.db.fetch_all(query, params)
             self.db.commit()
-            
-            # 作成したメトリクスを取得して返す
-            return self.get_metric_by_id(metric_id)
+            return _format_metric_row(rows[0])
         except Exception as e:
             self.db.rollback()
             logger.error(f"メトリクス作成エラー: {e}")
@@ -94,23 +138,7 @@ class MetricRepository:
         """
         
         try:
-            metrics = self.db.fetch_all(query)
-            
-            # 整形処理
-            for metric in metrics:
-                # is_higher_betterをブール値に変換
-                metric["is_higher_better"] = bool(metric["is_higher_better"])
-                
-                # parametersをJSONから辞書に変換
-                if metric["parameters"]:
-                    try:
-                        metric["parameters"] = json.loads(metric["parameters"])
-                    except json.JSONDecodeError:
-                        metric["parameters"] = {}
-                else:
-                    metric["parameters"] = {}
-            
-            return metrics
+            return [_format_metric_row(metric) for metric in self.db.fetch_all(query)]
         except Exception as e:
             logger.error(f"メトリクス取得エラー: {e}")
             raise
@@ -133,21 +161,7 @@ class MetricRepository:
         
         try:
             metric = self.db.fetch_one(query, (metric_id,))
-            
-            if metric:
-                # is_higher_betterをブール値に変換
-                metric["is_higher_better"] = bool(metric["is_higher_better"])
-                
-                # parametersをJSONから辞書に変換
-                if metric["parameters"]:
-                    try:
-                        metric["parameters"] = json.loads(metric["parameters"])
-                    except json.JSONDecodeError:
-                        metric["parameters"] = {}
-                else:
-                    metric["parameters"] = {}
-            
-            return metric
+            return _format_metric_row(metric) if metric else None
         except Exception as e:
             logger.error(f"メトリクス取得エラー: {e}")
             raise
@@ -170,63 +184,51 @@ class MetricRepository:
         Returns:
             更新されたメトリクス情報またはNone
         """
-        # 既存のメトリクスを取得
-        metric = self.get_metric_by_id(metric_id)
-        if not metric:
-            return None
+        # 名前を変更する場合は他のメトリクスと重複しないか確認
+        if metric_data.get("name") and self.name_exists(metric_data["name"], exclude_id=metric_id):
+            raise ValueError(f"メトリクス名 '{metric_data['name']}' は既に存在します")
         
         now = datetime.now().isoformat()
         
-        # 更新するフィールドを準備
-        updates = []
-        params = []
-        
-        # 更新対象のスカラーフィールド
-        scalar_fields = ["name", "type", "description", "is_higher_better"]
-        
-        for field in scalar_fields:
-            if field in metric_data and metric_data[field] is not None:
-                updates.append(f"{field} = ?")
-                
-                # is_higher_betterの場合はブール値をIntに変換
-                if field == "is_higher_better":
-                    params.append(1 if metric_data[field] else 0)
-                else:
-                    params.append(metric_data[field])
-        
-        # parametersフィールドの特殊処理
-        if "parameters" in metric_data:
-            updates.append("parameters = ?")
-            params.append(json.dumps(metric_data["parameters"]) if metric_data["parameters"] else None)
-        
-        # 更新日時は常に更新
-        updates.append("updated_at = ?")
-        params.append(now)
-        
-        # メトリクスIDをパラメータに追加
-        params.append(metric_id)
-        
-        if not updates:
-            # 更新するフィールドがない場合は現在のメトリクス情報を返す
-            return metric
-        
-        query = f"""
-        UPDATE metrics
-        SET {', '.join(updates)}
-        WHERE id = ?
-        """
+        # 指定されなかった（None の）フィールドは現在の値のまま残す。
+        # parameters はキーがあれば空でも更新する（空の場合はNULL）
+        is_higher_better = metric_data.get("is_higher_better")
+        update_parameters = "parameters" in metric_data
+        params = (
+            metric_data.get("name"),
+            metric_data.get("type"),
+            metric_data.get("description"),
+            None if is_higher_better is None else (1 if is_higher_better else 0),
+            update_parameters,
+            json.dumps(metric_data["parameters"]) if update_parameters and metric_data["parameters"] else None,
+            now,
+            metric_id
+        )
         
         try:
-            self.db.execute(query, tuple(params))
+            # 更新後の行は RETURNING で受け取る（行がなければメトリクスが存在しない）
+            rows = self.db.fetch_all(_UPDATE_METRIC_QUERY, params)
             self.db.commit()
-            
-            # 更新したメトリクスを取得して返す
-            return self.get_metric_by_id(metric_id)
+            return _format_metric_row(rows[0]) if rows else None
         except Exception as e:
             self.db.rollback()
             logger.error(f"メトリクス更新エラー: {e}")
             raise
     
+    def name_exists(self, name: str, exclude_id: Optional[str] = None) -> bool:
+        """
+        同名のメトリクスが存在するかを確認（結果の読み込みは行わない）
+        
+        Args:
+            name: メトリクス名
+            exclude_id: 確認対象から除外するメトリクスID（更新時の自身）
+            
+        Returns:
+            存在する場合はTrue
+        """
+        query = "SELECT 1 FROM metrics WHERE name = ? AND (? IS NULL OR id != ?) LIMIT 1"
+        return self.db.fetch_one(query, (name, exclude_id, exclude_id)) is not None
+    
     def delete_metric(self, metric_id: str) -> bool:
         """
         メトリクスを削除
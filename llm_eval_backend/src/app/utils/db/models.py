@@ -7,6 +7,7 @@ import uuid
 import json
 import logging
 from datetime import datetime
+from functools import lru_cache
 from typing import List, Dict, Any, Optional, Tuple
 
 from app.utils.db import get_db
@@ -212,6 +213,29 @@ class ModelRepository:
             logger.error(f"モデル取得エラー: {e}")
             raise
     
+    def get_provider_type_and_model_name(self, provider_id: str, model_id: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        プロバイダのタイプとモデル名を1回のクエリで取得
+        
+        Args:
+            provider_id: プロバイダID
+            model_id: モデルID
+            
+        Returns:
+            (プロバイダタイプ, モデル名) のタプル（存在しない方はNone）
+        """
+        query = """
+        SELECT (SELECT type FROM providers WHERE id = ?) AS provider_type,
+               (SELECT name FROM models WHERE id = ?) AS model_name
+        """
+        
+        try:
+            row = self.db.fetch_one(query, (provider_id, model_id))
+            return row["provider_type"], row["model_name"]
+        except Exception as e:
+            logger.error(f"プロバイダ・モデル取得エラー: {e}")
+            raise
+    
     def update_model(self, model_id: str, model_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
         モデルを更新
@@ -317,9 +341,10 @@ class ModelRepository:
 
 
 # シングルトンインスタンスを取得する関数
+@lru_cache(maxsize=None)
 def get_model_repository() -> ModelRepository:
     """
-    モデルリポジトリのインスタンスを取得
+    モデルリポジトリのインスタンスを取得（状態を持たないため、プロセス内で1つを共有する）
     
     Returns:
         ModelRepositoryインスタンス
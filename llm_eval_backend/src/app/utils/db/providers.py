@@ -7,6 +7,7 @@ import uuid
 import json
 import logging
 from datetime import datetime
+from functools import lru_cache
 from typing import List, Dict, Any, Optional, Tuple
 
 from app.utils.db import get_db
@@ -285,28 +286,25 @@ def get_api_key_by_provider_name(provider_name: str) -> Optional[str]:
     Returns:
         APIキー、見つからない場合はNone
     """
+    # 名前またはタイプでプロバイダーを検索（評価サンプルごとに呼ばれるため、成功時はログを出さない）
     try:
-        # プロバイダーリポジトリを取得
-        provider_repo = get_provider_repository()
-
-        # 名前またはタイプでプロバイダーを検索
-        provider = provider_repo.get_provider_by_name(provider_name)
-
-        if provider and provider.get("api_key"):
-            logger.info(f"プロバイダー '{provider_name}' のAPIキーを取得しました")
-            return provider["api_key"]
-
-        # プロバイダーが見つからない、またはAPIキーが設定されていない場合
-        logger.warning(f"プロバイダー '{provider_name}' のAPIキーが見つかりません")
-        return None
+        provider = get_provider_repository().get_provider_by_name(provider_name)
     except Exception as e:
         logger.error(f"APIキー取得エラー: {e}")
         return None
 
+    if provider and provider.get("api_key"):
+        return provider["api_key"]
+
+    # プロバイダーが見つからない、またはAPIキーが設定されていない場合
+    logger.warning(f"プロバイダー '{provider_name}' のAPIキーが見つかりません")
+    return None
+
 # シングルトンインスタンスを取得する関数
+@lru_cache(maxsize=None)
 def get_provider_repository() -> ProviderRepository:
     """
-    プロバイダーリポジトリのインスタンスを取得
+    プロバイダーリポジトリのインスタンスを取得（状態を持たないため、プロセス内で1つを共有する）
 
     Returns:
         ProviderRepositoryインスタンス
@@ -16,6 +16,7 @@ from app.utils.multi_turn_inference import Conversation
 from app.utils.litellm_helper import get_provider_options
 from app.config.config import get_settings
 
+import orjson
 from litellm import acompletion
 
 # 設定の取得
@@ -24,12 +25,16 @@ settings = get_settings()
 # ロギングの設定
 logger = logging.getLogger(__name__)
 
+# 同時に推論する質問数の上限
+_QUESTION_CONCURRENCY = int(os.environ.get("JSONL_INFERENCE_CONCURRENCY", "4"))
 
-async def load_jsonl_dataset(file_path: str) -> List[Dict]:
+
+async def load_jsonl_dataset(file_path: str, limit: Optional[int] = None) -> List[Dict]:
     """JSONLファイルからデータセットを読み込む
 
     Args:
         file_path: JSONLファイルのパス
+        limit: 読み込む質問数の上限（Noneなら全て）
 
     Returns:
         データセットの質問リスト
@@ -42,6 +47,9 @@ async def load_jsonl_dataset(file_path: str) -> List[Dict]:
                 if line.strip():
                     q = json.loads(line)
                     questions.append(q)
+                    # 上限に達したら残りの行は読まない
+                    if limit is not None and len(questions) >= limit:
+                        break
         logger.info(f"JSONLデータセットを読み込みました: {file_path}, {len(questions)}件の質問")
         return questions
     except Exception as e:
@@ -49,6 +57,149 @@ async def load_jsonl_dataset(file_path: str) -> List[Dict]:
         return []
 
 
+def _resolve_api_key(provider_name: str, model_name: str) -> Optional[str]:
+    """モデルまたはプロバイダに設定されたAPIキーを取得する
+
+    Args:
+        provider_name: プロバイダ名
+        model_name: モデル名
+
+    Returns:
+        APIキー（未設定の場合はNone）
+    """
+    from app.utils.db.models import get_model_repository
+    from app.utils.db.providers import get_provider_repository
+
+    # モデルとプロバイダの情報を取得
+    model_repo = get_model_repository()
+    provider_repo = get_provider_repository()
+
+    # プロバイダIDを先に取得
+    providers = provider_repo.get_all_providers()
+    provider_id = None
+    for p in providers:
+        if p["type"] == provider_name or p["name"] == provider_name:
+            provider_id = p["id"]
+            logger.info(f"プロバイダID取得: {provider_id} ({p['name']})")
+            break
+
+    # モデルを取得
+    models = model_repo.get_all_models()
+    api_key = None
+    for m in models:
+        if m["name"] == model_name and (not provider_id or m["provider_id"] == provider_id):
+            # APIキーをモデルから取得
+            api_key = m.get("api_key")
+            logger.info(f"モデルAPIキー: {'取得成功' if api_key else '未設定'}")
+            break
+
+    # プロバイダからAPIキーを取得（モデルにキーがない場合）
+    if not api_key and provider_id:
+        provider = provider_repo.get_provider_by_id(provider_id)
+        if provider:
+            api_key = provider.get("api_key")
+            logger.info(f"プロバイダAPIキー: {'取得成功' if api_key else '未設定'}")
+
+    return api_key
+
+
+async def _infer_question(
+    question: Dict[str, Any],
+    provider_name: str,
+    model_name: str,
+    max_tokens: int,
+    temperature: float,
+    system_message: str,
+    additional_params: Dict[str, Any],
+) -> Optional[Dict[str, Any]]:
+    """1つの質問（マルチターン会話）に対して推論を実行する
+
+    Args:
+        question: 質問データ
+        provider_name: プロバイダ名
+        model_name: モデル名
+        max_tokens: 最大トークン数
+        temperature: 温度
+        system_message: システムメッセージ
+        additional_params: LiteLLMに渡す追加パラメータ
+
+    Returns:
+        質問の推論結果（ターンデータがない場合はNone）
+    """
+    question_id = question.get("question_id", str(uuid.uuid4()))
+    category = question.get("category", "unknown")
+    turns = question.get("turns", [])
+
+    if not turns:
+        logger.warning(f"質問ID {question_id} にターンデータがありません")
+        return None
+
+    # 会話コンテキストを初期化
+    conv = Conversation(system_message=system_message)
+
+    # 各ターンに対して推論を実行
+    turn_results = []
+    logger.info(f"質問ID {question_id}, カテゴリ: {category}, ターン数: {len(turns)}")
+
+    for i, turn in enumerate(turns):
+        # ユーザー発言を追加
+        conv.append_message(conv.roles[0], turn)
+        # アシスタント応答のプレースホルダーを追加
+        conv.append_message(conv.roles[1], None)
+
+        # 推論リクエストの準備
+        messages = conv.to_openai_api_messages()
+
+        try:
+            # LiteLLMのacompletionを使用して推論
+            start_time = time.time()
+
+            response = await acompletion(
+                model=f"{provider_name}/{model_name}",
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                **additional_params
+            )
+            end_time = time.time()
+
+            # 応答テキストの取得
+            output = response.choices[0].message.content
+            latency = end_time - start_time
+
+            # 会話コンテキストを更新
+            conv.update_last_message(output)
+
+            turn_results.append({
+                "turn_idx": i,
+                "user_input": turn,
+                "model_output": output,
+                "latency": latency
+            })
+
+            # 詳細なログ出力（質問と回答の内容）
+            logger.info(f"質問ID {question_id}, ターン {i+1}/{len(turns)} 完了, レイテンシ: {latency:.2f}秒")
+            logger.info(f"質問: {turn}")
+            logger.info(f"回答: {output}")
+
+        except Exception as e:
+            logger.error(f"推論中にエラーが発生しました: 質問ID {question_id}, ターン {i+1}, エラー: {e}")
+            # エラー情報を保存
+            turn_results.append({
+                "turn_idx": i,
+                "user_input": turn,
+                "model_output": f"ERROR: {str(e)}",
+                "error": str(e)
+            })
+            break
+
+    return {
+        "question_id": question_id,
+        "category": category,
+        "turns": turn_results
+    }
+
+
 async def run_inference_on_jsonl(
     dataset_path: str,
     provider_name: str,
@@ -60,6 +211,9 @@ async def run_inference_on_jsonl(
 ) -> Dict[str, Any]:
     """JSONLデータセットに対して推論を実行する
 
+    質問同士は独立しているため、最大 JSONL_INFERENCE_CONCURRENCY 件ずつ並行して推論する。
+    結果はデータセットの順序のまま返す。
+
     Args:
         dataset_path: データセットのファイルパス
         provider_name: プロバイダ名
@@ -76,14 +230,12 @@ async def run_inference_on_jsonl(
     full_model_name = f"{provider_name}/{model_name}"
     logger.info(f"JSONLデータセット推論開始: {dataset_path}, モデル: {full_model_name}")
 
-    # JSONLデータセットの読み込み
-    questions = await load_jsonl_dataset(dataset_path)
+    # JSONLデータセットの読み込み（サンプル数の指定があれば、その件数だけ読み込む）
+    limit = num_samples if num_samples is not None and num_samples > 0 else None
+    questions = await load_jsonl_dataset(dataset_path, limit=limit)
     if not questions:
         return {"error": "データセットの読み込みに失敗しました"}
-
-    # サンプル数の制限（指定があれば）
-    if num_samples is not None and num_samples > 0 and num_samples < len(questions):
-        questions = questions[:num_samples]
+    if limit is not None:
         logger.info(f"サンプル数を{num_samples}件に制限しました")
 
     # 結果用の辞書
@@ -97,131 +249,36 @@ async def run_inference_on_jsonl(
     # プロバイダー固有のオプションを取得
     additional_params = get_provider_options(provider_name)
 
-    # 各質問に対して推論を実行
-    for question in questions:
-        question_id = question.get("question_id", str(uuid.uuid4()))
-        category = question.get("category", "unknown")
-        turns = question.get("turns", [])
-
-        if not turns:
-            logger.warning(f"質問ID {question_id} にターンデータがありません")
-            continue
-
-        # 会話コンテキストを初期化
-        conv = Conversation(system_message=system_message)
-
-        # 各ターンに対して推論を実行
-        turn_results = []
-        logger.info(f"質問ID {question_id}, カテゴリ: {category}, ターン数: {len(turns)}")
-
-        for i, turn in enumerate(turns):
-            # ユーザー発言を追加
-            conv.append_message(conv.roles[0], turn)
-            # アシスタント応答のプレースホルダーを追加
-            conv.append_message(conv.roles[1], None)
-
-            # 推論リクエストの準備
-            messages = conv.to_openai_api_messages()
-            
-            try:
-                # LiteLLMのacompletionを使用して推論
-                start_time = time.time()
-
-                # プロバイダとモデル情報の詳細ログ出力
-                logger.info(f"推論実行: プロバイダ={provider_name}, モデル={model_name}")
-                # APIキーを含む可能性のあるパラメータはログに出力しない
-                safe_params = {k: v for k, v in additional_params.items() if k != "api_key"}
-                logger.info(f"追加パラメータ: {safe_params}")
-
-                # プロバイダモデル設定情報を直接取得
-                from app.utils.db.models import get_model_repository
-                from app.utils.db.providers import get_provider_repository
-
-                # モデルとプロバイダの情報を取得
-                model_repo = get_model_repository()
-                provider_repo = get_provider_repository()
-
-                # プロバイダIDを先に取得
-                providers = provider_repo.get_all_providers()
-                provider_id = None
-                for p in providers:
-                    if p["type"] == provider_name or p["name"] == provider_name:
-                        provider_id = p["id"]
-                        logger.info(f"プロバイダID取得: {provider_id} ({p['name']})")
-                        break
-
-                # モデルを取得
-                models = model_repo.get_all_models()
-                api_key = None
-                for m in models:
-                    if m["name"] == model_name and (not provider_id or m["provider_id"] == provider_id):
-                        # APIキーをモデルから取得
-                        api_key = m.get("api_key")
-                        logger.info(f"モデルAPIキー: {'取得成功' if api_key else '未設定'}")
-                        break
-
-                # プロバイダからAPIキーを取得（モデルにキーがない場合）
-                if not api_key and provider_id:
-                    provider = provider_repo.get_provider_by_id(provider_id)
-                    if provider:
-                        api_key = provider.get("api_key")
-                        logger.info(f"プロバイダAPIキー: {'取得成功' if api_key else '未設定'}")
-
-                # APIキーを設定（直接渡す）
-                if api_key:
-                    additional_params["api_key"] = api_key
-                    # APIキーの末尾数桁のみをログに出力（セキュリティ対策）
-                    if len(api_key) > 8:
-                        masked_key = f"{api_key[:4]}...{api_key[-4:]}"
-                        logger.info(f"APIキーを明示的に設定しました: {masked_key}")
-                    else:
-                        logger.info(f"APIキーを明示的に設定しました")
-
-                response = await acompletion(
-                    model=f"{provider_name}/{model_name}",
-                    messages=messages,
-                    max_tokens=max_tokens,
-                    temperature=temperature,
-                    **additional_params
-                )
-                end_time = time.time()
-                
-                # 応答テキストの取得
-                output = response.choices[0].message.content
-                latency = end_time - start_time
-
-                # 会話コンテキストを更新
-                conv.update_last_message(output)
-
-                turn_results.append({
-                    "turn_idx": i,
-                    "user_input": turn,
-                    "model_output": output,
-                    "latency": latency
-                })
-
-                # 詳細なログ出力（質問と回答の内容）
-                logger.info(f"質問ID {question_id}, ターン {i+1}/{len(turns)} 完了, レイテンシ: {latency:.2f}秒")
-                logger.info(f"質問: {turn}")
-                logger.info(f"回答: {output}")
-            
-            except Exception as e:
-                logger.error(f"推論中にエラーが発生しました: 質問ID {question_id}, ターン {i+1}, エラー: {e}")
-                # エラー情報を保存
-                turn_results.append({
-                    "turn_idx": i,
-                    "user_input": turn,
-                    "model_output": f"ERROR: {str(e)}",
-                    "error": str(e)
-                })
-                break
-
-        # 質問全体の結果を保存
-        results["questions"].append({
-            "question_id": question_id,
-            "category": category,
-            "turns": turn_results
-        })
+    # プロバイダとモデル情報の詳細ログ出力
+    logger.info(f"推論実行: プロバイダ={provider_name}, モデル={model_name}")
+    # APIキーを含む可能性のあるパラメータはログに出力しない
+    safe_params = {k: v for k, v in additional_params.items() if k != "api_key"}
+    logger.info(f"追加パラメータ: {safe_params}")
+
+    # APIキーは全ての質問で共通のため、推論前に一度だけ取得する
+    api_key = await asyncio.to_thread(_resolve_api_key, provider_name, model_name)
+
+    # APIキーを設定（直接渡す）
+    if api_key:
+        additional_params["api_key"] = api_key
+        # APIキーの末尾数桁のみをログに出力（セキュリティ対策）
+        if len(api_key) > 8:
+            masked_key = f"{api_key[:4]}...{api_key[-4:]}"
+            logger.info(f"APIキーを明示的に設定しました: {masked_key}")
+        else:
+            logger.info(f"APIキーを明示的に設定しました")
+
+    # 各質問に対して推論を実行（同時実行数を制限）
+    semaphore = asyncio.Semaphore(_QUESTION_CONCURRENCY)
+
+    async def _bounded(question: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        async with semaphore:
+            return await _infer_question(
+                question, provider_name, model_name, max_tokens, temperature, system_message, additional_params
+            )
+
+    question_results = await asyncio.gather(*(_bounded(question) for question in questions))
+    results["questions"] = [r for r in question_results if r is not None]
 
     # 統計情報を追加
     results["total_questions"] = len(results["questions"])
@@ -230,6 +287,17 @@ async def run_inference_on_jsonl(
     return results
 
 
+def _write_json(file_path: str, data: Dict[str, Any]) -> None:
+    """データをUTF-8のJSONファイルとして書き込む
+
+    Args:
+        file_path: 出力先のパス
+        data: 書き込むデータ
+    """
+    with open(file_path, "wb") as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+
+
 async def save_jsonl_inference_results(results: Dict[str, Any], output_dir: str = None) -> str:
     """推論結果をJSONファイルとして保存する
 
@@ -252,9 +320,8 @@ async def save_jsonl_inference_results(results: Dict[str, Any], output_dir: str
     filename = f"{dataset_name}_{model_name}_{timestamp}.json"
     file_path = os.path.join(output_dir, filename)
     
-    # 結果をJSONファイルとして保存
-    with open(file_path, "w", encoding="utf-8") as f:
-        json.dump(results, f, ensure_ascii=False, indent=2)
+    # 結果をJSONファイルとして保存（シリアライズと書き込みはイベントループを塞がないようスレッドで実行）
+    await asyncio.to_thread(_write_json, file_path, results)
 
     logger.info(f"推論結果を保存しました: {file_path}")
 
@@ -6,7 +6,9 @@ import json
 import os
 import hashlib
 import re
-from typing import Dict, Any, List, Optional, Union, Tuple, Callable
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional, Union, Tuple, Callable
 import litellm
 from litellm import Router, acompletion
 from pydantic import BaseModel
@@ -415,12 +417,32 @@ def get_provider_options(provider_name: str) -> Dict[str, Any]:
     """
     特定のプロバイダのオプションを取得する関数
 
+    オプションはプロバイダ名ごとにキャッシュされます。呼び出し側で変更できるよう、
+    ネストした辞書も含めてコピーを返します。
+
     Args:
         provider_name: プロバイダ名
 
     Returns:
         プロバイダオプションの辞書
     """
+    return {
+        key: dict(value) if isinstance(value, Mapping) else value
+        for key, value in _build_provider_options(provider_name).items()
+    }
+
+
+@lru_cache(maxsize=64)
+def _build_provider_options(provider_name: str) -> Mapping[str, Any]:
+    """
+    特定のプロバイダのオプションを構築する（結果はキャッシュされるため読み取り専用）
+
+    Args:
+        provider_name: プロバイダ名
+
+    Returns:
+        プロバイダオプションの読み取り専用マッピング
+    """
     # プロバイダごとの設定を取得
     provider_settings = settings.get_provider_settings(provider_name)
 
@@ -474,11 +496,11 @@ def get_provider_options(provider_name: str) -> Dict[str, Any]:
     # プロバイダがサポートされているか確認
     if provider_name not in default_options:
         logger.warning(f"Provider {provider_name} is not directly supported. Using default options.")
-        return {
-            "headers": {
+        return MappingProxyType({
+            "headers": MappingProxyType({
                 "User-Agent": "LLM-Evaluation-Tool/1.0"
-            }
-        }
+            })
+        })
 
     # ベースとなるオプションを取得
     options = default_options.get(provider_name, {}).copy()
@@ -493,7 +515,10 @@ def get_provider_options(provider_name: str) -> Dict[str, Any]:
             if key != "headers":
                 options[key] = value
 
-    return options
+    return MappingProxyType({
+        key: MappingProxyType(value) if isinstance(value, dict) else value
+        for key, value in options.items()
+    })
 
 
 def format_litellm_model_name(provider_name: str, model_name: str) -> str:
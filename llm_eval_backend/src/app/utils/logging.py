@@ -1,9 +1,11 @@
 import mlflow
+from mlflow.client import MlflowClient
 from mlflow.entities import ViewType
-from typing import Dict
+from typing import Dict, Optional
 import logging
 import asyncio
 import datetime
+import threading
 import time
 import hashlib
 
@@ -12,6 +14,28 @@ from app.config.config import get_settings
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
+# MLflowクライアントは推論ごとに作り直さず、プロセス内で共有する
+_mlflow_client: Optional[MlflowClient] = None
+_mlflow_client_lock = threading.Lock()
+
+
+def _get_mlflow_client() -> MlflowClient:
+    """
+    共有のMLflowクライアントを取得します（初回呼び出し時に作成）。
+
+    トラッキングURIの設定後に呼び出してください。
+
+    Returns:
+        MlflowClient: MLflowクライアント
+    """
+    global _mlflow_client
+    if _mlflow_client is None:
+        with _mlflow_client_lock:
+            if _mlflow_client is None:
+                _mlflow_client = MlflowClient()
+    return _mlflow_client
+
+
 async def log_evaluation_results(model_name: str, metrics: Dict[str, float]) -> bool:
     """
     MLflowにモデル評価結果をログします。
@@ -64,8 +88,7 @@ async def log_evaluation_results(model_name: str, metrics: Dict[str, float]) ->
                 run_id = None
                 try:
                     # MLflow クライアントを使用
-                    from mlflow.client import MlflowClient
-                    client = MlflowClient()
+                    client = _get_mlflow_client()
                     
                     # 常に"base"タグが付いた親ランを検索（n_shotsに関係なく同じランを使用）
                     # モデル名だけを条件にすることで、異なるn_shotsでも同じランを使う
@@ -161,8 +184,7 @@ async def log_evaluation_results(model_name: str, metrics: Dict[str, float]) ->
                             # Get existing metrics to check for conflicts
                             existing_metrics = {}
                             try:
-                                from mlflow.tracking.client import MlflowClient
-                                client = MlflowClient()
+                                client = _get_mlflow_client()
                                 run_data = client.get_run(run_id).data
                                 for key, value in run_data.metrics.items():
                                     existing_metrics[key] = value
@@ -10,7 +10,7 @@ import json
 import logging
 import time
 import os
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 import uuid
 from datetime import datetime
 from enum import Enum
@@ -30,6 +30,20 @@ logger.info(f"Ollama接続情報: OLLAMA_INTERNAL_URL={OLLAMA_INTERNAL_URL}, OLL
 logger.info(f"環境変数: OLLAMA_BASE_URL={os.environ.get('OLLAMA_BASE_URL')}")
 
 
+# エンドポイント（末尾のスラッシュなし）ごとの /api/tags レスポンスのキャッシュ（取得時刻, レスポンス）
+TAGS_CACHE: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+
+def invalidate_tags(endpoint: str) -> None:
+    """
+    エンドポイントの /api/tags キャッシュを破棄する（モデル一覧が変わったときに呼び出す）
+    
+    Args:
+        endpoint: Ollamaエンドポイント
+    """
+    TAGS_CACHE.pop(endpoint.rstrip('/'), None)
+
+
 class DownloadStatus(str, Enum):
     """ダウンロードステータス列挙型"""
     PENDING = "pending"
@@ -566,6 +580,10 @@ class OllamaManager:
                 # DB更新
                 logger.info(f"[OLLAMA_DB] 最終状態をDBに保存: status={download.status}, progress={download.progress}%, error={download.error}")
                 self._save_download(download)
+            
+            # モデル一覧が変わったため、キャッシュ済みのモデル一覧を破棄
+            if download.status == DownloadStatus.COMPLETED:
+                invalidate_tags(download.endpoint)
         
         except Exception as e:
             # 例外発生時
@@ -0,0 +1,125 @@
+"""
+JSONL推論ジョブのストアと状態イベント配信のテスト
+"""
+import asyncio
+import orjson
+import pytest
+from app.api.endpoints import jsonl_inference
+from app.api.endpoints.jsonl_inference import JobInfo, JobStore
+
+
+def _job(job_id, status="pending"):
+    return JobInfo(
+        job_id=job_id,
+        status=status,
+        dataset_path=f"/data/{job_id}.jsonl",
+        model_label="openai/gpt-4o",
+        dataset_name=f"{job_id}.jsonl"
+    )
+
+
+def _status_of(chunk):
+    """SSEのチャンクから status を取り出す"""
+    assert chunk.startswith(b"event: status\ndata: ")
+    return orjson.loads(chunk[len(b"event: status\ndata: "):])["status"]
+
+
+@pytest.fixture
+def store(monkeypatch):
+    """テストごとに新しいジョブストアを使う"""
+    store = JobStore()
+    monkeypatch.setattr(jsonl_inference, "job_store", store)
+    return store
+
+
+@pytest.mark.parametrize("final_status", ["completed", "failed"])
+def test_stream_sends_current_status_then_closes_when_finished(store, final_status):
+    """接続時に現在の状態を送り、完了・失敗でストリームを閉じることをテスト"""
+    async def scenario():
+        await store.add(_job("job1"))
+        response = await jsonl_inference.stream_jsonl_inference_events("job1")
+        events = response.body_iterator
+
+        assert _status_of(await events.__anext__()) == "pending"
+        await store.set_status("job1", "running")
+        assert _status_of(await events.__anext__()) == "running"
+        await store.set_status("job1", final_status)
+        assert _status_of(await events.__anext__()) == final_status
+        with pytest.raises(StopAsyncIteration):
+            await events.__anext__()
+
+    asyncio.run(scenario())
+    assert store._subscribers == {}
+
+
+def test_stream_closes_when_job_deleted(store):
+    """ジョブが削除されるとストリームを閉じることをテスト"""
+    async def scenario():
+        await store.add(_job("job1"))
+        response = await jsonl_inference.stream_jsonl_inference_events("job1")
+        events = response.body_iterator
+
+        assert _status_of(await events.__anext__()) == "pending"
+        assert await store.delete("job1") is not None
+        with pytest.raises(StopAsyncIteration):
+            await events.__anext__()
+
+    asyncio.run(scenario())
+    assert store._subscribers == {}
+
+
+def test_stream_unsubscribes_on_disconnect(store):
+    """クライアントが切断すると購読が解除されることをテスト"""
+    async def scenario():
+        await store.add(_job("job1"))
+        response = await jsonl_inference.stream_jsonl_inference_events("job1")
+        events = response.body_iterator
+
+        await events.__anext__()
+        assert len(store._subscribers["job1"]) == 1
+        await events.aclose()
+
+    asyncio.run(scenario())
+    assert store._subscribers == {}
+
+
+def test_stream_unknown_job_does_not_leave_subscriber(store):
+    """存在しないジョブへの接続は404となり、購読が残らないことをテスト"""
+    from fastapi import HTTPException
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(jsonl_inference.stream_jsonl_inference_events("missing"))
+
+    assert exc_info.value.status_code == 404
+    assert store._subscribers == {}
+
+
+def test_unsubscribe_removes_empty_entry():
+    """最後の購読者が解除されるとジョブのエントリごと削除されることをテスト"""
+    store = JobStore()
+    first = store.subscribe("job1")
+    second = store.subscribe("job1")
+
+    store.unsubscribe("job1", first)
+    assert store._subscribers == {"job1": {second}}
+    store.unsubscribe("job1", second)
+    assert store._subscribers == {}
+    # 解除済みのキューを再度解除しても問題ない
+    store.unsubscribe("job1", second)
+
+
+def test_running_jobs_never_evicted():
+    """実行中のジョブは保持期間・上限を超えても破棄されず、終了済みのジョブのみ破棄されることをテスト"""
+    async def scenario():
+        store = JobStore(ttl=0, maxsize=1)
+        for job_id in ("running1", "running2", "finished"):
+            await store.add(_job(job_id))
+            await store.set_status(job_id, "running")
+        await store.set_status("finished", "completed")
+        return store
+
+    store = asyncio.run(scenario())
+
+    assert store.get("finished") is None
+    assert store.get("running1").status == "running"
+    assert store.get("running2").status == "running"
@@ -0,0 +1,102 @@
+"""
+メトリクスリポジトリのテスト
+"""
+import threading
+import pytest
+from app.utils.db import DatabaseManager
+from app.utils.db.metrics import MetricRepository
+
+
+@pytest.fixture
+def repository(tmp_path, monkeypatch):
+    """一時ディレクトリのデータベースを使うリポジトリ"""
+    monkeypatch.setenv("LLMEVAL_DB_PATH", str(tmp_path / "llm_eval.db"))
+    # DatabaseManagerはシングルトンのため、テスト中だけ新しいインスタンスを作らせる
+    monkeypatch.setattr(DatabaseManager, "_instance", None)
+    repository = MetricRepository()
+    yield repository
+    repository.db.close()
+
+
+def _create(repository, name="metric_a", **fields):
+    metric_data = {
+        "name": name,
+        "type": "exact_match",
+        "description": "説明",
+        "is_higher_better": False,
+        "parameters": {"threshold": 0.5},
+    }
+    metric_data.update(fields)
+    return repository.create_metric(metric_data)
+
+
+def test_update_metric_none_keeps_stored_values(repository):
+    """Noneまたは未指定のフィールドは保存済みの値のまま残ることをテスト"""
+    metric = _create(repository)
+
+    updated = repository.update_metric(
+        metric["id"], {"name": None, "type": "char_f1", "description": None, "is_higher_better": None}
+    )
+
+    assert updated["name"] == "metric_a"
+    assert updated["type"] == "char_f1"
+    assert updated["description"] == "説明"
+    assert updated["is_higher_better"] is False
+    assert updated["parameters"] == {"threshold": 0.5}
+    assert repository.get_metric_by_id(metric["id"]) == updated
+
+
+def test_update_metric_empty_parameters_clears(repository):
+    """parametersに空の辞書を指定するとパラメータが消去されることをテスト"""
+    metric = _create(repository)
+
+    updated = repository.update_metric(metric["id"], {"parameters": {}})
+
+    assert updated["parameters"] == {}
+    row = repository.db.fetch_one("SELECT parameters FROM metrics WHERE id = ?", (metric["id"],))
+    assert row["parameters"] is None
+
+
+def test_update_metric_unknown_id_returns_none(repository):
+    """存在しないIDの更新はNoneを返すことをテスト"""
+    _create(repository)
+
+    assert repository.update_metric("unknown-id", {"description": "変更"}) is None
+
+
+def test_update_metric_duplicate_name_rejected(repository):
+    """他のメトリクスと同じ名前への変更はValueErrorになり、自身の名前は変更できることをテスト"""
+    metric = _create(repository, name="metric_a")
+    _create(repository, name="metric_b")
+
+    with pytest.raises(ValueError):
+        repository.update_metric(metric["id"], {"name": "metric_b"})
+    with pytest.raises(ValueError):
+        _create(repository, name="metric_b")
+
+    assert repository.update_metric(metric["id"], {"name": "metric_a"})["name"] == "metric_a"
+
+
+def test_rollback_does_not_discard_other_thread_writes(repository):
+    """別のスレッドのロールバックが、コミット前の書き込みを取り消さないことをテスト"""
+    db = repository.db
+    written = threading.Event()
+    rolled_back = threading.Event()
+
+    def write():
+        db.execute(
+            "INSERT INTO metrics (id, name, type, is_higher_better, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+            ("thread-metric", "thread_metric", "exact_match", 1, "2024-01-01", "2024-01-01")
+        )
+        written.set()
+        rolled_back.wait(5)
+        db.commit()
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    assert written.wait(5)
+    db.rollback()
+    rolled_back.set()
+    writer.join(5)
+
+    assert repository.get_metric_by_id("thread-metric")["name"] == "thread_metric"
@@ -72,3 +72,101 @@ def test_metrics_functionality():
     if "contains_answer" in metrics:
         assert metrics["contains_answer"]("これはテスト文字列です", "テスト") == 1.0
         assert metrics["contains_answer"]("これは別の文字列です", "テスト") == 0.0
+
+
+@pytest.mark.parametrize("source", [
+    "import os\nos.system('ls')",
+    "import os as o\no.system('ls')",
+    "import subprocess as sp\nsp.run(['ls'])",
+    "def f():\n    return sp.check_output(['ls'])\nimport subprocess as sp",
+    "__import__('os').system('ls')",
+    "import importlib\nimportlib.import_module('subprocess').Popen(['ls'])",
+    "import os\ngetattr(os, 'popen')('ls')",
+    "from os import system as run\nrun('ls')",
+    "from subprocess import *",
+])
+def test_forbidden_call_detected(source):
+    """アップロードされた評価指標の禁止呼び出し（別名経由を含む）を検出できることをテスト"""
+    import ast
+    from app.api.endpoints.metrics import _ForbiddenCallFinder
+
+    assert _ForbiddenCallFinder().contains_forbidden_call(ast.parse(source))
+
+
+@pytest.mark.parametrize("source", [
+    "import os\nos.path.join('a', 'b')",
+    "import os as o\no.getenv('HOME')",
+    "import re\nre.sub('a', 'b', 'c')",
+])
+def test_allowed_call_not_detected(source):
+    """禁止されていない呼び出しは検出しないことをテスト"""
+    import ast
+    from app.api.endpoints.metrics import _ForbiddenCallFinder
+
+    assert not _ForbiddenCallFinder().contains_forbidden_call(ast.parse(source))
+
+
+_CUSTOM_METRIC_SOURCE = '''
+from app.metrics.base import BaseMetric, register_metric
+
+
+@register_metric
+class LoaderTestMetric(BaseMetric):
+    def __init__(self):
+        super().__init__(name="loader_test_metric")
+
+    def calculate(self, hypothesis, reference):
+        return 1.0
+'''
+
+
+@pytest.fixture
+def custom_metric(tmp_path, monkeypatch):
+    """カスタム評価指標ディレクトリに評価指標ファイルを置いて読み込む"""
+    import sys
+    import app.metrics as metrics_module
+    from app.metrics import METRIC_REGISTRY, unregister_metric
+
+    (tmp_path / "loader_test_module.py").write_text(_CUSTOM_METRIC_SOURCE, encoding="utf-8")
+    monkeypatch.setattr(metrics_module, "CUSTOM_METRICS_DIR", tmp_path)
+    metrics_module._load_custom_metrics()
+    yield "loader_test_module", "loader_test_metric"
+
+    if "loader_test_metric" in METRIC_REGISTRY:
+        unregister_metric("loader_test_metric")
+    sys.modules.pop("loader_test_module", None)
+
+
+def test_custom_metric_indexed_on_load(custom_metric):
+    """カスタム評価指標を読み込むとモジュール別の索引とカスタム名の集合の両方に登録されることをテスト"""
+    from app.metrics import METRICS_BY_MODULE, CUSTOM_METRIC_NAMES
+
+    module_name, metric_name = custom_metric
+    assert METRICS_BY_MODULE[module_name] == [metric_name]
+    assert metric_name in CUSTOM_METRIC_NAMES
+
+
+def test_unregister_metric_removes_indexes(custom_metric):
+    """登録を解除するとレジストリと両方の索引から取り除かれることをテスト"""
+    from app.metrics import METRIC_REGISTRY, METRICS_BY_MODULE, CUSTOM_METRIC_NAMES, unregister_metric
+
+    module_name, metric_name = custom_metric
+    unregister_metric(metric_name)
+
+    assert metric_name not in METRIC_REGISTRY
+    assert module_name not in METRICS_BY_MODULE
+    assert metric_name not in CUSTOM_METRIC_NAMES
+
+
+def test_delete_builtin_metric_forbidden():
+    """組み込み評価指標の削除は403で拒否され、登録が残ることをテスト"""
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from app.api.endpoints.metrics import router
+
+    app = FastAPI()
+    app.include_router(router)
+    response = TestClient(app).delete("/metrics/exact_match")
+
+    assert response.status_code == 403
+    assert "exact_match" in METRIC_REGISTRY
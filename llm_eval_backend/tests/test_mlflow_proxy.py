@@ -0,0 +1,166 @@
+"""
+MLflowプロキシの接続先フォールバックのテスト
+"""
+import asyncio
+import httpx
+import pytest
+from app.api.endpoints import proxy
+from app.api.endpoints.proxy import send_with_fallback
+
+
+@pytest.fixture(autouse=True)
+def short_stagger(monkeypatch):
+    """競争を始めるまでの待ち時間を短くする"""
+    monkeypatch.setattr(proxy, "_FALLBACK_STAGGER", 0.01)
+
+
+class _UnreadBody(httpx.AsyncByteStream):
+    """読み込まれるまで閉じない本文（aclose されたかを確認するため）"""
+
+    async def __aiter__(self):
+        yield b""
+
+
+class FakeUpstream:
+    """接続先ごとの振る舞いを順に返す偽の送信処理
+
+    振る舞いは (接続までの秒数, 結果) のリストで、呼び出されるたびに先頭から使う。
+    結果はステータスコードまたは送出する例外（接続エラー以外の例外は接続後に送出する）。
+    """
+
+    def __init__(self, *behaviours):
+        self.behaviours = [list(b) for b in behaviours]
+        self.calls = []
+        self.cancelled = []
+        self.responses = []
+
+    def attempt(self, index, response_delay=0.0):
+        async def send(trace):
+            self.calls.append(index)
+            connect_delay, result = self.behaviours[index].pop(0)
+            try:
+                await asyncio.sleep(connect_delay)
+            except asyncio.CancelledError:
+                self.cancelled.append(index)
+                raise
+            # 接続エラー・接続タイムアウトは接続の確立前に発生する
+            if isinstance(result, (httpx.ConnectError, httpx.ConnectTimeout)):
+                raise result
+            await trace("http11.send_request_headers.started", {})
+            await asyncio.sleep(response_delay)
+            if isinstance(result, Exception):
+                raise result
+            response = httpx.Response(result, stream=_UnreadBody())
+            self.responses.append(response)
+            return response
+        return send
+
+    def attempts(self, response_delay=0.0):
+        return [self.attempt(i, response_delay) for i in range(len(self.behaviours))]
+
+
+def _connect_error():
+    return httpx.ConnectError("connection refused")
+
+
+def test_falls_back_when_first_url_cannot_connect():
+    """最初の接続先に接続できない場合、次の接続先のレスポンスを返すことをテスト"""
+    upstream = FakeUpstream([(0, _connect_error())], [(0, 200)])
+    errors = []
+
+    index, response = asyncio.run(send_with_fallback(
+        upstream.attempts(), on_error=lambda i, e: errors.append(i)
+    ))
+
+    assert (index, response.status_code) == (1, 200)
+    assert upstream.calls == [0, 1]
+    assert errors == [0]
+
+
+def test_race_uses_first_connected_url_and_cancels_others():
+    """競争させる場合、接続できない接続先を待たずに次の接続先へ送り、接続中の送信は取りやめることをテスト"""
+    upstream = FakeUpstream([(10, 200)], [(0, 200)])
+
+    index, response = asyncio.run(send_with_fallback(upstream.attempts(), race=True, idempotent=True))
+
+    assert (index, response.status_code) == (1, 200)
+    assert upstream.cancelled == [0]
+
+
+def test_race_does_not_resend_slow_response():
+    """接続後の応答が遅いだけの場合は、他の接続先に同じリクエストを送らないことをテスト"""
+    upstream = FakeUpstream([(0, 200)], [(0, 200)])
+
+    index, response = asyncio.run(send_with_fallback(
+        upstream.attempts(response_delay=0.1), race=True, idempotent=True
+    ))
+
+    assert (index, response.status_code) == (0, 200)
+    assert upstream.calls == [0]
+
+
+def test_race_requeues_cancelled_attempt():
+    """取りやめた接続先は、先に接続できた接続先が失敗した場合に再度試すことをテスト"""
+    upstream = FakeUpstream([(10, 200), (0, 200)], [(0, httpx.ReadError("reset"))])
+
+    index, response = asyncio.run(send_with_fallback(upstream.attempts(), race=True, idempotent=True))
+
+    assert (index, response.status_code) == (0, 200)
+    assert upstream.calls == [0, 1, 0]
+    assert upstream.cancelled == [0]
+
+
+def test_server_error_falls_back_and_closes_unused_response():
+    """冪等なリクエストの5xxは次の接続先を試し、使わなかった5xxのレスポンスは閉じることをテスト"""
+    upstream = FakeUpstream([(0, 503)], [(0, 200)])
+
+    index, response = asyncio.run(send_with_fallback(upstream.attempts(), idempotent=True))
+
+    assert (index, response.status_code) == (1, 200)
+    assert upstream.responses[0].is_closed
+    assert not response.is_closed
+
+
+def test_server_error_returned_when_all_urls_fail():
+    """すべての接続先が失敗または5xxの場合は、最初の5xxを返し、他の5xxは閉じることをテスト"""
+    upstream = FakeUpstream([(0, 503)], [(0, 502)], [(0, _connect_error())])
+
+    index, response = asyncio.run(send_with_fallback(upstream.attempts(), idempotent=True))
+
+    assert (index, response.status_code) == (0, 503)
+    assert upstream.calls == [0, 1, 2]
+    assert upstream.responses[1].is_closed
+
+
+def test_non_idempotent_request_not_resent_after_response():
+    """冪等でないリクエストは5xxが返っても他の接続先に再送しないことをテスト"""
+    upstream = FakeUpstream([(0, 500)], [(0, 200)])
+
+    index, response = asyncio.run(send_with_fallback(upstream.attempts()))
+
+    assert (index, response.status_code) == (0, 500)
+    assert upstream.calls == [0]
+
+
+def test_raises_last_error_when_no_url_responds():
+    """すべての接続先への送信に失敗した場合は最後の例外を送出することをテスト"""
+    upstream = FakeUpstream([(0, _connect_error())], [(0, httpx.ConnectTimeout("timeout"))])
+
+    with pytest.raises(httpx.ConnectTimeout):
+        asyncio.run(send_with_fallback(upstream.attempts(), idempotent=True))
+
+
+def test_last_good_url_kept_per_url_list(monkeypatch):
+    """直近で応答した接続先は候補の組み合わせごとに記録され、互いに上書きしないことをテスト"""
+    from app.api.endpoints.proxy import order_mlflow_urls, remember_mlflow_url, forget_mlflow_url
+
+    monkeypatch.setattr(proxy, "_last_good_mlflow", {})
+    first = ("http://a", "http://b")
+    second = ("http://c", "http://d")
+
+    remember_mlflow_url(first, "http://b")
+    remember_mlflow_url(second, "http://d")
+    forget_mlflow_url(second, "http://d")
+
+    assert order_mlflow_urls(first) == ["http://b", "http://a"]
+    assert order_mlflow_urls(second) == ["http://c", "http://d"]